@@ -0,0 +1,147 @@
+import sys
+import os
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import time
+import urllib.parse
+import uuid
+
+# Load generator for the leaderboard service: keep-alive clients on localhost
+# sending a mix of top-N, rank and score submissions, as fast as they are
+# answered. Starts leaderboard_server.py (memory backend) unless --url is given.
+#   python3 benchmarks/bench_service.py
+#   python3 benchmarks/bench_service.py --clients 64 --duration 10 --backend sqlite
+#   python3 benchmarks/bench_service.py --url http://10.0.0.5:8765
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Share of each request kind: cabinets read the leaderboard far more than they write
+MIX = (('top', 0.7), ('rank', 0.2), ('submit', 0.1))
+
+
+def run_entry(rng):
+    return {'_id': uuid.uuid4().hex, 'name': 'BEN', 'score': rng.randrange(0, 1_000_000),
+            'level': rng.randrange(1, 30), 'created': time.time()}
+
+
+class Client:
+    """One keep-alive connection, like an HTTPScoreStore."""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = self.writer = None
+
+    async def open(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def request(self, method, path, body=None):
+        data = json.dumps(body).encode() if body is not None else b""
+        self.writer.write(
+            f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\nContent-Length: {len(data)}\r\n\r\n".encode() + data
+        )
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode().partition(":")
+            if name.lower() == "content-length":
+                length = int(value)
+        payload = json.loads(await self.reader.readexactly(length))
+        if status != 200:
+            raise RuntimeError(f"{method} {path}: {status} {payload}")
+        return payload
+
+    def close(self):
+        self.writer.close()
+
+
+async def worker(client, deadline, rng, latencies):
+    kinds = [kind for kind, _ in MIX]
+    weights = [weight for _, weight in MIX]
+    while time.perf_counter() < deadline:
+        kind = rng.choices(kinds, weights)[0]
+        start = time.perf_counter()
+        if kind == 'top':
+            await client.request("GET", "/top?limit=8")
+        elif kind == 'rank':
+            await client.request("GET", f"/rank?score={rng.randrange(0, 1_000_000)}")
+        else:
+            await client.request("POST", "/scores", {'scores': [run_entry(rng)]})
+        latencies[kind].append(time.perf_counter() - start)
+
+
+async def load(host, port, clients, duration, seed_runs):
+    rng = random.Random(1)
+    seeder = Client(host, port)
+    await seeder.open()
+    for _ in range(0, seed_runs, 1000):
+        await seeder.request("POST", "/scores", {'scores': [run_entry(rng) for _ in range(1000)]})
+    seeder.close()
+
+    latencies = {kind: [] for kind, _ in MIX}
+    connections = [Client(host, port) for _ in range(clients)]
+    await asyncio.gather(*(c.open() for c in connections))
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*(worker(c, deadline, random.Random(i), latencies) for i, c in enumerate(connections)))
+    elapsed = time.perf_counter() - start
+    for c in connections:
+        c.close()
+    return latencies, elapsed
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else 0.0
+
+
+def start_server(backend):
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, "leaderboard_server.py"), "--port", "0", "--backend", backend],
+        stdout=subprocess.PIPE, text=True, cwd=ROOT
+    )
+    for line in process.stdout:
+        if line.startswith("Listening on"):
+            return process, urllib.parse.urlsplit(line.split()[-1])
+    process.kill()
+    raise RuntimeError("leaderboard_server.py did not start")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure leaderboard service requests per second")
+    parser.add_argument("--clients", type=int, default=32, help="concurrent keep-alive connections")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds of load")
+    parser.add_argument("--seed-runs", type=int, default=10000, help="runs stored before measuring")
+    parser.add_argument("--backend", choices=("mongo", "sqlite", "memory"), default="memory",
+                        help="backend of the started server")
+    parser.add_argument("--url", help="measure a running service instead of starting one")
+    args = parser.parse_args()
+
+    process = None
+    if args.url:
+        url = urllib.parse.urlsplit(args.url)
+    else:
+        process, url = start_server(args.backend)
+    try:
+        latencies, elapsed = asyncio.run(load(url.hostname, url.port or 80, args.clients, args.duration,
+                                              args.seed_runs))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    total = sum(len(values) for values in latencies.values())
+    print(f"{total} requests in {elapsed:.1f}s from {args.clients} clients: {total / elapsed:,.0f} req/s")
+    for kind, values in latencies.items():
+        print(f"  {kind:<7} {len(values):8d}   p50 {percentile(values, 0.5) * 1000:7.2f} ms"
+              f"   p99 {percentile(values, 0.99) * 1000:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
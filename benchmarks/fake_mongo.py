@@ -0,0 +1,208 @@
+import copy
+import time
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+# In-memory stand-in for the parts of pymongo the high score manager uses.
+# Every call counts as one round trip and can sleep for a simulated network
+# latency, so benchmarks see the cost of chatty access patterns.
+
+OPERATORS = {
+    '$gt': lambda value, target: value is not None and value > target,
+    '$gte': lambda value, target: value is not None and value >= target,
+    '$lt': lambda value, target: value is not None and value < target,
+    '$lte': lambda value, target: value is not None and value <= target,
+    '$ne': lambda value, target: value != target,
+    '$in': lambda value, target: value in target,
+}
+
+
+def matches(document, query):
+    for field, condition in query.items():
+        if field == '$or':
+            if not any(matches(document, alternative) for alternative in condition):
+                return False
+            continue
+        value = document.get(field)
+        if isinstance(condition, dict) and condition and all(key.startswith('$') for key in condition):
+            if not all(OPERATORS[op](value, target) for op, target in condition.items()):
+                return False
+        elif value != condition:
+            return False
+    return True
+
+
+def project(document, projection):
+    if not projection:
+        return copy.deepcopy(document)
+    included = [field for field, keep in projection.items() if keep and field != '_id']
+    if included:
+        result = {field: copy.deepcopy(document[field]) for field in included if field in document}
+        if projection.get('_id', 1) and '_id' in document:
+            result['_id'] = document['_id']
+        return result
+    excluded = {field for field, keep in projection.items() if not keep}
+    return {field: copy.deepcopy(value) for field, value in document.items() if field not in excluded}
+
+
+class FakeCursor:
+    def __init__(self, collection, documents, projection):
+        self.collection = collection
+        self.documents = documents
+        self.projection = projection
+        self.sort_keys = []
+        self.skip_count = 0
+        self.limit_count = 0
+
+    def sort(self, key, direction=ASCENDING):
+        if isinstance(key, list):
+            self.sort_keys = list(key)
+        else:
+            self.sort_keys = [(key, direction)]
+        return self
+
+    def skip(self, count):
+        self.skip_count = count
+        return self
+
+    def limit(self, count):
+        self.limit_count = count
+        return self
+
+    def batch_size(self, size):
+        return self
+
+    def __iter__(self):
+        self.collection._round_trip()
+        documents = self.documents
+        # Stable sorts applied from the last key to the first
+        for field, direction in reversed(self.sort_keys):
+            documents = sorted(documents, key=lambda d: d.get(field), reverse=direction == DESCENDING)
+        documents = documents[self.skip_count:]
+        if self.limit_count:
+            documents = documents[:self.limit_count]
+        return iter([project(d, self.projection) for d in documents])
+
+
+class UpdateResult:
+    def __init__(self, matched_count, upserted_id=None):
+        self.matched_count = matched_count
+        self.modified_count = matched_count
+        self.upserted_id = upserted_id
+
+
+class DeleteResult:
+    def __init__(self, deleted_count):
+        self.deleted_count = deleted_count
+
+
+class InsertOneResult:
+    def __init__(self, inserted_id):
+        self.inserted_id = inserted_id
+
+
+class InsertManyResult:
+    def __init__(self, inserted_ids):
+        self.inserted_ids = inserted_ids
+
+
+class FakeCollection:
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.documents = []
+        self.indexes = []
+        self.round_trips = 0
+        self.next_id = 0
+        self.ids = set()
+
+    def _round_trip(self):
+        self.round_trips += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _new_document(self, document):
+        document = copy.deepcopy(document)
+        if '_id' not in document:
+            self.next_id += 1
+            document['_id'] = f"{self.next_id:024x}"  # Like an ObjectId: comparable with the game's hex ids
+        if document['_id'] in self.ids:
+            raise DuplicateKeyError(f"E11000 duplicate key: {document['_id']}", 11000)
+        self.ids.add(document['_id'])
+        return document
+
+    def create_index(self, keys, **kwargs):
+        self._round_trip()
+        self.indexes.append(keys)
+        return '_'.join(f"{field}_{direction}" for field, direction in keys)
+
+    def find(self, query=None, projection=None):
+        documents = [d for d in self.documents if matches(d, query or {})]
+        return FakeCursor(self, documents, projection)
+
+    def find_one(self, query=None, projection=None):
+        self._round_trip()
+        for document in self.documents:
+            if matches(document, query or {}):
+                return project(document, projection)
+        return None
+
+    def count_documents(self, query):
+        self._round_trip()
+        return sum(1 for d in self.documents if matches(d, query))
+
+    def insert_one(self, document):
+        self._round_trip()
+        document = self._new_document(document)
+        self.documents.append(document)
+        return InsertOneResult(document['_id'])
+
+    def insert_many(self, documents, ordered=True):
+        self._round_trip()
+        ids = []
+        errors = []
+        for index, document in enumerate(documents):
+            try:
+                document = self._new_document(document)
+            except DuplicateKeyError as e:
+                errors.append({'index': index, 'code': 11000, 'errmsg': str(e)})
+                if ordered:
+                    break
+                continue
+            self.documents.append(document)
+            ids.append(document['_id'])
+        if errors:
+            raise BulkWriteError({'writeErrors': errors, 'writeConcernErrors': [], 'nInserted': len(ids)})
+        return InsertManyResult(ids)
+
+    def update_one(self, query, update, upsert=False):
+        self._round_trip()
+        for document in self.documents:
+            if matches(document, query):
+                document.update(copy.deepcopy(update.get('$set', {})))
+                return UpdateResult(1)
+        if upsert:
+            document = {k: v for k, v in query.items() if not isinstance(v, dict)}
+            document.update(copy.deepcopy(update.get('$set', {})))
+            document = self._new_document(document)
+            self.documents.append(document)
+            return UpdateResult(0, document['_id'])
+        return UpdateResult(0)
+
+    def delete_many(self, query):
+        self._round_trip()
+        kept = [d for d in self.documents if not matches(d, query)]
+        deleted = len(self.documents) - len(kept)
+        self.documents = kept
+        self.ids = {d['_id'] for d in kept}
+        return DeleteResult(deleted)
+
+
+class FakeDatabase:
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.collections = {}
+
+    def __getitem__(self, name):
+        if name not in self.collections:
+            self.collections[name] = FakeCollection(self.latency)
+        return self.collections[name]
@@ -0,0 +1,202 @@
+import sys
+import os
+import argparse
+import fnmatch
+import json
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+
+# Añadir la raíz del proyecto y el directorio src al PYTHONPATH
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, "src")]
+os.chdir(ROOT)  # Asset paths are relative to the project root
+
+from src.core.headless import init_headless
+
+# Benchmarks, headless:
+#   python3 benchmarks/run.py                                  # run everything
+#   python3 benchmarks/run.py -k "update_*" --out current.json
+#   python3 benchmarks/run.py --save-baseline                  # write benchmarks/baselines/baseline.json
+#   python3 benchmarks/run.py -k "store_*" --save-baseline     # re-record only these scenarios
+#   python3 benchmarks/run.py --compare                        # run and compare against the baseline
+#   python3 benchmarks/run.py compare OLD.json NEW.json --threshold 0.2
+
+DEFAULT_BASELINE = os.path.join(ROOT, "benchmarks", "baselines", "baseline.json")
+DEFAULT_THRESHOLD = 0.25  # Fail when a scenario gets more than 25% slower (unless it sets its own)
+DEFAULT_RERUNS = 2  # Times a regressed scenario is measured again before failing
+BASELINE_RUNS = 3  # Processes measured for --save-baseline
+
+
+def measure(step, reset, rounds, number):
+    step()  # Warm-up: caches, lazy imports, first allocations
+    times = []
+    for _ in range(rounds):
+        if reset is not None:
+            reset()
+        start = time.perf_counter()
+        for _ in range(number):
+            step()
+        times.append((time.perf_counter() - start) / number)
+    return {
+        'median': statistics.median(times),
+        'min': min(times),
+        'rounds': rounds,
+        'number': number
+    }
+
+
+def run(pattern="*", names=None):
+    from benchmarks.scenarios import SCENARIOS
+    results = {}
+    for name, (factory, rounds, number, threshold) in SCENARIOS.items():
+        if not fnmatch.fnmatch(name, pattern) or (names is not None and name not in names):
+            continue
+        step, reset = factory()
+        if reset is not None:
+            reset()
+        results[name] = measure(step, reset, rounds, number)
+        if threshold is not None:
+            results[name]['threshold'] = threshold
+        print(f"{name:<28} {results[name]['median'] * 1000:>10.3f} ms  (min {results[name]['min'] * 1000:.3f})")
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'platform': platform.platform(),
+            'date': time.strftime("%Y-%m-%d %H:%M:%S")
+        },
+        'results': results
+    }
+
+
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """Prints the change per scenario and returns the names that regressed.
+
+    A scenario regresses when both its fastest round ('min') and its median
+    got slower than allowed: on a busy machine either one can jump alone,
+    a slower step moves both. A scenario's own threshold, recorded with its
+    results, replaces the default one.
+    """
+    regressions = []
+    for name, result in current['results'].items():
+        base = baseline['results'].get(name)
+        if base is None:
+            print(f"{name:<28} {'new':>10}")
+            continue
+        allowed = result.get('threshold', threshold)
+        ratios = [result[key] / base[key] if base[key] > 0 else 1.0 for key in ('min', 'median')]
+        regressed = min(ratios) > 1 + allowed
+        if regressed:
+            regressions.append(name)
+        print(f"{name:<28} {base['min'] * 1000:>10.3f} -> {result['min'] * 1000:>10.3f} ms"
+              f"  {(ratios[0] - 1) * 100:+7.1f}% (median {(ratios[1] - 1) * 100:+.1f}%, max {allowed:+.0%})"
+              f"{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+
+def confirm(baseline, current, regressions, threshold, reruns):
+    """Measures the regressed scenarios again, each in a new process (timings
+    also vary from one process to the next), keeping each one's best timings.
+    Returns those still slower than allowed after every rerun."""
+    for attempt in range(1, reruns + 1):
+        if not regressions:
+            break
+        print(f"\nMeasuring {len(regressions)} regressed scenario(s) again ({attempt}/{reruns}):")
+        for name in regressions:
+            result = run_in_process(name).get(name)
+            if result is not None:
+                best = current['results'][name]
+                best['min'] = min(best['min'], result['min'])
+                best['median'] = min(best['median'], result['median'])
+        print()
+        regressions = compare(baseline, {'results': {name: current['results'][name] for name in regressions}},
+                              threshold)
+    return regressions
+
+
+def run_in_process(pattern):
+    """Results of the scenarios matching pattern, measured by a new process."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "results.json")
+        subprocess.run([sys.executable, os.path.abspath(__file__), "-k", pattern, "--out", path],
+                       stdout=subprocess.DEVNULL)
+        if not os.path.exists(path):
+            return {}
+        return load(path)['results']
+
+
+def typical(current, pattern, runs):
+    """current with every timing replaced by its median over runs processes
+    (this one and runs - 1 new ones): a baseline that is neither a lucky
+    nor an unlucky process."""
+    measured = [current['results']] + [run_in_process(pattern) for _ in range(runs - 1)]
+    for name, result in current['results'].items():
+        samples = [results[name] for results in measured if name in results]
+        result['min'] = statistics.median(sample['min'] for sample in samples)
+        result['median'] = statistics.median(sample['median'] for sample in samples)
+        result['runs'] = len(samples)
+    return current
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def save(path, data):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the benchmark scenarios")
+    parser.add_argument("command", nargs="?", choices=["run", "compare"], default="run")
+    parser.add_argument("files", nargs="*", help="compare: BASELINE CURRENT")
+    parser.add_argument("-k", "--filter", default="*", help="only scenarios matching this pattern")
+    parser.add_argument("--out", metavar="PATH", help="write the results to this file")
+    parser.add_argument("--save-baseline", action="store_true", help=f"write the results to {DEFAULT_BASELINE}")
+    parser.add_argument("--compare", action="store_true", help="compare the results against the baseline")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline file for --compare")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown before failing (0.25 = 25%%), for scenarios without their own")
+    parser.add_argument("--reruns", type=int, default=DEFAULT_RERUNS,
+                        help="with --compare: times a regressed scenario is measured again before failing")
+    args = parser.parse_args()
+
+    if args.command == "compare":
+        if len(args.files) != 2:
+            parser.error("compare needs BASELINE and CURRENT files")
+        regressions = compare(load(args.files[0]), load(args.files[1]), args.threshold)
+    else:
+        init_headless()
+        current = run(args.filter)
+        if args.out:
+            save(args.out, current)
+        if args.save_baseline:
+            print(f"\nMeasuring {BASELINE_RUNS - 1} more time(s) for the baseline...")
+            baseline = typical(current, args.filter, BASELINE_RUNS)
+            if args.filter != "*" and os.path.exists(args.baseline):
+                # Re-record only the matching scenarios, keep the others
+                recorded = load(args.baseline)
+                recorded['results'].update(baseline['results'])
+                baseline['results'] = recorded['results']
+            save(args.baseline, baseline)
+        regressions = []
+        if args.compare:
+            print(f"\nCompared with {args.baseline}:")
+            baseline = load(args.baseline)
+            regressions = compare(baseline, current, args.threshold)
+            regressions = confirm(baseline, current, regressions, args.threshold, args.reruns)
+
+    if regressions:
+        print(f"\n{len(regressions)} scenario(s) regressed more than allowed: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+import os
+import random
+import tempfile
+import pygame
+from pygame.math import Vector2
+from src.core.audio import NullAudio
+from src.core.headless import NullHighScoreManager
+from src.core.input import ScriptedInput, autopilot
+from src.entities.objects.asteroid import Asteroid
+from src.entities.objects.projectile import Projectile
+from src.utils.constants import SCREEN_WIDTH, SCREEN_HEIGHT
+from benchmarks.fake_mongo import FakeDatabase
+
+# Each scenario is a factory returning (step, reset). step() is the timed
+# operation; reset(), when not None, runs untimed before every round.
+# rounds x number calls of step() are timed; the reported time is per call.
+# number is chosen so a round lasts a few ms at least: shorter rounds are
+# mostly timer and scheduler noise. threshold, when set, replaces the
+# default allowed slowdown for scenarios that wait (sleeps, disk).
+
+SCENARIOS = {}
+SEED = 1234
+SAFE_DISTANCE = 200  # Keep the asteroids away from the ship so it survives the round
+JOURNAL_DIR = tempfile.mkdtemp(prefix="asteroids-bench-")  # Score journals of this run
+
+
+def scenario(name, rounds=20, number=10, threshold=None):
+    def register(factory):
+        SCENARIOS[name] = (factory, rounds, number, threshold)
+        return factory
+    return register
+
+
+def make_scene(asteroid_count=0, projectile_count=0, seed=SEED):
+    # Imported here so the caller can start pygame headless first
+    from src.scenes.game_scene import GameScene
+    scene = GameScene(NullHighScoreManager(), input_source=ScriptedInput(autopilot),
+                      audio=NullAudio(), seed=seed)
+    rng = random.Random(seed)
+    center = Vector2(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+    asteroids = []
+    while len(asteroids) < asteroid_count:
+        position = Vector2(rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT))
+        if position.distance_to(center) > SAFE_DISTANCE:
+            size = rng.choice(['large', 'medium', 'small'])
+            asteroids.append(Asteroid(position, size, rng=scene.rng))
+    scene.asteroids.clear()
+    scene.asteroids.extend(asteroids)
+    scene.projectiles.extend(
+        Projectile(Vector2(rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT)), rng.uniform(0, 360))
+        for _ in range(projectile_count)
+    )
+    return scene
+
+
+def restoring(scene):
+    state = scene.get_state()
+    return lambda: scene.set_state(state)
+
+
+def update_scenario(asteroid_count):
+    def factory():
+        scene = make_scene(asteroid_count)
+        return scene.update, restoring(scene)
+    return factory
+
+
+# The smallest scenes step in well under a ms: more steps per round
+scenario("update_10_asteroids", rounds=20, number=500)(update_scenario(10))
+scenario("update_100_asteroids", rounds=20, number=500)(update_scenario(100))
+scenario("update_1000_asteroids", rounds=10, number=50)(update_scenario(1000))
+scenario("update_10000_asteroids", rounds=5, number=20)(update_scenario(10000))
+
+
+# The step removes the shots that hit, so each call gets its own identical scene;
+# reset() restores them all before every round
+@scenario("collisions_heavy_fire", rounds=20, number=5)
+def collisions_heavy_fire():
+    # Screen full of shots: most of them hit something in the same step
+    scenes = [make_scene(asteroid_count=300, projectile_count=1000) for _ in range(5)]
+    restores = [restoring(scene) for scene in scenes]
+    calls = iter(())
+
+    def reset():
+        nonlocal calls
+        for restore in restores:
+            restore()
+        calls = iter(scenes)
+
+    return lambda: next(calls)._check_projectile_collisions(), reset
+
+
+@scenario("asteroid_draw", rounds=20, number=5)
+def asteroid_draw():
+    scene = make_scene(asteroid_count=500)
+    screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+    def step():
+        for asteroid in scene.asteroids:
+            asteroid.draw(screen, 0.5)
+    return step, None
+
+
+def temp_path(suffix):
+    # A new empty file in JOURNAL_DIR (mkstemp: no name race)
+    fd, path = tempfile.mkstemp(suffix=suffix, dir=JOURNAL_DIR)
+    os.close(fd)
+    return path
+
+
+def journal_path():
+    return temp_path(".jsonl")
+
+
+def make_manager(latency=0.0, stored=0):
+    from src.core.managers.mongo_high_score_manager import MongoHighScoreManager
+    db = FakeDatabase(latency)
+    manager = MongoHighScoreManager(db=db, journal_path=journal_path())
+    rng = random.Random(SEED)
+    for i in range(manager.max_scores):
+        manager.add_high_score(f"P{i:02d}"[:3], rng.randrange(100, 10000)).result()
+    if stored:
+        db['Scores'].insert_many({'name': 'OLD', 'score': rng.randrange(0, 100)} for _ in range(stored))
+    return manager
+
+
+@scenario("menu_leaderboard_draw", rounds=20, number=20)
+def menu_leaderboard_draw():
+    from src.scenes.menu_scene import MenuScene
+    menu = MenuScene(make_manager())
+    menu.show_highscores = True
+    screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    return lambda: menu.draw(screen), None
+
+
+@scenario("asset_preload", rounds=5, number=1)
+def asset_preload():
+    # Whole intro preload: worker decoding plus the main thread's per-frame pumps
+    from src.core.managers.asset_manager import assets
+    from src.core.managers.asset_preloader import AssetPreloader, GAME_ASSETS
+    from src.scenes.intro_scene import IntroScene
+
+    def step():
+        preloader = AssetPreloader(IntroScene.asset_jobs() + list(GAME_ASSETS))
+        preloader.start()
+        while not preloader.done:
+            preloader.pump()
+            preloader.thread.join(0.001)
+    return step, assets.clear
+
+
+@scenario("mongo_add_high_score", rounds=10, number=10, threshold=0.5)
+def mongo_add_high_score():
+    # Submission plus the background save: 0.2 ms per round trip, roughly
+    # a database on the same machine
+    manager = make_manager(latency=0.0002)
+    rng = random.Random(SEED)
+    return lambda: manager.add_high_score("BEN", rng.randrange(0, 20000)).result(), None
+
+
+@scenario("mongo_submit_high_score", rounds=10, number=8, threshold=0.5)
+def mongo_submit_high_score():
+    # What the game loop pays: the save itself runs on the writer thread
+    manager = make_manager(latency=0.0002)
+    rng = random.Random(SEED)
+
+    def drain():
+        manager.add_high_score("BEN", rng.randrange(0, 20000)).result()
+    return lambda: manager.add_high_score("BEN", rng.randrange(0, 20000)), drain
+
+
+@scenario("mongo_ingest_2000_scores", rounds=5, number=1, threshold=0.5)
+def mongo_ingest_2000_scores():
+    # A burst from bots or many cabinets: 2000 submissions, then wait for all
+    manager = make_manager(latency=0.0002)
+    rng = random.Random(SEED)
+
+    def ingest():
+        futures = [manager.add_high_score("BOT", rng.randrange(0, 20000)) for _ in range(2000)]
+        for future in futures:
+            future.result()
+    return ingest, None
+
+
+@scenario("mongo_load_high_scores", rounds=10, number=10)
+def mongo_load_high_scores():
+    manager = make_manager(stored=2000)
+    return manager.load_high_scores, None
+
+
+def make_store(backend, stored=2000):
+    """Store of one backend with stored scores; the mongo one is the in-memory stand-in."""
+    if backend == 'mongo':
+        from src.core.storage.mongo_store import MongoScoreStore
+        store = MongoScoreStore(FakeDatabase())
+    elif backend == 'sqlite':
+        from src.core.storage.sqlite_store import SQLiteScoreStore
+        store = SQLiteScoreStore(temp_path(".db"))
+    else:
+        from src.core.storage.memory_store import MemoryScoreStore
+        store = MemoryScoreStore()
+    store.connect()
+    store.add(seed_runs(stored))
+    return store
+
+
+def seed_runs(count):
+    rng = random.Random(SEED)
+    return [{'_id': f"seed-{i}", 'name': 'OLD', 'score': rng.randrange(0, 20000)} for i in range(count)]
+
+
+# Calls per step of the store scenarios: a single memory or SQLite read takes a
+# few µs, mostly timer noise, so each step times a batch of them. Rounds are
+# steps per round, so each round lasts a few ms.
+STORE_BATCH = {'memory': 200, 'sqlite': 20, 'mongo': 1}
+STORE_ROUNDS = {'memory': 10, 'sqlite': 25, 'mongo': 20}
+ADD_BATCH = {'memory': 200, 'sqlite': 1, 'mongo': 50}  # Adds to the stand-in cost no round trip
+ADD_ROUNDS = {'memory': 10, 'sqlite': 200, 'mongo': 10}
+
+
+def repeat(call, times):
+    def step():
+        for _ in range(times):
+            call()
+    return step
+
+
+def store_scenarios(backend):
+    # Same operations on every backend, to compare their latencies
+    batch = STORE_BATCH[backend]
+
+    def add():
+        store = make_store(backend, stored=0)
+        ids = iter(range(10 ** 9))
+
+        def reset():
+            # Every round adds to the same 2000 runs, not to the last round's
+            store.clear()
+            store.add(seed_runs(2000))
+
+        def call():
+            store.add([{'_id': f"bench-{next(ids)}", 'name': 'BEN', 'score': 5000}])
+
+        return repeat(call, ADD_BATCH[backend]), reset
+
+    def top():
+        store = make_store(backend)
+        return repeat(lambda: store.top(8), batch), None
+
+    def rank():
+        store = make_store(backend)
+        return repeat(lambda: store.rank(10000), batch), None
+
+    def around():
+        store = make_store(backend)
+        return repeat(lambda: store.around(10000, 2, 2), batch), None
+
+    def page():
+        # A page in the middle of the leaderboard, by keyset
+        store = make_store(backend)
+        return repeat(lambda: store.top(8, None, (10000, '')), batch), None
+
+    number = STORE_ROUNDS[backend]
+    # Each add is a committed transaction: on SQLite, mostly disk time
+    scenario(f"store_{backend}_add", rounds=30, number=ADD_ROUNDS[backend],
+             threshold=0.5 if backend == 'sqlite' else None)(add)
+    scenario(f"store_{backend}_top", rounds=30, number=number)(top)
+    scenario(f"store_{backend}_rank", rounds=30, number=number)(rank)
+    scenario(f"store_{backend}_around", rounds=30, number=number)(around)
+    scenario(f"store_{backend}_page", rounds=30, number=number)(page)
+
+
+for backend in ('memory', 'sqlite', 'mongo'):
+    store_scenarios(backend)
+
+# With a real server, e.g. BENCH_MONGODB_URI=mongodb://localhost:27017, the
+# submission latency is also measured against it (database asteroids_bench)
+if os.getenv('BENCH_MONGODB_URI'):
+    @scenario("mongo_add_high_score_live", rounds=10, number=10)
+    def mongo_add_high_score_live():
+        from pymongo import MongoClient
+        from src.core.managers.mongo_high_score_manager import MongoHighScoreManager
+        client = MongoClient(os.getenv('BENCH_MONGODB_URI'), serverSelectionTimeoutMS=3000)
+        client.drop_database('asteroids_bench')
+        manager = MongoHighScoreManager(db=client['asteroids_bench'], journal_path=journal_path())
+        rng = random.Random(SEED)
+        return lambda: manager.add_high_score("BEN", rng.randrange(0, 20000)).result(), None
@@ -0,0 +1,76 @@
+import sys
+import os
+import argparse
+import time
+
+# Añadir el directorio src al PYTHONPATH
+sys.path.append(os.path.join(os.path.dirname(__file__), "src"))
+
+from src.core.headless import init_headless, HeadlessRunner
+from src.core.replay import ReplayRecorder, ReplayPlayer
+
+# Headless simulation: no window, no audio, scripted input.
+#   python3 headless.py --ticks 10000 --level 5
+#   python3 headless.py --soak 1 50 --ticks-per-level 600
+#   python3 headless.py --ticks 20000 --level 30 --record run.replay
+#   python3 headless.py --replay run.replay --seek 15000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run GameScene without a display")
+    parser.add_argument("--ticks", type=int, default=6000, help="simulation steps to run")
+    parser.add_argument("--level", type=int, default=1, help="starting level")
+    parser.add_argument("--soak", type=int, nargs=2, metavar=("FIRST", "LAST"),
+                        help="run every level in the range instead")
+    parser.add_argument("--ticks-per-level", type=int, default=600)
+    parser.add_argument("--seed", type=int, help="random seed (same seed, same run)")
+    parser.add_argument("--record", metavar="PATH", help="record one game to a replay file")
+    parser.add_argument("--replay", metavar="PATH", help="load a replay file instead of simulating")
+    parser.add_argument("--seek", type=int, help="with --replay: tick to jump to (default: the end)")
+    args = parser.parse_args()
+
+    init_headless()
+
+    if args.replay:
+        replay = ReplayPlayer(args.replay)
+        target = replay.tick_count if args.seek is None else args.seek
+        start = time.perf_counter()
+        scene = replay.seek(target)
+        elapsed = time.perf_counter() - start
+        print(f"{args.replay}: seed={replay.seed} ticks={replay.tick_count} keyframes={len(replay.keyframes)}")
+        print(f"tick {scene.tick} reached in {elapsed:.3f}s: score={scene.score}, level={scene.level}, "
+              f"game_over={scene.game_over}, checksum={scene.state_checksum():08x}")
+        replay.close()
+        return
+
+    runner = HeadlessRunner(seed=args.seed)
+    print(f"seed: {runner.seed}")
+
+    if args.record:
+        # A single game: stops at game over instead of starting a new one
+        scene = runner.new_scene(args.level)
+        recorder = ReplayRecorder(args.record, scene)
+        start = time.perf_counter()
+        while scene.tick < args.ticks and not scene.game_over:
+            scene.update()
+        elapsed = time.perf_counter() - start
+        recorder.close()
+        print(f"recorded {recorder.tick_count} ticks in {elapsed:.2f}s to {args.record}: "
+              f"score={scene.score}, level={scene.level}, checksum={scene.state_checksum():08x}")
+    elif args.soak:
+        results = runner.soak(args.soak[0], args.soak[1], args.ticks_per_level)
+        for result in results:
+            print(f"level {result['start_level']:>3}: {result['ticks_per_second']:>10.0f} ticks/s"
+                  f"  asteroids={result['asteroids']:<4} deaths={result['deaths']}")
+        total_ticks = sum(r['ticks'] for r in results)
+        total_time = sum(r['seconds'] for r in results)
+        print(f"total: {total_ticks} ticks in {total_time:.2f}s ({total_ticks / total_time:.0f} ticks/s)")
+    else:
+        result = runner.run(args.ticks, level=args.level)
+        print(f"{result['ticks']} ticks in {result['seconds']:.2f}s "
+              f"({result['ticks_per_second']:.0f} ticks/s), score={result['score']}, "
+              f"level={result['level']}, deaths={result['deaths']}, checksum={result['checksum']:08x}")
+
+
+if __name__ == "__main__":
+    main()
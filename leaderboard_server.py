@@ -0,0 +1,49 @@
+import sys
+import os
+import argparse
+import asyncio
+
+# Añadir el directorio src al PYTHONPATH
+sys.path.append(os.path.join(os.path.dirname(__file__), "src"))
+
+from src.core.service.leaderboard_service import LeaderboardService
+from src.core.config.storage_config import SCORE_BACKEND
+from src.core.storage.score_store import create_store
+
+# Leaderboard service for a venue: the cabinets use it with SCORE_BACKEND=http
+# and LEADERBOARD_URL, and only this process talks to the database.
+#   python3 leaderboard_server.py
+#   python3 leaderboard_server.py --host 0.0.0.0 --port 8765 --backend sqlite
+
+DEFAULT_PORT = 8765
+
+
+async def serve(args):
+    service = LeaderboardService(create_store(args.backend))
+    server = await service.start(args.host, args.port)
+    print(f"Listening on http://{args.host}:{service.port}", flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the leaderboard over HTTP/JSON")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="0 picks a free port")
+    parser.add_argument("--backend", choices=("mongo", "sqlite", "memory"),
+                        help="where runs are stored (default: SCORE_BACKEND)")
+    args = parser.parse_args()
+    if not args.backend and SCORE_BACKEND == 'http':
+        parser.error("SCORE_BACKEND=http would point the service at itself: pass --backend")
+    try:
+        asyncio.run(serve(args))
+    except ConnectionError as e:
+        print(e, file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,26 +5,48 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__), "src"))
 
 from src.scenes.menu_scene import MenuScene
-from src.scenes.game_scene import GameScene
 from src.scenes.pause_scene import PauseScene
 from src.scenes.intro_scene import IntroScene
 from src.utils.constants import *
-from src.core.managers.mongo_high_score_manager import MongoHighScoreManager
+from src.core.managers.high_score_manager import HighScoreManager
+from src.core.managers.asset_manager import assets
+from src.core.managers.asset_preloader import AssetPreloader, GAME_ASSETS
+from src.core.timestep import FixedTimestep
+from src.core.profiler import FrameProfiler
+from src.utils.logger import get_logger
+import io
+import time
 import pygame
 
-# Inicializar Pygame
-pygame.init()
-pygame.mixer.init()  # Asegúrate de que el mixer está inicializado
+log = get_logger("scenes")
+
+# Solo los subsistemas de Pygame que usa la intro; el mixer arranca con la primera música
+pygame.display.init()
+pygame.font.init()
 
 # Función para cargar música con gestión de errores
 def load_music(path):
     try:
-        pygame.mixer.music.load(path)
-    except pygame.error as e:
-        pass
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()
+        # Desde memoria: el preloader ya leyó el archivo durante la intro
+        pygame.mixer.music.load(io.BytesIO(assets.music(path)), path)
+        return True
+    except (pygame.error, OSError) as e:
+        return False
+
+def music(action):
+    # pause/unpause/stop de la música; sin mixer (aún no arrancado o sin audio) no hace nada
+    if pygame.mixer.get_init():
+        getattr(pygame.mixer.music, action)()
+
+# Si está definido, cada partida se graba como replay en este directorio
+REPLAY_DIR = os.getenv('ASTEROIDS_REPLAY_DIR')
+# Directorio donde se exportan las trazas del profiler (F4)
+TRACE_DIR = os.getenv('ASTEROIDS_TRACE_DIR', 'traces')
 
-# Crear instancia de MongoHighScoreManager
-high_score_manager = MongoHighScoreManager()
+# Gestor de puntuaciones con el backend de SCORE_BACKEND (la conexión se abre durante la intro)
+high_score_manager = HighScoreManager(connect=False)
 
 class Game:
     def __init__(self):
@@ -32,15 +54,24 @@ class Game:
         self.screen = pygame.display.set_mode((DEFAULT_WIDTH, DEFAULT_HEIGHT))
         pygame.display.set_caption("Asteroids")
         self.clock = pygame.time.Clock()
+        # Gameplay runs at a fixed rate; rendering interpolates between steps
+        self.timestep = FixedTimestep()
+        # Per-phase frame timings; F3 shows the overlay, F4 exports a trace
+        self.profiler = FrameProfiler()
         
         # Guardar el estado de la pantalla
         self.is_fullscreen = False
         
-        self.menu_scene = MenuScene(high_score_manager)
+        # Fuentes, imágenes, sonidos y música se cargan en segundo plano durante la intro
+        self.preloader = AssetPreloader(IntroScene.asset_jobs() + list(GAME_ASSETS))
+        # Solo la intro se crea ya: el resto de escenas, la primera vez que se muestran
+        self.intro_scene = IntroScene(self.preloader)
+        self.menu_scene = None
         self.game_scene = None
-        self.pause_scene = PauseScene()
-        self.intro_scene = IntroScene()
+        self.pause_scene = None
+        self.recorder = None
         self.current_scene = "INTRO"
+        self.frames = 0
         
         # Flags para carga de música
         self.menu_music_loaded = False
@@ -57,6 +88,7 @@ class Game:
     def run(self):
         try:
             while True:
+                self.profiler.begin_frame()
                 events = pygame.event.get()
                 for event in events:
                     if event.type == pygame.QUIT:
@@ -64,8 +96,14 @@ class Game:
                         sys.exit()
                     elif event.type == pygame.KEYDOWN:
                         if event.key == pygame.K_ESCAPE and self.current_scene == "GAME":
-                            pygame.mixer.music.pause()
+                            music('pause')
                             self.current_scene = "PAUSE"
+                            self.timestep.reset()
+                        elif event.key == KEY_PROFILER:
+                            self.profiler.toggle_overlay()
+                        elif event.key == KEY_TRACE_EXPORT:
+                            self._export_trace()
+                self.profiler.mark('events')
 
                 if self.current_scene == "INTRO":
                     self._handle_intro(events)
@@ -77,19 +115,39 @@ class Game:
                     self._handle_pause(events)
                 elif self.current_scene == "NEW_HIGHSCORE":
                     self._handle_new_highscore(events)
+                self.profiler.mark('draw')  # Game updates are marked apart
 
+                if not self.preloader.done:
+                    self.preloader.pump()
+                    self.profiler.mark('preload')
+
+                self.profiler.draw_overlay(self.screen)
                 pygame.display.flip()
-                self.clock.tick(FPS)
+                self.frames += 1
+                self.profiler.mark('flip')
+                self.clock.tick(RENDER_FPS)
+                self.profiler.mark('sleep')
+
+                if self.game_scene is not None:
+                    self.profiler.count('asteroids', len(self.game_scene.asteroids))
+                    self.profiler.count('projectiles', len(self.game_scene.projectiles))
+                self.profiler.end_frame()
         except KeyboardInterrupt:
             pygame.quit()
             sys.exit()
 
     def _handle_intro(self, events):
-        if not self.game_music_loaded:
-            load_music('src/assets/music/game_music.mp3')
-            pygame.mixer.music.play(-1)
+        # Conectar con MongoDB en segundo plano mientras se ve la intro (tras el primer frame)
+        if self.frames:
+            high_score_manager.connect_async()
+        if self.frames and not self.game_music_loaded:
+            if load_music(GAME_MUSIC):  # Sin el archivo, se sigue sin música
+                pygame.mixer.music.play(-1)
             self.game_music_loaded = True
+            self.preloader.start()  # Con el mixer ya iniciado, para los sonidos
         
+        for event in events:
+            self.intro_scene.handle_input(event)
         result = self.intro_scene.update()
         if result == "MENU":
             self.current_scene = "MENU"
@@ -98,18 +156,24 @@ class Game:
         self.intro_scene.draw(self.screen)
     
     def _handle_menu(self, events):
+        if self.menu_scene is None:
+            self.menu_scene = MenuScene(high_score_manager)
         if not self.menu_music_loaded:
-            pygame.mixer.music.stop()
-            load_music('src/assets/music/menu_music.mp3')
-            pygame.mixer.music.play(-1)
+            music('stop')
+            if load_music(MENU_MUSIC):
+                pygame.mixer.music.play(-1)
             self.menu_music_loaded = True
             self.game_music_loaded = False
         
         for event in events:
             result = self.menu_scene.handle_input(event)
             if result == "PLAY":
-                pygame.mixer.music.stop()
+                music('stop')
+                from src.scenes.game_scene import GameScene  # Se importa con la primera partida
                 self.game_scene = GameScene(high_score_manager)
+                self.game_scene.profiler = self.profiler
+                self._start_replay()
+                self.timestep.reset()
                 self.current_scene = "GAME"
                 self.menu_music_loaded = False
             elif result == "QUIT":
@@ -119,22 +183,26 @@ class Game:
         self.menu_scene.draw(self.screen)
     
     def _handle_game(self, events):
-        update_result = self.game_scene.update()
-        if update_result == "MENU":
-            pygame.mixer.music.stop()
-            self.current_scene = "MENU"
-            self.menu_music_loaded = False
-            self.game_music_loaded = False
-            self.game_scene = None
-            return
-        elif update_result == "NEW_HIGHSCORE":
-            self.current_scene = "NEW_HIGHSCORE"
-            return
+        # Run as many fixed simulation steps as the elapsed time asks for
+        for _ in range(self.timestep.advance()):
+            update_result = self.game_scene.update()
+            if update_result == "MENU":
+                music('stop')
+                self.current_scene = "MENU"
+                self.menu_music_loaded = False
+                self.game_music_loaded = False
+                self._close_replay()
+                self.game_scene = None
+                return
+            elif update_result == "NEW_HIGHSCORE":
+                self.current_scene = "NEW_HIGHSCORE"
+                return
+        self.profiler.mark('update')
 
         if not self.game_music_loaded:
-            pygame.mixer.music.stop()
-            load_music('src/assets/music/game_music.mp3')
-            pygame.mixer.music.play(-1)
+            music('stop')
+            if load_music(GAME_MUSIC):
+                pygame.mixer.music.play(-1)
             self.game_music_loaded = True
             self.menu_music_loaded = False
 
@@ -150,16 +218,39 @@ class Game:
             elif result == "TOGGLE_FULLSCREEN":
                 self.toggle_fullscreen()
 
-        self.game_scene.draw(self.screen)
+        self.game_scene.draw(self.screen, self.timestep.alpha)
+
+    def _start_replay(self):
+        self._close_replay()
+        if REPLAY_DIR:
+            from src.core.replay import ReplayRecorder
+            name = time.strftime("%Y%m%d-%H%M%S") + f"-{self.game_scene.seed}.replay"
+            self.recorder = ReplayRecorder(os.path.join(REPLAY_DIR, name), self.game_scene)
+
+    def _export_trace(self):
+        path = os.path.join(TRACE_DIR, time.strftime("%Y%m%d-%H%M%S") + ".json")
+        try:
+            count = self.profiler.export_chrome_trace(path)
+            log.info("Trace exported: %s (%d events)", path, count)
+        except OSError as e:
+            log.warning("Could not export trace: %s", e)
+
+    def _close_replay(self):
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
 
     def _handle_pause(self, events):
+        if self.pause_scene is None:
+            self.pause_scene = PauseScene()
         for event in events:
             result = self.pause_scene.handle_input(event)
             if result == "RESUME":
-                pygame.mixer.music.unpause()
+                music('unpause')
+                self.timestep.reset()
                 self.current_scene = "GAME"
             elif result == "MENU":
-                pygame.mixer.music.stop()
+                music('stop')
                 self.current_scene = "MENU"
         self.pause_scene.draw(self.screen)
     
@@ -172,8 +263,9 @@ class Game:
                 if self.game_scene:
                     if event.key == pygame.K_RETURN:
                         name = self.game_scene.player_name.strip() or "AAA"
-                        high_score_manager.add_high_score(name, self.game_scene.score)
+                        self.game_scene.save_run(name)
                         self.current_scene = "MENU"
+                        self._close_replay()
                         self.game_scene = None
                     elif event.key == pygame.K_BACKSPACE:
                         self.game_scene.player_name = self.game_scene.player_name[:-1]
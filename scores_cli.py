@@ -0,0 +1,149 @@
+import sys
+import os
+import argparse
+import contextlib
+import csv
+import hashlib
+import itertools
+import json
+import time
+
+# Añadir el directorio src al PYTHONPATH
+sys.path.append(os.path.join(os.path.dirname(__file__), "src"))
+
+from src.core.storage.score_store import create_store, run_scopes
+
+# Bulk import/export of runs for the configured score backend (SCORE_BACKEND),
+# streamed in batches: neither direction holds the whole history in memory.
+#   python3 scores_cli.py export scores.jsonl
+#   python3 scores_cli.py export scores.csv --backend sqlite
+#   python3 scores_cli.py import cabinet7.jsonl --batch-size 2000
+#   python3 scores_cli.py import scores_journal.jsonl      # an offline cabinet's journal
+# Importing is idempotent: runs whose _id is already stored are skipped.
+
+FIELDS = ('_id', 'name', 'score', 'level', 'duration', 'created', 'cabinet', 'season', 'week')
+DEFAULT_BATCH_SIZE = 1000
+
+
+def file_format(path, requested):
+    if requested:
+        return requested
+    return 'csv' if path.lower().endswith('.csv') else 'jsonl'
+
+
+def open_file(path, mode):
+    # '-' is stdin/stdout, left open when the with block ends
+    if path == '-':
+        return contextlib.nullcontext(sys.stdin if mode == 'r' else sys.stdout)
+    return open(path, mode, newline='' if path.lower().endswith('.csv') else None, encoding='utf-8')
+
+
+def read_rows(f, fmt):
+    if fmt == 'csv':
+        for row in csv.DictReader(f):
+            yield {key: value for key, value in row.items() if key in FIELDS and value not in ('', None)}
+        return
+    for line in f:
+        line = line.strip()
+        if line:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                yield {}  # Counted as an invalid row, like a cut last line of a journal
+
+
+def normalize(row):
+    """A run ready for ScoreStore.add, or None if it has no name or score."""
+    try:
+        entry = {'name': str(row['name'])[:3], 'score': int(row['score'])}
+        for key, kind in (('level', int), ('duration', float), ('created', float)):
+            if row.get(key) is not None:
+                entry[key] = kind(row[key])
+    except (KeyError, TypeError, ValueError):
+        return None
+    entry.setdefault('created', time.time())
+    for key in ('cabinet', 'season', 'week'):
+        if row.get(key) is not None:
+            entry[key] = str(row[key])
+    for key, value in run_scopes(entry['created']).items():
+        entry.setdefault(key, value)
+    if row.get('_id') is not None:
+        entry['_id'] = str(row['_id'])
+    else:
+        # Same run, same _id: importing a file twice adds nothing
+        key = json.dumps([entry['name'], entry['score'], entry['created'], entry.get('cabinet')])
+        entry['_id'] = hashlib.sha1(key.encode()).hexdigest()
+    return entry
+
+
+def batches(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def import_scores(store, path, fmt, batch_size):
+    read = skipped = 0
+    with open_file(path, 'r') as f:
+        rows = read_rows(f, fmt)
+        for batch in batches(rows, batch_size):
+            read += len(batch)
+            entries = [entry for entry in map(normalize, batch) if entry is not None]
+            skipped += len(batch) - len(entries)
+            if entries:
+                store.add(entries)  # One insert_many per batch
+            if sys.stderr.isatty():
+                print(f"\r{read} runs read", end="", file=sys.stderr)
+    if sys.stderr.isatty():
+        print(file=sys.stderr)
+    return read, skipped
+
+
+def export_scores(store, path, fmt, batch_size):
+    count = 0
+    with open_file(path, 'w') as f:
+        if fmt == 'csv':
+            writer = csv.DictWriter(f, fieldnames=FIELDS, extrasaction='ignore')
+            writer.writeheader()
+        for entry in store.scan(batch_size):
+            if fmt == 'csv':
+                writer.writerow(entry)
+            else:
+                f.write(json.dumps(entry, default=str) + "\n")  # default: ObjectId _ids
+            count += 1
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import or export runs in bulk (JSON lines or CSV)")
+    parser.add_argument("command", choices=("import", "export"))
+    parser.add_argument("path", help="file to read or write ('-' for stdin/stdout)")
+    parser.add_argument("--format", choices=("jsonl", "csv"), help="default: from the file extension")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f"runs per insert_many / per cursor batch (default {DEFAULT_BATCH_SIZE})")
+    parser.add_argument("--backend", choices=("mongo", "sqlite", "memory", "http"),
+                        help="default: SCORE_BACKEND")
+    args = parser.parse_args()
+
+    store = create_store(args.backend)
+    if not store.connect():
+        print(f"Could not connect to {store.label}", file=sys.stderr)
+        return 1
+
+    fmt = file_format(args.path, args.format)
+    start = time.perf_counter()
+    if args.command == 'import':
+        read, skipped = import_scores(store, args.path, fmt, args.batch_size)
+        print(f"{read - skipped} runs sent to {store.label}, {skipped} invalid rows skipped "
+              f"({time.perf_counter() - start:.2f}s)", file=sys.stderr)
+    else:
+        count = export_scores(store, args.path, fmt, args.batch_size)
+        print(f"{count} runs exported from {store.label} ({time.perf_counter() - start:.2f}s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+import io
+import pygame
+from src.core.managers.asset_manager import assets
+from src.utils.logger import get_logger
+
+log = get_logger("scenes")
+
+
+class PygameAudio:
+    """Plays sound effects and music through pygame.mixer."""
+
+    def __init__(self):
+        if not pygame.mixer.get_init():
+            try:
+                pygame.mixer.init()
+            except pygame.error as e:
+                log.warning("Could not start the mixer: %s", e)
+
+    def play_sound(self, path, volume=1.0):
+        try:
+            sound = assets.sound(path)  # Decoded once, then cached
+        except (pygame.error, FileNotFoundError) as e:
+            log.warning("Could not load sound %s: %s", path, e)
+            return
+        sound.set_volume(volume)
+        sound.play()
+
+    def play_music(self, path, loops=-1):
+        try:
+            pygame.mixer.music.load(io.BytesIO(assets.music(path)), path)  # Preloaded bytes when available
+            pygame.mixer.music.play(loops)
+        except (pygame.error, OSError) as e:
+            log.warning("Could not play music %s: %s", path, e)
+
+    def stop_music(self):
+        if not pygame.mixer.get_init():
+            return  # No audio device: nothing is playing
+        pygame.mixer.music.stop()
+
+    def music_busy(self):
+        if not pygame.mixer.get_init():
+            return False
+        return pygame.mixer.music.get_busy()
+
+
+class NullAudio:
+    """Silent backend for headless runs: nothing is loaded or played."""
+
+    def play_sound(self, path, volume=1.0):
+        pass
+
+    def play_music(self, path, loops=-1):
+        pass
+
+    def stop_music(self):
+        pass
+
+    def music_busy(self):
+        return False
@@ -1,9 +1,14 @@
-from pymongo.mongo_client import MongoClient
-from pymongo.server_api import ServerApi
 from dotenv import load_dotenv
 import os
+import threading
+import time
 import urllib.parse
-import certifi
+from src.utils.logger import get_logger
+
+# pymongo y certifi se importan al crear el cliente: importar este módulo no
+# retrasa el arranque del juego (el primer frame sale antes de tocar la red)
+
+log = get_logger("storage")
 
 load_dotenv()
 
@@ -12,60 +17,130 @@ raw_uri = os.getenv('MONGODB_URI')
 DB_NAME = os.getenv('MONGODB_DB_NAME')
 COLLECTION_NAME = 'Scores'
 
-# Parsear y reconstruir el URI con componentes codificados si es necesario
-if raw_uri and '@' in raw_uri:
+# Tiempos de espera cortos: sin red el juego no debe quedarse esperando ~30 s
+CONNECT_TIMEOUT_MS = int(os.getenv('MONGODB_CONNECT_TIMEOUT_MS', '3000'))
+SERVER_SELECTION_TIMEOUT_MS = int(os.getenv('MONGODB_SERVER_SELECTION_TIMEOUT_MS', '3000'))
+SOCKET_TIMEOUT_MS = int(os.getenv('MONGODB_SOCKET_TIMEOUT_MS', '10000'))
+# Pool de conexiones del cliente compartido (un servicio con muchos envíos a la vez necesita más)
+MAX_POOL_SIZE = int(os.getenv('MONGODB_MAX_POOL_SIZE', '100'))
+MIN_POOL_SIZE = int(os.getenv('MONGODB_MIN_POOL_SIZE', '0'))
+RETRY_WRITES = os.getenv('MONGODB_RETRY_WRITES', 'true').strip().lower() != 'false'
+# Segundos entre pings de la comprobación de salud
+HEALTH_INTERVAL = float(os.getenv('MONGODB_HEALTH_INTERVAL', '5'))
+
+
+def encode_uri(uri):
+    """URI con el usuario y la contraseña codificados (pueden llevar '@', ':'...)."""
+    if not uri or '@' not in uri:
+        return uri
     try:
         # Dividir el URI en partes
-        prefix = raw_uri.split('://', 1)[0]
-        rest = raw_uri.split('://', 1)[1]
+        prefix = uri.split('://', 1)[0]
+        rest = uri.split('://', 1)[1]
         credentials = rest.split('@')[0]
         host = rest.split('@', 1)[1]
-        
+
         # Dividir las credenciales
         username = credentials.split(':', 1)[0]
         password = credentials.split(':', 1)[1]
-        
+
         # Codificar el nombre de usuario y la contraseña
         encoded_username = urllib.parse.quote_plus(username)
         encoded_password = urllib.parse.quote_plus(password)
-        
+
         # Reconstruir el URI
-        MONGO_URI = f"{prefix}://{encoded_username}:{encoded_password}@{host}"
+        return f"{prefix}://{encoded_username}:{encoded_password}@{host}"
     except Exception as e:
-        print(f"Error al procesar el URI de MongoDB: {e}")
-        MONGO_URI = raw_uri
-else:
-    MONGO_URI = raw_uri
+        log.error("Error al procesar el URI de MongoDB: %s", e)
+        return uri
+
+
+# Un solo cliente por proceso: lo comparten todos los gestores y las reconexiones
+_client = None
+_probe = None
+_client_lock = threading.Lock()
+
+
+class HealthProbe:
+    """Hace ping al servidor cada HEALTH_INTERVAL segundos en su propio hilo.
+
+    ok se consulta sin esperar a la red: el juego nunca se bloquea por saber
+    si MongoDB responde.
+    """
+
+    def __init__(self, client, interval=HEALTH_INTERVAL):
+        self.client = client
+        self.interval = interval
+        self.ok = False
+        self.checked = False  # True tras el primer ping
+        self.latency = None  # Segundos del último ping correcto
+        self.thread = threading.Thread(target=self._run, name="mongo-health", daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        while True:
+            start = time.perf_counter()
+            try:
+                self.client.admin.command('ping')
+                self.latency = time.perf_counter() - start
+                if not self.ok and self.checked:
+                    log.info("MongoDB vuelve a responder.")
+                self.ok = True
+            except Exception as e:
+                if self.ok or not self.checked:
+                    log.warning("MongoDB no responde: %s", e)
+                self.ok = False
+            self.checked = True
+            time.sleep(self.interval)
+
+
+def get_client():
+    """Cliente compartido, creado la primera vez que se pide (no abre conexiones
+    por sí mismo: pymongo conecta y reconecta en segundo plano). None sin URI."""
+    global _client, _probe
+    if not raw_uri:
+        return None
+    with _client_lock:
+        if _client is None:
+            from pymongo.mongo_client import MongoClient
+            from pymongo.server_api import ServerApi
+            import certifi
+            _client = MongoClient(
+                encode_uri(raw_uri),
+                server_api=ServerApi('1'),
+                tlsCAFile=certifi.where(),  # Añadir certificado SSL
+                maxPoolSize=MAX_POOL_SIZE,
+                minPoolSize=MIN_POOL_SIZE,
+                connectTimeoutMS=CONNECT_TIMEOUT_MS,
+                serverSelectionTimeoutMS=SERVER_SELECTION_TIMEOUT_MS,
+                socketTimeoutMS=SOCKET_TIMEOUT_MS,
+                retryWrites=RETRY_WRITES
+            )
+            _probe = HealthProbe(_client)
+    return _client
+
+
+def is_healthy():
+    """False si la comprobación de salud ya sabe que MongoDB no responde. No bloquea."""
+    return _probe is None or not _probe.checked or _probe.ok
 
-print(f"Base de datos: {DB_NAME}")
-print(f"Colección: {COLLECTION_NAME}")
 
 def get_database():
+    if not raw_uri:
+        log.info("MONGODB_URI no está definido, se juega sin base de datos")
+        return None
+    try:
+        client = get_client()
+    except Exception as e:
+        log.error("Error al crear el cliente: %s", e)
+        return None
+
+    # Enviar un ping para confirmar la conexión (el cliente se reutiliza: sin nuevo handshake)
     try:
-        # Crear un nuevo cliente y conectarse al servidor
-        client = MongoClient(
-            MONGO_URI,
-            server_api=ServerApi('1'),
-            tlsCAFile=certifi.where()  # Añadir certificado SSL
-        )
-        
-        # Enviar un ping para confirmar una conexión exitosa
-        try:
-            client.admin.command('ping')
-            print("¡Conexión exitosa a MongoDB!")
-            
-            # Obtener la base de datos y la colección
-            db = client[DB_NAME]
-            collection = db[COLLECTION_NAME]
-            # Probar el acceso a la colección
-            collection.find_one()
-            print(f"¡Acceso exitoso a la base de datos {DB_NAME} y colección {COLLECTION_NAME}!")
-            return db
-        
-        except Exception as e:
-            print(f"Error de conexión: {e}")
-            return None
-        
+        client.admin.command('ping')
+        log.info("¡Conexión exitosa a MongoDB!")
+        log.info("Base de datos %s, colección %s.", DB_NAME, COLLECTION_NAME)
+        return client[DB_NAME]
     except Exception as e:
-        print(f"Error al crear el cliente: {e}")
-        return None 
\ No newline at end of file
+        log.error("Error de conexión: %s", e)
+        return None
@@ -0,0 +1,21 @@
+from dotenv import load_dotenv
+import os
+import platform
+
+load_dotenv()
+
+# Backend de las puntuaciones: 'mongo' (por defecto), 'sqlite', 'memory' o 'http'
+SCORE_BACKEND = os.getenv('SCORE_BACKEND', 'mongo').strip().lower()
+
+# Archivo de la base de datos SQLite (backend 'sqlite')
+SQLITE_PATH = os.getenv('SCORE_SQLITE_PATH', 'scores.db')
+
+# Identificador de la máquina en cada partida guardada; por defecto el nombre del equipo
+CABINET_ID = os.getenv('CABINET_ID') or platform.node() or 'unknown'
+
+# Temporada actual de las clasificaciones; sin definir, cada trimestre es una temporada
+SCORE_SEASON = os.getenv('SCORE_SEASON') or None
+
+# Servicio de clasificación local (backend 'http'): uno por local, delante de MongoDB
+LEADERBOARD_URL = os.getenv('LEADERBOARD_URL', 'http://127.0.0.1:8765')
+LEADERBOARD_TIMEOUT = float(os.getenv('LEADERBOARD_TIMEOUT', '3'))
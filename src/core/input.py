@@ -0,0 +1,75 @@
+import pygame
+
+# Player input for one simulation step, packed as bit flags
+ROTATE_LEFT = 1
+ROTATE_RIGHT = 2
+THRUST = 4
+REVERSE = 8
+FIRE = 16
+
+NO_INPUT = 0
+
+# Held keys and the flag each one sets
+KEY_BITS = {
+    pygame.K_LEFT: ROTATE_LEFT,
+    pygame.K_RIGHT: ROTATE_RIGHT,
+    pygame.K_UP: THRUST,
+    pygame.K_DOWN: REVERSE
+}
+
+
+class KeyboardInput:
+    """Reads the player's keyboard. Held keys are polled every step; key
+    presses are latched so a tap shorter than a step still counts once.
+    Firing only happens on SPACE presses, never while it is held."""
+
+    def __init__(self):
+        self.latched = NO_INPUT
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_SPACE:
+                self.latched |= FIRE
+            else:
+                self.latched |= KEY_BITS.get(event.key, NO_INPUT)
+
+    def poll(self):
+        bits = self.latched
+        self.latched = NO_INPUT
+        keys = pygame.key.get_pressed()
+        for key, bit in KEY_BITS.items():
+            if keys[key]:
+                bits |= bit
+        return bits
+
+
+class ScriptedInput:
+    """Input that does not need a keyboard: either a sequence with one value
+    per step (NO_INPUT once it runs out) or a function of the step number."""
+
+    def __init__(self, script=()):
+        self.script = script
+        self.tick = 0
+
+    def handle_event(self, event):
+        pass
+
+    def poll(self):
+        if callable(self.script):
+            bits = self.script(self.tick)
+        elif self.tick < len(self.script):
+            bits = self.script[self.tick]
+        else:
+            bits = NO_INPUT
+        self.tick += 1
+        return bits
+
+
+def autopilot(tick):
+    """Simple bot for soak tests: keeps turning and fires every few steps."""
+    bits = ROTATE_LEFT
+    if tick % 8 == 0:
+        bits |= FIRE
+    if tick % 120 < 20:
+        bits |= THRUST
+    return bits
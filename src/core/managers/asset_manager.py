@@ -0,0 +1,130 @@
+import os
+from collections import OrderedDict
+import pygame
+from src.utils.constants import ASSET_MEMORY_LIMIT
+from src.utils.logger import get_logger
+
+log = get_logger("storage")
+
+
+class AssetManager:
+    """Loads each font, sound and image once and hands out the same object.
+
+    Entries are keyed by (path, size, kind); AssetPreloader fills the same
+    keys ahead of time with put(). With a memory limit (in bytes,
+    estimated) the least recently used entries are evicted first; objects
+    still referenced by a scene stay alive, they just get loaded again the
+    next time they are asked for.
+    """
+
+    def __init__(self, memory_limit=ASSET_MEMORY_LIMIT):
+        self.memory_limit = memory_limit
+        self.memory_used = 0
+        self.cache = OrderedDict()  # key -> (asset, estimated bytes)
+        self.hits = 0
+        self.misses = 0
+
+    def font(self, path, size):
+        """pygame.font.Font; path None is pygame's default font."""
+        return self._get((path, size, 'font'), lambda: pygame.font.Font(path, size), self._font_bytes)
+
+    def sound(self, path):
+        return self._get((path, None, 'sound'), lambda: pygame.mixer.Sound(path), self._sound_bytes)
+
+    def image(self, path, alpha=True, size=None):
+        """Loaded image, converted to the display format when there is one.
+        With size, the image is scaled once and only the scaled copy is kept."""
+        def load():
+            return finish_image(decode_image(path, size), alpha)
+        return self._get(image_key(path, alpha, size), load, self._surface_bytes)
+
+    def music(self, path):
+        """The bytes of a music file, for pygame.mixer.music.load(io.BytesIO(...))."""
+        def load():
+            with open(path, 'rb') as f:
+                return f.read()
+        return self._get((path, None, 'music'), load, self._data_bytes)
+
+    def put(self, key, asset):
+        """Stores an asset loaded elsewhere (by the preloader) under its key."""
+        sizer = {'font': self._font_bytes, 'sound': self._sound_bytes, 'music': self._data_bytes}
+        self._store(key, asset, sizer.get(key[2], self._surface_bytes)(key, asset))
+
+    def __contains__(self, key):
+        return key in self.cache
+
+    def clear(self):
+        self.cache.clear()
+        self.memory_used = 0
+
+    def _get(self, key, loader, sizer):
+        entry = self.cache.get(key)
+        if entry is not None:
+            self.hits += 1
+            self.cache.move_to_end(key)
+            return entry[0]
+        self.misses += 1
+        asset = loader()  # Errors reach the caller, which knows the fallback
+        self._store(key, asset, sizer(key, asset))
+        log.debug("Asset loaded: %s", key)
+        return asset
+
+    def _store(self, key, asset, size):
+        old = self.cache.pop(key, None)
+        if old is not None:
+            self.memory_used -= old[1]
+        self.cache[key] = (asset, size)
+        self.memory_used += size
+        if self.memory_limit is not None:
+            # Evict the least recently used entries, never the new one
+            while self.memory_used > self.memory_limit and len(self.cache) > 1:
+                evicted_key, (_, evicted_size) = self.cache.popitem(last=False)
+                self.memory_used -= evicted_size
+                log.debug("Asset evicted: %s", evicted_key)
+
+    @staticmethod
+    def _font_bytes(key, font):
+        path = key[0]
+        try:
+            return os.path.getsize(path) if path else 0
+        except OSError:
+            return 0
+
+    @staticmethod
+    def _sound_bytes(key, sound):
+        mixer = pygame.mixer.get_init()
+        if not mixer:
+            return 0
+        frequency, bits, channels = mixer
+        return int(sound.get_length() * frequency * channels * abs(bits) // 8)
+
+    @staticmethod
+    def _data_bytes(key, data):
+        return len(data)
+
+    @staticmethod
+    def _surface_bytes(key, surface):
+        return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+
+def image_key(path, alpha=True, size=None):
+    return (path, size, 'image' if alpha else 'opaque image')
+
+
+def decode_image(path, size=None):
+    """Decodes (and scales) an image. Needs no display, so it can run on any thread."""
+    surface = pygame.image.load(path)
+    if size is not None and surface.get_size() != tuple(size):
+        surface = pygame.transform.scale(surface, size)
+    return surface
+
+
+def finish_image(surface, alpha=True):
+    """Converts a decoded image to the display format; main thread only."""
+    if pygame.display.get_surface() is None:
+        return surface
+    return surface.convert_alpha() if alpha else surface.convert()
+
+
+# Shared instance used by scenes, entities and audio
+assets = AssetManager()
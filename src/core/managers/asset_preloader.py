@@ -0,0 +1,113 @@
+import importlib
+import io
+import queue
+import threading
+import time
+import pygame
+from src.core.managers.asset_manager import assets, image_key, decode_image, finish_image
+from src.utils.constants import *
+from src.utils.logger import get_logger
+
+log = get_logger("storage")
+
+KINDS = ('image', 'font', 'sound', 'music', 'module')
+# What the menu and the first game use, in the order they are needed.
+# Each job is (kind, path, arg): the font size, the image size or None.
+GAME_ASSETS = (
+    ('font', FONT_PATH, 24), ('font', FONT_PATH, 28), ('font', FONT_PATH, 48),
+    ('font', None, 22), ('font', None, 24), ('font', None, 36), ('font', None, 48), ('font', None, 74),
+    ('music', MENU_MUSIC, None),
+    ('module', 'src.scenes.game_scene', None),
+    ('music', GAME_MUSIC, None),
+    ('sound', LASER_SOUND, None),
+    ('music', GAME_OVER_MUSIC, None),
+)
+
+
+class AssetPreloader:
+    """Loads assets into the shared AssetManager before they are asked for.
+
+    A worker thread does the slow part (reading files, decoding and scaling
+    images, importing scene modules); the main thread calls pump() once per
+    frame to finish what is ready and to store it, stopping after budget
+    seconds. Fonts and sounds are built there from the bytes the worker read,
+    since SDL_ttf and the mixer are not thread-safe and the scenes may be
+    loading their own at the same time; surfaces are converted to the
+    display format there too. Assets
+    that fail are only logged: asked for later, they are loaded (and fail)
+    the usual way. progress goes from 0 to 1; done is True once every job
+    is finished.
+    """
+
+    def __init__(self, jobs=GAME_ASSETS):
+        self.jobs = list(dict.fromkeys(jobs))  # Without repeats, in order
+        for kind, path, _ in self.jobs:
+            if kind not in KINDS:
+                raise ValueError(f"Unknown asset kind for {path}: {kind!r} (use {', '.join(KINDS)})")
+        self.ready = queue.Queue()  # (job, decoded asset or None)
+        self.finished = set()
+        self.thread = None
+
+    @property
+    def progress(self):
+        return len(self.finished) / len(self.jobs) if self.jobs else 1.0
+
+    @property
+    def done(self):
+        return len(self.finished) == len(self.jobs)
+
+    def is_finished(self, kind, path, arg=None):
+        """True once a job is done (loaded or failed) or when it was never queued."""
+        job = (kind, path, arg)
+        return job in self.finished or job not in self.jobs
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name="asset-preload", daemon=True)
+            self.thread.start()
+
+    def pump(self, budget=PRELOAD_FRAME_BUDGET):
+        """Finishes decoded assets on the main thread for up to budget seconds."""
+        deadline = time.perf_counter() + budget
+        while not self.done and time.perf_counter() < deadline:
+            try:
+                job, decoded = self.ready.get_nowait()
+            except queue.Empty:
+                return
+            kind, path, arg = job
+            try:
+                if decoded is None:
+                    pass  # Failed, or nothing to keep (modules)
+                elif kind == 'image':
+                    assets.put(image_key(path, True, arg), finish_image(decoded))
+                elif kind == 'font':
+                    assets.put((path, arg, kind), pygame.font.Font(io.BytesIO(decoded) if path else None, arg))
+                elif kind == 'sound':
+                    assets.put((path, arg, kind), pygame.mixer.Sound(io.BytesIO(decoded)))
+                elif kind == 'music':
+                    assets.put((path, arg, kind), decoded)
+            except (pygame.error, OSError) as e:
+                log.warning("Could not preload %s %s: %s", kind, path, e)
+            self.finished.add(job)
+
+    def _run(self):
+        for job in self.jobs:
+            self.ready.put((job, self._decode(*job)))
+
+    def _decode(self, kind, path, arg):
+        # Worker thread: nothing here touches the display, the asset cache,
+        # SDL_ttf or the mixer. Fonts, sounds and music are only read
+        try:
+            if kind == 'image':
+                return decode_image(path, arg)
+            if kind == 'font' and path is None:
+                return b''  # pygame's default font: nothing to read
+            if kind == 'sound' and not pygame.mixer.get_init():
+                return None  # No audio: the game plays without sound
+            if kind in ('font', 'sound', 'music'):
+                with open(path, 'rb') as f:
+                    return f.read()
+            importlib.import_module(path)
+        except (pygame.error, OSError, ImportError) as e:
+            log.debug("Preload of %s %s failed: %s", kind, path, e)
+        return None
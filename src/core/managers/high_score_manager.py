@@ -0,0 +1,346 @@
+import atexit
+import heapq
+import threading
+import time
+import uuid
+from src.core.managers.high_score_writer import HighScoreWriter, WriteBatcher, completed
+from src.core.managers.score_journal import ScoreJournal
+from src.core.storage.score_store import create_store, run_scopes, scope_filter
+from src.core.config.storage_config import CABINET_ID
+from src.utils.constants import SCORE_JOURNAL_PATH, RETRY_DELAY, RETRY_MAX_DELAY, JOURNAL_SYNC_BATCH, LEADERBOARD_TTL
+from src.utils.logger import get_logger
+
+log = get_logger("storage")
+
+
+class HighScoreManager:
+    def __init__(self, store=None, max_scores=8, connect=True, journal_path=SCORE_JOURNAL_PATH):
+        """store es el backend (ScoreStore); por defecto el de SCORE_BACKEND.
+        connect=False no abre la conexión: se hace luego con connect_async().
+        journal_path=None desactiva el diario local (solo se usa con backends remotos)."""
+        self.store = store if store is not None else create_store()
+        self.max_scores = max_scores
+        # Caché del top: version aumenta con cada cambio (las escenas redibujan solo entonces)
+        self.version = 0
+        self.high_scores = []
+        self.loaded_at = float('-inf')
+        self.refresh_job = None
+        self.status_message = ""
+        self.connected = False
+        # Los guardados (y la conexión) se hacen en segundo plano para no congelar el juego
+        self.writer = HighScoreWriter()
+        # Puntuaciones que llegan casi a la vez se guardan juntas: un insert_many por lote
+        self.batcher = WriteBatcher(self.writer, self._store_scores)
+        self.connection = None  # Future de la conexión en curso
+        self.syncer = None
+        self.sync_job = None
+        # Con un backend remoto, toda puntuación se escribe primero en el diario local y luego se sube
+        self.journal = ScoreJournal(journal_path) if journal_path and self.store.remote else None
+        if self.journal is not None:
+            atexit.register(self.journal.close)  # Después de vaciar la cola del writer
+            self._merge_scores(self.journal.read_pending()[0])
+            if self.journal.pending:
+                self._start_syncer()
+
+        if connect and not self._connect():
+            self._start_syncer()  # Se reintenta en segundo plano
+
+    @property
+    def high_scores(self):
+        return self._high_scores
+
+    @high_scores.setter
+    def high_scores(self, scores):
+        self._high_scores = scores
+        self.version += 1
+
+    def connect_async(self):
+        """Empieza a conectar en segundo plano y retorna un Future (True si hay conexión)."""
+        if self.connection is None:
+            self.status_message = f"Conectando con {self.store.label}..."
+            self.connection = self.writer.submit(self._connect)
+            self._start_syncer()
+        return self.connection
+
+    def is_ready(self):
+        """True cuando el intento de conexión ha terminado (con o sin éxito)."""
+        return self.connection is None or self.connection.done()
+
+    def is_connected(self):
+        """True si hay conexión con el backend y no se sabe que haya caído. No bloquea."""
+        return self.connected and self.store.healthy()
+
+    def _connect(self):
+        """Abre el backend y carga las puntuaciones."""
+        try:
+            if not self.store.connect():
+                self.status_message = f"No se pudo conectar a {self.store.label}"
+                return False
+            # Puntuaciones locales (del diario o añadidas mientras se conectaba)
+            local_scores = self.high_scores
+            self.connected = True
+            self.load_high_scores()
+            self._merge_scores(local_scores)
+            if self.journal is not None:
+                self.sync_journal()
+            return True
+        except Exception as e:
+            log.error("Error al inicializar %s: %s", self.store.label, e)
+            self.status_message = f"Error al inicializar la conexión con {self.store.label}"
+            return False
+
+    def _connecting(self):
+        return self.connection is not None and not self.connection.done()
+
+    def _merge_scores(self, scores):
+        """Añade puntuaciones a la lista en memoria sin repetir las que tienen el mismo _id.
+        Se recalcula una vez por llamada, y solo si alguna entra en el top."""
+        if not scores:
+            return
+        ids = {s['_id'] for s in self.high_scores if '_id' in s}
+        candidates = [s for s in scores if (s.get('_id') is None or s['_id'] not in ids) and self.is_high_score(s['score'])]
+        if candidates:
+            merged = heapq.nlargest(self.max_scores, self.high_scores + candidates, key=lambda x: x['score'])
+            self.high_scores = merged
+
+    def load_high_scores(self):
+        """Carga las mejores puntuaciones desde el backend."""
+        if not self.connected:
+            if not self._connecting():  # Mientras se conecta se mantiene el mensaje
+                self.status_message = f"No hay conexión con {self.store.label}"
+            return
+
+        self.status_message = "Cargando puntuaciones..."
+        try:
+            self.high_scores = self.store.top(self.max_scores)
+            self.loaded_at = time.monotonic()
+            self.status_message = "Puntuaciones cargadas correctamente"
+            log.info("High scores cargadas correctamente desde %s.", self.store.label)
+        except Exception as e:
+            self.status_message = f"Error al cargar puntuaciones: {str(e)}"
+            log.error("Error cargando high scores desde %s: %s", self.store.label, e)
+            self.high_scores = []
+
+    def save_scores(self, entries):
+        """Guarda un lote de puntuaciones de una vez. Retorna True si se guardaron.
+
+        Cada puntuación lleva su propio _id: si se reintenta un lote ya guardado,
+        los duplicados se ignoran y no aparecen filas repetidas.
+        """
+        if not self.connected:
+            self.status_message = f"No hay conexión con {self.store.label}"
+            return False
+
+        self.status_message = "Guardando puntuaciones..."
+        try:
+            self.store.add(entries)
+            self.status_message = "Puntuaciones guardadas correctamente"
+            log.info("%d high score(s) guardadas correctamente en %s.", len(entries), self.store.label)
+            return True
+        except Exception as e:
+            self.status_message = f"Error al guardar puntuaciones: {str(e)}"
+            log.error("Error guardando high scores en %s: %s", self.store.label, e)
+            return False
+
+    def sync_journal(self):
+        """Sube por lotes las puntuaciones del diario que faltan. Retorna True si no queda ninguna."""
+        if not self.connected:
+            return False
+        while True:
+            entries, offset = self.journal.read_pending(JOURNAL_SYNC_BATCH)
+            if not entries:
+                if offset != self.journal.synced_offset:
+                    self.journal.mark_synced(offset, 0)  # Solo líneas dañadas
+                return True
+            if not self.save_scores(entries):
+                return False
+            self.journal.mark_synced(offset, len(entries))
+
+    def _store_scores(self, entries):
+        """Trabajo del writer: un lote de puntuaciones. Actualiza el top una vez
+        por lote, y luego diario local primero y el backend si hay conexión."""
+        self._merge_scores(entries)
+        if self.journal is None:
+            return self.save_scores(entries)
+        end_offset = self.journal.append_many(entries)
+        if not self.connected:
+            self.status_message = f"Puntuación guardada localmente (se subirá a {self.store.label})"
+            return False
+        if self.journal.pending == len(entries):
+            # Solo falta este lote: se sube sin volver a leer el diario
+            if not self.save_scores(entries):
+                return False
+            self.journal.mark_synced(end_offset, len(entries))
+            return True
+        return self.sync_journal()
+
+    def _start_syncer(self):
+        """Hilo que reconecta y sube el diario cuando vuelve la conexión."""
+        if not self.store.remote or self.syncer is not None:
+            return
+        self.syncer = threading.Thread(target=self._sync_loop, name="score-syncer", daemon=True)
+        self.syncer.start()
+
+    def _sync_loop(self):
+        # Cada intento fallido dobla la espera (hasta RETRY_MAX_DELAY), y no se
+        # intenta mientras la comprobación de salud diga que el backend no responde:
+        # un intento condenado ocuparía el writer y retrasaría los guardados
+        delay = RETRY_DELAY
+        seen = None  # Último intento cuyo resultado ya ajustó la espera
+        while True:
+            time.sleep(delay)
+            job = self.sync_job
+            if job is not None and not job.done():
+                continue
+            if job is not None and job is not seen:
+                seen = job
+                failed = job.exception() is not None or job.result() is False
+                delay = min(delay * 2, RETRY_MAX_DELAY) if failed else RETRY_DELAY
+            pending = self.journal is not None and self.journal.pending
+            if (not self.connected or pending) and self.store.healthy() and not self._connecting():
+                self.sync_job = self.writer.submit(self._resync)
+
+    def _resync(self):
+        if not self.connected:
+            return self._connect()  # También sube el diario si conecta
+        return self.sync_journal() if self.journal is not None else True
+
+    def is_high_score(self, score):
+        """Verifica si una puntuación es suficiente para entrar en las high scores."""
+        if len(self.high_scores) < self.max_scores:
+            return True
+        return score > self.high_scores[-1]['score'] if self.high_scores else True
+
+    def add_high_score(self, name, score, level=None, duration=None):
+        """Guarda una partida terminada (todas se guardan, no solo el top) y
+        mantiene ordenada la lista de las mejores.
+
+        El guardado (lista en memoria, diario local y backend) se hace en
+        segundo plano y en lotes con las que lleguen a la vez (WRITE_BATCH_WINDOW):
+        retorna un Future que termina con True si la puntuación ya está en el backend.
+        """
+        if not isinstance(name, str) or not isinstance(score, (int, float)):
+            self.status_message = "Error: formato de datos inválido"
+            return completed(False)
+
+        if len(name) > 3:  # Limitar nombres a 3 caracteres en el juego
+            name = name[:3]
+
+        self.status_message = "Añadiendo nueva puntuación..."
+        # El _id se genera aquí para que reintentar la subida nunca la duplique
+        created = time.time()
+        new_score = {
+            '_id': uuid.uuid4().hex,
+            'name': name,
+            'score': score,
+            'level': level,
+            'duration': duration,
+            'created': created,
+            'cabinet': CABINET_ID,
+            **run_scopes(created),  # Temporada y semana, para las clasificaciones por ámbito
+        }
+        if self.journal is None and not self.connected and not self._connecting():
+            self._merge_scores([new_score])
+            self.status_message = f"Puntuación guardada localmente (sin conexión a {self.store.label})"
+            return completed(False)
+
+        # Top, diario y backend en segundo plano, sin esperar al disco ni a la red,
+        # agrupada con las que lleguen a la vez. Si aún se está conectando, el
+        # guardado espera en la cola a la conexión
+        self.status_message = "Guardando puntuaciones..."
+        future = self.batcher.submit(new_score)
+        future.add_done_callback(self._on_save_done)
+        self._start_syncer()
+        return future
+
+    def _on_save_done(self, future):
+        """Actualiza el mensaje de estado si el guardado no llegó a ejecutarse."""
+        error = future.exception()
+        if error is not None:
+            self.status_message = f"Error al guardar puntuaciones: {str(error)}"
+
+    def get_rank(self, score, scope='all'):
+        """Posición que tendría una puntuación entre todas las guardadas del ámbito.
+
+        Consulta el backend en segundo plano: retorna un Future con la posición
+        (empezando en 1), o None si no hay conexión.
+        """
+        return self.writer.submit(self._query, 'rank', score, scope_filter(scope))
+
+    def get_around(self, score, before=2, after=2, scope='all'):
+        """Partidas alrededor de una puntuación, de mejor a peor.
+
+        Como get_rank, consulta el backend en segundo plano: retorna un Future
+        con la lista (hasta before por encima y after por debajo o iguales),
+        o None si no hay conexión.
+        """
+        return self.writer.submit(self._query, 'around', score, before, after, scope_filter(scope))
+
+    def get_leaderboard(self, scope='all', after=None, limit=None):
+        """Una página de la clasificación de un ámbito ('all', 'season', 'week' o 'cabinet').
+
+        after es la (score, _id) de la última fila de la página anterior
+        (paginación por clave). Retorna un Future con la lista, o None si
+        no hay conexión.
+        """
+        return self.writer.submit(self._query, 'top', limit or self.max_scores, scope_filter(scope), after)
+
+    def _query(self, method, *args):
+        """Trabajo del writer: una consulta de lectura al backend."""
+        if not self.connected:
+            return None
+        return getattr(self.store, method)(*args)
+
+    def get_high_scores(self):
+        """Retorna la lista de high scores en caché, sin esperar al backend.
+
+        Pasados LEADERBOARD_TTL segundos desde la última lectura se pide una
+        nueva en segundo plano; la lista (y version) cambian cuando llega.
+        """
+        if self.connected and time.monotonic() - self.loaded_at > LEADERBOARD_TTL:
+            self.refresh_high_scores()
+        return self.high_scores
+
+    def refresh_high_scores(self):
+        """Vuelve a leer el top en segundo plano. Retorna el Future de la lectura."""
+        if self.refresh_job is None or self.refresh_job.done():
+            self.loaded_at = time.monotonic()  # Una sola lectura en curso
+            self.refresh_job = self.writer.submit(self._refresh)
+        return self.refresh_job
+
+    def _refresh(self):
+        """Trabajo del writer: lee el top sin tocar el mensaje de estado si todo va bien."""
+        try:
+            scores = self.store.top(self.max_scores)
+        except Exception as e:
+            self.status_message = f"Error al cargar puntuaciones: {str(e)}"
+            log.error("Error cargando high scores desde %s: %s", self.store.label, e)
+            return False
+        # Las puntuaciones del diario aún no subidas siguen en la lista
+        pending = self.journal.read_pending()[0] if self.journal is not None else []
+        ids = {s['_id'] for s in scores if '_id' in s}
+        merged = scores + [s for s in pending if s['_id'] not in ids]
+        merged = sorted(merged, key=lambda x: x['score'], reverse=True)[:self.max_scores]
+        if merged != self.high_scores:
+            self.high_scores = merged
+        self.loaded_at = time.monotonic()
+        return True
+
+    def get_status_message(self):
+        """Retorna el mensaje de estado actual."""
+        return self.status_message
+
+    def clear_high_scores(self):
+        """Elimina todas las puntuaciones."""
+        if self.connected:
+            try:
+                self.store.clear()
+                self.high_scores = []
+                self.status_message = "Puntuaciones eliminadas correctamente"
+                return True
+            except Exception as e:
+                self.status_message = f"Error al eliminar puntuaciones: {str(e)}"
+                return False
+        else:
+            self.status_message = f"No hay conexión con {self.store.label}"
+            return False
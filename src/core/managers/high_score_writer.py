@@ -0,0 +1,174 @@
+import atexit
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from src.utils.constants import (WRITE_QUEUE_SIZE, WRITER_SHUTDOWN_TIMEOUT, WRITE_BATCH_WINDOW, WRITE_BATCH_SIZE,
+                                 WRITE_BATCH_MAX_PENDING)
+from src.utils.logger import get_logger
+
+log = get_logger("storage")
+
+_STOP = object()
+
+
+class QueueFullError(Exception):
+    """The writer already holds WRITE_QUEUE_SIZE pending jobs."""
+
+
+def completed(result):
+    """Future that is already done, for backends with nothing to wait for."""
+    future = Future()
+    future.set_result(result)
+    return future
+
+
+class HighScoreWriter:
+    """Runs database writes on a background thread so the game loop never
+    waits on the network.
+
+    submit() returns a concurrent.futures.Future at once. The queue is
+    bounded: when it is full the job is refused (its future fails with
+    QueueFullError) instead of blocking the caller. Pending jobs are given
+    WRITER_SHUTDOWN_TIMEOUT seconds to finish when the program exits.
+    """
+
+    def __init__(self, max_pending=WRITE_QUEUE_SIZE, name="score-writer"):
+        self.queue = queue.Queue(maxsize=max_pending)
+        self.name = name
+        self._thread = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @property
+    def pending(self):
+        """Jobs queued or running."""
+        return self.queue.unfinished_tasks
+
+    def submit(self, job, *args):
+        future = Future()
+        if self._closed:
+            future.set_exception(RuntimeError("writer closed"))
+            return future
+        self._start()
+        try:
+            self.queue.put_nowait((future, job, args))
+        except queue.Full:
+            log.warning("Write queue full, job refused")
+            future.set_exception(QueueFullError(f"{self.queue.maxsize} writes already pending"))
+        return future
+
+    def close(self, timeout=WRITER_SHUTDOWN_TIMEOUT):
+        """Stops accepting jobs and waits for the pending ones to finish."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+        if thread is None:
+            return
+        try:
+            self.queue.put(_STOP, timeout=timeout)
+            thread.join(timeout)
+        except queue.Full:
+            pass
+        if thread.is_alive():
+            log.warning("%d write(s) still pending at exit", self.pending)
+
+    def _start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+        atexit.register(self.close)
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is _STOP:
+                self.queue.task_done()
+                return
+            future, job, args = item
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(job(*args))
+                except Exception as e:
+                    log.error("Background write failed: %s", e)
+                    future.set_exception(e)
+            self.queue.task_done()
+
+
+class WriteBatcher:
+    """Coalesces items submitted close together into one writer job.
+
+    The first item of a batch schedules a job on the writer. Under load (the
+    previous batch had more than one item) that job waits up to window
+    seconds, or until max_batch items, for more; a lone item is not held
+    back. It then calls flush(items) once for all of them. While the writer
+    is busy, new items simply pile up for the next batch. submit() returns a Future per item,
+    resolved with flush's result (or its exception). At most max_pending
+    items wait at once; beyond that they are refused with QueueFullError.
+    """
+
+    def __init__(self, writer, flush, window=WRITE_BATCH_WINDOW, max_batch=WRITE_BATCH_SIZE,
+                 max_pending=WRITE_BATCH_MAX_PENDING):
+        self.writer = writer
+        self.flush = flush
+        self.window = window
+        self.max_batch = max_batch
+        self.max_pending = max_pending
+        self.items = []  # (item, future) not yet flushed
+        self.opened_at = 0.0  # When the next batch got its first item
+        self.scheduled = False
+        self.last_batch = 0  # Size of the previous batch
+        self.condition = threading.Condition()
+
+    def submit(self, item):
+        future = Future()
+        with self.condition:
+            if len(self.items) >= self.max_pending:
+                future.set_exception(QueueFullError(f"{self.max_pending} scores already waiting"))
+                return future
+            self.items.append((item, future))
+            if len(self.items) >= self.max_batch:
+                self.condition.notify()
+            if not self.scheduled:
+                self._schedule()
+        return future
+
+    def _schedule(self):
+        # Called with the condition held
+        self.scheduled = True
+        self.opened_at = time.monotonic()
+        job = self.writer.submit(self._drain)
+        if job.done() and job.exception() is not None:
+            # Refused (queue full or writer closed): nothing would ever flush these
+            for _, future in self.items:
+                future.set_exception(job.exception())
+            self.items.clear()
+            self.scheduled = False
+
+    def _drain(self):
+        with self.condition:
+            deadline = self.opened_at + self.window
+            while self.last_batch > 1 and len(self.items) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self.condition.wait(remaining)
+            batch = self.items[:self.max_batch]
+            del self.items[:self.max_batch]
+            self.last_batch = len(batch)
+            self.scheduled = False
+            if self.items:
+                self._schedule()
+        try:
+            result = self.flush([item for item, _ in batch])
+        except Exception as e:
+            log.error("Batched write failed: %s", e)
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        for _, future in batch:
+            future.set_result(result)
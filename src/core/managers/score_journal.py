@@ -0,0 +1,129 @@
+import json
+import os
+import time
+from src.utils.constants import JOURNAL_FSYNC_INTERVAL, JOURNAL_FSYNC_BATCH
+from src.utils.logger import get_logger
+
+log = get_logger("storage")
+
+
+class ScoreJournal:
+    """Append-only JSON-lines file holding every submitted score.
+
+    Scores are written here first, then uploaded to the database. The byte
+    offset of the uploaded prefix is kept in '<path>.synced', replaced
+    atomically, so a crash at worst uploads some scores twice (entries carry
+    their own '_id', and duplicates are ignored).
+
+    Appends are flushed to the OS at once and fsynced in batches: after
+    JOURNAL_FSYNC_BATCH appends or JOURNAL_FSYNC_INTERVAL seconds; the
+    offset file is written along with those fsyncs. Not thread-safe: use it
+    from one thread (the score writer).
+    """
+
+    def __init__(self, path, fsync_interval=JOURNAL_FSYNC_INTERVAL, fsync_batch=JOURNAL_FSYNC_BATCH):
+        self.path = path
+        self.offset_path = path + '.synced'
+        self.fsync_interval = fsync_interval
+        self.fsync_batch = fsync_batch
+        self.file = None
+        self.end_offset = 0
+        self.offset_dirty = False
+        self.unflushed = 0
+        self.last_fsync = time.monotonic()
+        self.synced_offset = self._read_offset()
+        self.pending = len(self.read_pending()[0])
+
+    def append(self, entry):
+        """Writes one entry and returns the journal size after it."""
+        return self.append_many([entry])
+
+    def append_many(self, entries):
+        """Writes a batch of entries with one write and returns the journal size after them."""
+        if self.file is None:
+            self._open()
+        data = b''.join((json.dumps(entry, separators=(',', ':')) + '\n').encode('utf-8') for entry in entries)
+        self.file.write(data)
+        self.file.flush()
+        self.end_offset += len(data)
+        self.pending += len(entries)
+        self.unflushed += len(entries)
+        if self.unflushed >= self.fsync_batch or time.monotonic() - self.last_fsync >= self.fsync_interval:
+            self.fsync()
+        return self.end_offset
+
+    def fsync(self):
+        if self.file is not None and self.unflushed:
+            os.fsync(self.file.fileno())
+        if self.offset_dirty:
+            self._write_offset()
+        self.unflushed = 0
+        self.last_fsync = time.monotonic()
+
+    def read_pending(self, limit=None):
+        """Entries not uploaded yet (at most limit) and the offset after them."""
+        try:
+            with open(self.path, 'rb') as f:
+                f.seek(self.synced_offset)
+                data = f.read()
+        except FileNotFoundError:
+            return [], self.synced_offset
+        entries = []
+        offset = self.synced_offset
+        for line in data.splitlines(keepends=True):
+            if not line.endswith(b'\n') or (limit is not None and len(entries) >= limit):
+                break  # A line cut short by a crash is completed by the next append
+            offset += len(line)
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                log.warning("Skipping damaged journal line at byte %d", offset - len(line))
+        return entries, offset
+
+    def mark_synced(self, offset, count):
+        """Records that everything before offset (count entries) is uploaded.
+        The offset file is written with the next fsync or on close."""
+        self.synced_offset = offset
+        self.pending = max(0, self.pending - count)
+        self.offset_dirty = True
+
+    def close(self):
+        if self.file is not None:
+            self.fsync()
+            self.file.close()
+            self.file = None
+        elif self.offset_dirty:
+            self._write_offset()
+
+    def _write_offset(self):
+        # No fsync: losing the offset only means uploading again, which is harmless
+        tmp_path = self.offset_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            f.write(str(self.synced_offset))
+        os.replace(tmp_path, self.offset_path)
+        self.offset_dirty = False
+
+    def _open(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Terminate a line left incomplete by a crash so it stays on its own
+        with open(self.path, 'a+b') as f:
+            if f.tell() > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    f.write(b'\n')
+        self.file = open(self.path, 'ab')
+        self.end_offset = self.file.tell()
+
+    def _read_offset(self):
+        try:
+            with open(self.offset_path) as f:
+                offset = int(f.read().strip() or 0)
+        except (FileNotFoundError, ValueError):
+            return 0
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            size = 0
+        return offset if offset <= size else 0  # Journal replaced: upload it all again
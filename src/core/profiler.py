@@ -0,0 +1,139 @@
+import json
+import os
+import time
+from collections import deque
+import pygame
+from src.core.managers.asset_manager import assets
+from src.utils.constants import PROFILER_WINDOW, PROFILER_TRACE_EVENTS, WHITE, BLACK, YELLOW
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class FrameProfiler:
+    """Times the phases of every frame of Game.run.
+
+    The loop calls begin_frame(), then mark(phase) at the end of each phase
+    (the time since the previous mark goes to that phase), then end_frame().
+    Scenes can report sub-phases with add(), e.g. collisions inside update.
+    Rolling statistics cover the last PROFILER_WINDOW frames; the trace keeps
+    the last PROFILER_TRACE_EVENTS events for Chrome's trace viewer
+    (chrome://tracing or https://ui.perfetto.dev).
+    """
+
+    def __init__(self, window=PROFILER_WINDOW, trace_events=PROFILER_TRACE_EVENTS):
+        self.window = window
+        self.frame_times = deque(maxlen=window)
+        self.phase_times = {}  # phase -> deque of seconds per frame
+        self.counts = {}
+        self.trace = deque(maxlen=trace_events)
+        self.origin = time.perf_counter()
+        self.frame_start = self.origin
+        self.last_mark = self.origin
+        self.current = {}
+        self.overlay_visible = False
+        self.overlay = None
+        self.overlay_built = 0.0
+
+    def begin_frame(self):
+        now = time.perf_counter()
+        self.frame_start = now
+        self.last_mark = now
+        self.current = {}
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self._record(phase, self.last_mark, now)
+        self.last_mark = now
+
+    def add(self, phase, start, end):
+        """Records a sub-phase measured by the caller (perf_counter times)."""
+        self._record(phase, start, end)
+
+    def count(self, name, value):
+        self.counts[name] = value
+
+    def _record(self, phase, start, end):
+        self.current[phase] = self.current.get(phase, 0.0) + (end - start)
+        self.trace.append((phase, start, end - start))
+
+    def end_frame(self):
+        now = time.perf_counter()
+        self.frame_times.append(now - self.frame_start)
+        for phase, seconds in self.current.items():
+            times = self.phase_times.get(phase)
+            if times is None:
+                times = self.phase_times[phase] = deque(maxlen=self.window)
+            times.append(seconds)
+        self.trace.append(('frame', self.frame_start, now - self.frame_start))
+        if self.counts:
+            self.trace.append(('counts', now, dict(self.counts)))
+
+    def stats(self):
+        """Frame time percentiles and mean time per phase, in milliseconds."""
+        frames = sorted(self.frame_times)
+        result = {
+            'frames': len(frames),
+            'p50': percentile(frames, 0.50) * 1000,
+            'p95': percentile(frames, 0.95) * 1000,
+            'p99': percentile(frames, 0.99) * 1000,
+            'phases': {}
+        }
+        for phase, times in self.phase_times.items():
+            result['phases'][phase] = sum(times) / len(times) * 1000 if times else 0.0
+        return result
+
+    def toggle_overlay(self):
+        self.overlay_visible = not self.overlay_visible
+        self.overlay = None
+
+    def draw_overlay(self, screen):
+        if not self.overlay_visible:
+            return
+        # Text changes every frame: rebuild the panel a few times per second only
+        now = time.perf_counter()
+        if self.overlay is None or now - self.overlay_built > 0.25:
+            self.overlay = self._build_overlay()
+            self.overlay_built = now
+        screen.blit(self.overlay, (10, 50))
+
+    def _build_overlay(self):
+        stats = self.stats()
+        lines = [f"frame ms  p50 {stats['p50']:.2f}  p95 {stats['p95']:.2f}  p99 {stats['p99']:.2f}"]
+        for phase, ms in stats['phases'].items():
+            lines.append(f"{phase:<10} {ms:6.2f} ms")
+        for name, value in self.counts.items():
+            lines.append(f"{name:<10} {value}")
+
+        font = assets.font(None, 22)
+        rendered = [font.render(line, True, YELLOW if i == 0 else WHITE) for i, line in enumerate(lines)]
+        width = max(surface.get_width() for surface in rendered) + 16
+        height = sum(surface.get_height() for surface in rendered) + 12
+        panel = pygame.Surface((width, height))
+        panel.fill(BLACK)
+        panel.set_alpha(200)
+        y = 6
+        for surface in rendered:
+            panel.blit(surface, (8, y))
+            y += surface.get_height()
+        return panel
+
+    def export_chrome_trace(self, path):
+        """Writes the buffered events as Chrome trace-event JSON."""
+        events = []
+        for name, start, value in self.trace:
+            ts = (start - self.origin) * 1e6
+            if name == 'counts':
+                events.append({'name': 'entities', 'ph': 'C', 'ts': ts, 'pid': 1, 'tid': 1, 'args': value})
+            else:
+                events.append({'name': name, 'ph': 'X', 'ts': ts, 'dur': value * 1e6, 'pid': 1, 'tid': 1})
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+        return len(events)
@@ -0,0 +1,180 @@
+import mmap
+import os
+import pickle
+import struct
+import zlib
+from src.core.audio import NullAudio
+from src.core.headless import NullHighScoreManager
+from src.utils.logger import get_logger
+
+log = get_logger("scenes")
+
+# File layout (little endian):
+#   header     magic, version, seed, start level, keyframe interval,
+#              tick count, index offset, keyframe count
+#   inputs     one byte of input bits (see src/core/input.py) per tick
+#   keyframes  zlib-compressed pickles of GameScene.get_state()
+#   index      (tick, offset, length, state checksum) per keyframe
+#
+# The header is rewritten when the recorder is closed. A file that was never
+# closed (the game crashed) still replays from tick 0 using the seed.
+# Keyframes are pickles: only open replays from sources you trust.
+MAGIC = b'ASTR'
+VERSION = 1
+HEADER = struct.Struct('<4sHQIIQQI')
+INDEX_ENTRY = struct.Struct('<QQII')
+DEFAULT_KEYFRAME_INTERVAL = 600  # Ticks (10 s at 60 Hz)
+
+
+class ReplayError(Exception):
+    pass
+
+
+class ReplayRecorder:
+    """Writes the input of every step of a GameScene to a replay file, plus a
+    keyframe of the full state every keyframe_interval steps."""
+
+    def __init__(self, path, scene, keyframe_interval=DEFAULT_KEYFRAME_INTERVAL):
+        self.path = path
+        self.seed = scene.seed
+        self.start_level = scene.level
+        self.start_tick = scene.tick
+        self.keyframe_interval = keyframe_interval
+        self.tick_count = 0
+        self.keyframes = []  # (tick, compressed state, checksum)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.file = open(path, 'wb')
+        self.file.write(self._header(0, 0))
+        self.file.flush()
+        scene.recorder = self
+
+    def _header(self, index_offset, keyframe_count):
+        return HEADER.pack(MAGIC, VERSION, self.seed, self.start_level, self.keyframe_interval,
+                           self.tick_count, index_offset, keyframe_count)
+
+    def record(self, scene, bits):
+        """Called by GameScene before each step with the input it will use."""
+        if self.tick_count % self.keyframe_interval == 0:
+            # Inputs so far reach the disk, in case the game never closes the file
+            self.file.flush()
+            state = zlib.compress(pickle.dumps(scene.get_state(), protocol=pickle.HIGHEST_PROTOCOL))
+            self.keyframes.append((self.tick_count, state, scene.state_checksum()))
+        self.file.write(bytes((bits,)))
+        self.tick_count += 1
+
+    def close(self):
+        if self.file is None:
+            return
+        index = []
+        for tick, state, checksum in self.keyframes:
+            index.append(INDEX_ENTRY.pack(tick, self.file.tell(), len(state), checksum))
+            self.file.write(state)
+        index_offset = self.file.tell()
+        self.file.write(b''.join(index))
+        self.file.seek(0)
+        self.file.write(self._header(index_offset, len(self.keyframes)))
+        self.file.close()
+        self.file = None
+        log.info("Replay saved: %s (%d ticks, %d keyframes)", self.path, self.tick_count, len(self.keyframes))
+
+
+class ReplayInput:
+    """Input source that reads the recorded bits, starting at a given tick."""
+
+    def __init__(self, replay, tick=0):
+        self.replay = replay
+        self.tick = tick
+
+    def handle_event(self, event):
+        pass
+
+    def poll(self):
+        bits = self.replay.input_at(self.tick)
+        self.tick += 1
+        return bits
+
+
+class ReplayPlayer:
+    """Memory-maps a replay file. seek() jumps to any tick by restoring the
+    nearest earlier keyframe and fast-forwarding headless from there."""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'rb')
+        if os.fstat(self.file.fileno()).st_size < HEADER.size:
+            self.file.close()
+            raise ReplayError(f"{path}: file too short")
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, self.seed, self.start_level, self.keyframe_interval,
+         tick_count, index_offset, keyframe_count) = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ReplayError(f"{path}: not a replay file (or unsupported version)")
+
+        self.keyframes = []  # (tick, offset, length, checksum), sorted by tick
+        if index_offset:
+            self.tick_count = tick_count
+            for i in range(keyframe_count):
+                self.keyframes.append(INDEX_ENTRY.unpack_from(self.data, index_offset + i * INDEX_ENTRY.size))
+        else:
+            # Never closed: every byte after the header is an input
+            self.tick_count = len(self.data) - HEADER.size
+            log.warning("Replay %s was not closed; replaying from the start", path)
+
+    def close(self):
+        self.data.close()
+        self.file.close()
+
+    def input_at(self, tick):
+        if tick >= self.tick_count:
+            return 0
+        return self.data[HEADER.size + tick]
+
+    def _keyframe_before(self, tick):
+        best = None
+        for keyframe in self.keyframes:
+            if keyframe[0] > tick:
+                break
+            best = keyframe
+        return best
+
+    def new_scene(self, tick=0, high_score_manager=None):
+        from src.scenes.game_scene import GameScene
+        return GameScene(
+            high_score_manager or NullHighScoreManager(),
+            input_source=ReplayInput(self, tick),
+            audio=NullAudio(),
+            level=self.start_level,
+            seed=self.seed
+        )
+
+    def seek(self, tick, verify=True):
+        """Returns a GameScene in the state it had before step `tick`."""
+        tick = max(0, min(tick, self.tick_count))
+        keyframe = self._keyframe_before(tick)
+        if keyframe is None:
+            scene = self.new_scene(0)
+            start = 0
+        else:
+            start, offset, length, checksum = keyframe
+            state = pickle.loads(zlib.decompress(self.data[offset:offset + length]))
+            scene = self.new_scene(start)
+            scene.set_state(state)
+            if verify and scene.state_checksum() != checksum:
+                raise ReplayError(f"Keyframe at tick {start} does not match its checksum")
+        return self.fast_forward(scene, tick - start, verify)
+
+    def fast_forward(self, scene, ticks, verify=True):
+        """Runs up to `ticks` steps, checking the checksum at every keyframe
+        passed on the way so a desync is reported where it starts."""
+        checksums = {kf[0]: kf[3] for kf in self.keyframes} if verify else {}
+        for _ in range(ticks):
+            if scene.game_over:
+                break
+            scene.update()
+            position = scene.input_source.tick
+            expected = checksums.get(position)
+            if expected is not None and scene.state_checksum() != expected:
+                raise ReplayError(f"Desync at tick {position}")
+        return scene
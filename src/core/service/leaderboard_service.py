@@ -0,0 +1,334 @@
+import asyncio
+import bisect
+import itertools
+import json
+import time
+import urllib.parse
+import uuid
+from src.utils.constants import SERVICE_CACHE_SIZE, SERVICE_CACHE_TTL, WRITE_BATCH_WINDOW, WRITE_BATCH_SIZE
+from src.utils.logger import get_logger
+
+log = get_logger("storage")
+
+SCOPE_FIELDS = ('season', 'week', 'cabinet')
+MAX_LIMIT = 1000  # Most rows one request may ask for
+MAX_SCANS = 16  # Open /scan cursors; the oldest is dropped past this
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 503: "Service Unavailable"}
+
+
+class LeaderboardCache:
+    """The best SERVICE_CACHE_SIZE runs, sorted like the stores: by score,
+    highest first, then by '_id'.
+
+    Every run scoring more than the lowest cached one is cached, so the
+    all-time top and rank of any score at or above it are exact without
+    asking the store.
+    """
+
+    def __init__(self, capacity=SERVICE_CACHE_SIZE):
+        self.capacity = capacity
+        self.keys = []  # (-score, _id), ascending
+        self.entries = {}  # _id -> leaderboard fields
+        self.complete = True  # False once runs have been dropped to stay within capacity
+
+    def load(self, entries):
+        self.keys.clear()
+        self.entries.clear()
+        self.complete = len(entries) < self.capacity
+        for entry in entries:
+            self.add(entry)
+
+    def add(self, entry):
+        entry_id = str(entry['_id'])
+        if entry_id in self.entries:
+            return
+        key = (-entry['score'], entry_id)
+        if len(self.keys) >= self.capacity and key > self.keys[-1]:
+            self.complete = False  # Lower than everything cached
+            return
+        bisect.insort(self.keys, key)
+        self.entries[entry_id] = {
+            '_id': entry['_id'], 'name': entry['name'], 'score': entry['score'], 'level': entry.get('level')
+        }
+        if len(self.keys) > self.capacity:
+            del self.entries[self.keys.pop()[1]]
+            self.complete = False
+
+    def clear(self):
+        self.keys.clear()
+        self.entries.clear()
+        self.complete = True
+
+    def top(self, limit, after=None):
+        """A page from the cache, or None if it reaches past the cached runs."""
+        start = bisect.bisect_right(self.keys, (-after[0], str(after[1]))) if after else 0
+        if start + limit > len(self.keys) and not self.complete:
+            return None
+        return [dict(self.entries[key[1]]) for key in self.keys[start:start + limit]]
+
+    def rank(self, score):
+        """1 + cached runs scoring more, or None if the score is below the cache."""
+        if not self.complete and (not self.keys or score < -self.keys[-1][0]):
+            return None
+        return bisect.bisect_left(self.keys, (-score,)) + 1
+
+
+class LeaderboardService:
+    """Small HTTP/JSON leaderboard server in front of a ScoreStore.
+
+    One per venue: cabinets talk to it (SCORE_BACKEND=http) instead of each
+    opening its own database connection. The all-time top and ranks come
+    from a LeaderboardCache; other queries are passed to the store and their
+    answers reused for SERVICE_CACHE_TTL seconds. Submitted runs are written
+    through to the store in batches (one add per WRITE_BATCH_WINDOW or
+    WRITE_BATCH_SIZE runs) and enter the cache only once their batch is
+    stored; a POST is answered then, or fails with the batch.
+
+    Endpoints (GET parameters; scope_field/scope_value select a scope):
+        GET  /top?limit=8[&after_score=&after_id=]   {"scores": [...]}
+        GET  /rank?score=N                           {"rank": n}
+        GET  /around?score=N&before=2&after=2        {"scores": [...]}
+        POST /scores  {"scores": [run, ...]}         {"stored": n}
+        DELETE /scores                               {"stored": 0}
+        GET  /scan?batch_size=N  then  /scan?cursor=c  {"scores": [...], "cursor": c or null}
+        GET  /health                                 {"ok": true, ...}
+
+    Store calls block, so they run in the event loop's default executor.
+    """
+
+    def __init__(self, store, cache_size=SERVICE_CACHE_SIZE):
+        self.store = store
+        self.cache = LeaderboardCache(cache_size)
+        self.memo = {}  # (query, args) -> (expires, answer)
+        self.pending = []  # (entry, future) waiting for the next batch
+        self.pending_event = None
+        self.scans = {}  # cursor -> (store.scan generator, batch size)
+        self.flush_task = None
+        self.server = None
+        self.requests = 0
+
+    async def start(self, host, port):
+        loop = asyncio.get_running_loop()
+        if not await loop.run_in_executor(None, self.store.connect):
+            raise ConnectionError(f"Could not connect to {self.store.label}")
+        self.cache.load(await loop.run_in_executor(None, self.store.top, self.cache.capacity))
+        self.pending_event = asyncio.Event()
+        self.flush_task = loop.create_task(self._flush_loop())
+        self.server = await asyncio.start_server(self._serve, host, port)
+        log.info("Leaderboard service on %s:%d (%s, %d runs cached)",
+                 host, self.port, self.store.label, len(self.cache.keys))
+        return self.server
+
+    async def stop(self):
+        """Stops accepting requests; runs not yet stored are dropped (their POSTs fail)."""
+        self.server.close()
+        self.flush_task.cancel()
+        for _, future in self.pending:
+            future.cancel()
+        self.pending.clear()
+        for scan, _ in self.scans.values():
+            scan.close()
+        self.scans.clear()
+        await self.server.wait_closed()
+
+    @property
+    def port(self):
+        return self.server.sockets[0].getsockname()[1]
+
+    async def _serve(self, reader, writer):
+        # HTTP/1.1 with keep-alive: one connection per cabinet serves all its requests
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, version = request_line.decode('latin-1').split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get('content-length') or 0))
+                status, payload = await self._dispatch(method, target, body)
+                data = json.dumps(payload, default=str).encode('utf-8')
+                keep_alive = (version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                              and self.server.is_serving())
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass  # Client gone or not speaking HTTP: drop the connection
+        finally:
+            writer.close()
+
+    async def _dispatch(self, method, target, body):
+        self.requests += 1
+        url = urllib.parse.urlsplit(target)
+        params = dict(urllib.parse.parse_qsl(url.query))
+        try:
+            if method == 'GET' and url.path == '/top':
+                return 200, {'scores': await self._top(params)}
+            if method == 'GET' and url.path == '/rank':
+                return 200, {'rank': await self._rank(params)}
+            if method == 'GET' and url.path == '/around':
+                args = (int(params['score']), bounded(params.get('before', 2)), bounded(params.get('after', 2)),
+                        scope_param(params))
+                return 200, {'scores': await self._query('around', *args)}
+            if method == 'POST' and url.path == '/scores':
+                return 200, {'stored': await self._submit(json.loads(body)['scores'])}
+            if method == 'DELETE' and url.path == '/scores':
+                await self._call(self.store.clear)
+                self.cache.clear()
+                self.memo.clear()
+                return 200, {'stored': 0}
+            if method == 'GET' and url.path == '/scan':
+                return 200, await self._scan(params)
+            if method == 'GET' and url.path == '/health':
+                return 200, {'ok': True, 'backend': self.store.label, 'cached': len(self.cache.keys),
+                             'pending': len(self.pending), 'requests': self.requests}
+            return 404, {'error': f"no route for {method} {url.path}"}
+        except (KeyError, TypeError, ValueError) as e:
+            return 400, {'error': f"bad request: {e}"}
+        except Exception as e:
+            log.error("Leaderboard service: %s failed: %s", url.path, e)
+            return 503, {'error': str(e)}
+
+    async def _top(self, params):
+        limit = bounded(params.get('limit', 8))
+        scope = scope_param(params)
+        after = (int(params['after_score']), params['after_id']) if 'after_score' in params else None
+        if scope is None:
+            page = self.cache.top(limit, after)
+            if page is not None:
+                return page
+        return await self._query('top', limit, scope, after)
+
+    async def _rank(self, params):
+        score = int(params['score'])
+        scope = scope_param(params)
+        if scope is None:
+            rank = self.cache.rank(score)
+            if rank is not None:
+                return rank
+        return await self._query('rank', score, scope)
+
+    async def _scan(self, params):
+        # Every stored run, batch by batch: the store's scan generator stays open between requests
+        cursor = params.get('cursor')
+        if cursor is None:
+            batch_size = min(int(params.get('batch_size', MAX_LIMIT)), MAX_LIMIT)  # Larger asks get MAX_LIMIT
+            if batch_size < 1:
+                raise ValueError("batch_size must be at least 1")
+            scan = self.store.scan(batch_size)
+            cursor = uuid.uuid4().hex
+        else:
+            scan, batch_size = self.scans.pop(cursor)
+        rows = await self._call(next_batch, scan, batch_size)
+        if len(rows) < batch_size:
+            scan.close()
+            return {'scores': rows, 'cursor': None}
+        if len(self.scans) >= MAX_SCANS:
+            stale = next(iter(self.scans))
+            self.scans.pop(stale)[0].close()
+        self.scans[cursor] = (scan, batch_size)
+        return {'scores': rows, 'cursor': cursor}
+
+    async def _query(self, method, *args):
+        # Store query, answered from the memo while it is fresh
+        key = (method, args)
+        now = time.monotonic()
+        cached = self.memo.get(key)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+        answer = await self._call(getattr(self.store, method), *args)
+        if len(self.memo) > 10000:
+            self.memo.clear()
+        self.memo[key] = (now + SERVICE_CACHE_TTL, answer)
+        return answer
+
+    async def _call(self, function, *args):
+        return await asyncio.get_running_loop().run_in_executor(None, function, *args)
+
+    async def _submit(self, entries):
+        loop = asyncio.get_running_loop()
+        futures = []
+        if not isinstance(entries, list):
+            raise ValueError("scores must be a list of runs")
+        for entry in entries:
+            if not isinstance(entry, dict):
+                raise ValueError("every run must be an object")
+            if not isinstance(entry.get('name'), str) or not isinstance(entry.get('score'), (int, float)):
+                raise ValueError("every run needs a name and a score")
+            entry.setdefault('_id', None)
+            if entry['_id'] is None:
+                raise ValueError("every run needs an _id")
+        for entry in entries:
+            future = loop.create_future()
+            self.pending.append((entry, future))
+            futures.append(future)
+        self.pending_event.set()
+        try:
+            await asyncio.gather(*futures)
+        except asyncio.CancelledError:
+            if self.server.is_serving():
+                raise
+            # stop() dropped these runs: answer the POST instead of ending the connection
+            raise ConnectionError("leaderboard service stopped before the runs were stored") from None
+        return len(entries)
+
+    async def _flush_loop(self):
+        # Write-through in batches: one store.add per window or per WRITE_BATCH_SIZE runs
+        while True:
+            await self.pending_event.wait()
+            if len(self.pending) < WRITE_BATCH_SIZE:
+                await asyncio.sleep(WRITE_BATCH_WINDOW)
+            batch = self.pending[:WRITE_BATCH_SIZE]
+            del self.pending[:WRITE_BATCH_SIZE]
+            if not self.pending:
+                self.pending_event.clear()
+            try:
+                await self._call(self.store.add, [entry for entry, _ in batch])
+            except asyncio.CancelledError:
+                for _, future in batch:
+                    future.cancel()  # stop() during the write: the batch fails like pending runs
+                raise
+            except Exception as e:
+                log.error("Leaderboard service: batch of %d not stored: %s", len(batch), e)
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            self.memo.clear()  # Scoped answers may have changed
+            for entry, future in batch:
+                self.cache.add(entry)  # Only stored runs: the cache never gets ahead of the store
+                if not future.done():
+                    future.set_result(True)
+
+
+def next_batch(iterator, size):
+    return list(itertools.islice(iterator, size))
+
+
+def bounded(value):
+    value = int(value)
+    if not 0 <= value <= MAX_LIMIT:
+        raise ValueError(f"limit must be between 0 and {MAX_LIMIT}")
+    return value
+
+
+def scope_param(params):
+    # (field, value) filter of a scoped query, None for all-time
+    field = params.get('scope_field')
+    if field is None:
+        return None
+    if field not in SCOPE_FIELDS:
+        raise ValueError(f"unknown scope field {field!r}")
+    return (field, params['scope_value'])
@@ -0,0 +1,98 @@
+import http.client
+import json
+import threading
+import urllib.parse
+from src.core.config.storage_config import LEADERBOARD_URL, LEADERBOARD_TIMEOUT
+from src.core.storage.score_store import ScoreStore
+
+
+class HTTPScoreStore(ScoreStore):
+    """Scores kept by the venue's leaderboard service (leaderboard_server.py),
+    over one keep-alive HTTP connection. Remote, so the manager keeps its
+    journal in front of it like it does for MongoDB."""
+
+    label = "servidor de puntuaciones"
+    remote = True
+
+    def __init__(self, url=LEADERBOARD_URL, timeout=LEADERBOARD_TIMEOUT):
+        parts = urllib.parse.urlsplit(url)
+        self.host = parts.hostname or '127.0.0.1'
+        self.port = parts.port or 80
+        self.timeout = timeout
+        self.connection = None
+        # One connection shared by the writer thread and the game loop
+        self.lock = threading.Lock()
+
+    def _request(self, method, path, params=None, body=None):
+        if params:
+            path += "?" + urllib.parse.urlencode(params)
+        data = json.dumps(body).encode('utf-8') if body is not None else None
+        headers = {'Content-Type': 'application/json'} if data is not None else {}
+        with self.lock:
+            for attempt in range(2):
+                if self.connection is None:
+                    self.connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+                try:
+                    self.connection.request(method, path, body=data, headers=headers)
+                    response = self.connection.getresponse()
+                    payload = json.loads(response.read())
+                    break
+                except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+                    # The server closed an idle keep-alive connection: reopen it once
+                    self.connection.close()
+                    self.connection = None
+                    if attempt:
+                        raise
+                except Exception:
+                    self.connection.close()
+                    self.connection = None
+                    raise
+        if response.status != 200:
+            raise ConnectionError(f"{method} {path}: {response.status} {payload.get('error', '')}")
+        return payload
+
+    @staticmethod
+    def _scope(scope):
+        return {'scope_field': scope[0], 'scope_value': scope[1]} if scope else {}
+
+    def connect(self):
+        try:
+            self._request('GET', '/health')
+        except (OSError, ValueError):
+            return False
+        return True
+
+    def add(self, entries):
+        self._request('POST', '/scores', body={'scores': list(entries)})
+
+    def top(self, limit, scope=None, after=None):
+        params = {'limit': limit, **self._scope(scope)}
+        if after:
+            params.update(after_score=after[0], after_id=after[1])
+        return self._request('GET', '/top', params)['scores']
+
+    def rank(self, score, scope=None):
+        return self._request('GET', '/rank', {'score': score, **self._scope(scope)})['rank']
+
+    def around(self, score, before, after, scope=None):
+        params = {'score': score, 'before': before, 'after': after, **self._scope(scope)}
+        return self._request('GET', '/around', params)['scores']
+
+    def scan(self, batch_size):
+        # The service keeps the backend's scan open behind a cursor, one request per batch
+        params = {'batch_size': batch_size}  # The service caps it
+        while True:
+            payload = self._request('GET', '/scan', params)
+            yield from payload['scores']
+            if payload['cursor'] is None:
+                return
+            params = {'cursor': payload['cursor']}
+
+    def clear(self):
+        self._request('DELETE', '/scores')
+
+    def close(self):
+        with self.lock:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
@@ -0,0 +1,92 @@
+import bisect
+import threading
+from src.core.storage.score_store import ScoreStore
+
+
+def leaderboard_entry(entry):
+    # The fields the other backends return for leaderboard rows, built once per stored run
+    return {'_id': entry['_id'], 'name': entry['name'], 'score': entry['score'], 'level': entry.get('level')}
+
+
+class MemoryScoreStore(ScoreStore):
+    """Scores kept in a sorted list for the life of the process. Used by the
+    headless runner, the benchmarks and cabinets with no storage at all."""
+
+    label = "memoria"
+
+    def __init__(self):
+        self.entries = []  # Sorted by score, highest first, then by _id
+        self.rows = []  # leaderboard_entry() of each entry, in the same order
+        self.keys = []  # (-score, _id) of each entry, ascending, for bisect
+        self.ids = set()
+        self.lock = threading.Lock()
+
+    def connect(self):
+        return True
+
+    def add(self, entries):
+        with self.lock:
+            for entry in entries:
+                if entry['_id'] in self.ids:
+                    continue
+                self.ids.add(entry['_id'])
+                key = (-entry['score'], str(entry['_id']))
+                index = bisect.bisect_right(self.keys, key)
+                self.keys.insert(index, key)
+                self.entries.insert(index, dict(entry))
+                self.rows.insert(index, leaderboard_entry(entry))
+
+    def _scoped(self, indexes, scope):
+        # Entries at these positions that belong to the scope, without copying the list
+        for i in indexes:
+            if scope is None or self.entries[i].get(scope[0]) == scope[1]:
+                yield dict(self.rows[i])
+
+    def top(self, limit, scope=None, after=None):
+        with self.lock:
+            start = bisect.bisect_right(self.keys, (-after[0], str(after[1]))) if after else 0
+            if scope is None:
+                return [dict(row) for row in self.rows[start:start + limit]]
+            page = []
+            for entry in self._scoped(range(start, len(self.entries)), scope):
+                if len(page) == limit:
+                    break
+                page.append(entry)
+            return page
+
+    def rank(self, score, scope=None):
+        with self.lock:
+            index = bisect.bisect_left(self.keys, (-score,))
+            if scope is None:
+                return index + 1
+            return sum(1 for _ in self._scoped(range(index), scope)) + 1
+
+    def around(self, score, before, after, scope=None):
+        with self.lock:
+            index = bisect.bisect_left(self.keys, (-score,))
+            above = []
+            # Walks up from the score, never over the whole list
+            for entry in self._scoped(range(index - 1, -1, -1), scope):
+                if len(above) == before:
+                    break
+                above.append(entry)
+            above.reverse()
+            below = []
+            for entry in self._scoped(range(index, len(self.entries)), scope):
+                if len(below) == after:
+                    break
+                below.append(entry)
+            return above + below
+
+    def scan(self, batch_size):
+        with self.lock:
+            entries = list(self.entries)  # Already in memory: a snapshot of the list
+        for entry in entries:
+            yield dict(entry)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.rows.clear()
+            self.keys.clear()
+            self.ids.clear()
@@ -0,0 +1,114 @@
+from src.core.config.mongodb_config import get_database, is_healthy, COLLECTION_NAME
+from src.core.storage.score_store import ScoreStore
+from src.utils.logger import get_logger
+
+log = get_logger("storage")
+
+# Valores de pymongo.ASCENDING/DESCENDING: pymongo se importa solo al conectar
+ASCENDING = 1
+DESCENDING = -1
+
+DUPLICATE_KEY = 11000  # Código de error de MongoDB para un _id repetido
+# Campos que se leen para las tablas de puntuaciones
+LEADERBOARD_FIELDS = {'name': 1, 'score': 1, 'level': 1}
+# Orden de las tablas: puntuación descendente y _id para desempatar (paginación por clave)
+LEADERBOARD_ORDER = [('score', DESCENDING), ('_id', ASCENDING)]
+# Un índice compuesto por ámbito: cada tabla se lee ya ordenada, sin recorrer la colección
+SCOPE_FIELDS = ('season', 'week', 'cabinet')
+
+
+class MongoScoreStore(ScoreStore):
+    """Puntuaciones en la colección de MongoDB, un documento por partida.
+
+    Todas las consultas usan el índice de 'score' (o el compuesto de su
+    ámbito): el historial completo puede tener millones de partidas sin
+    cargarlo nunca en memoria.
+    """
+
+    label = "MongoDB"
+    remote = True
+
+    def __init__(self, db=None):
+        self.db = db  # db permite inyectar otra base de datos (p. ej. en los benchmarks)
+        self.collection = None
+
+    def connect(self):
+        """Conecta con MongoDB y crea los índices de las clasificaciones."""
+        db = self.db if self.db is not None else get_database()
+        if db is None:
+            return False
+        collection = db[COLLECTION_NAME]
+        try:
+            collection.create_index(LEADERBOARD_ORDER)
+            for field in SCOPE_FIELDS:
+                collection.create_index([(field, ASCENDING)] + LEADERBOARD_ORDER)
+        except Exception as e:
+            log.warning("No se pudo crear el índice, pero continuamos: %s", e)
+        self.db = db
+        self.collection = collection
+        return True
+
+    def healthy(self):
+        # Lo que sabe la comprobación de salud del cliente compartido, sin esperar
+        return is_healthy()
+
+    def add(self, entries):
+        """Un solo insert_many; los _id repetidos (reintentos) se ignoran."""
+        from pymongo.errors import BulkWriteError
+        try:
+            self.collection.insert_many(
+                [dict(e) for e in entries],
+                ordered=False
+            )
+        except BulkWriteError as e:
+            errors = e.details.get('writeErrors', [])
+            if e.details.get('writeConcernErrors') or any(err['code'] != DUPLICATE_KEY for err in errors):
+                raise
+            log.info("%d puntuación(es) ya estaban guardadas.", len(errors))
+
+    @staticmethod
+    def _query(scope, score=None):
+        # Filtro del ámbito (si hay) y condición sobre 'score'
+        query = {scope[0]: scope[1]} if scope else {}
+        if score is not None:
+            query['score'] = score
+        return query
+
+    def top(self, limit, scope=None, after=None):
+        query = self._query(scope)
+        if after:
+            # La página empieza justo después de la última fila de la anterior
+            query['$or'] = [
+                {'score': {'$lt': after[0]}},
+                {'score': after[0], '_id': {'$gt': after[1]}},
+            ]
+        return list(
+            self.collection.find(query, LEADERBOARD_FIELDS)
+            .sort(LEADERBOARD_ORDER)
+            .limit(limit)
+        )
+
+    def rank(self, score, scope=None):
+        # Cuenta sobre el índice: no lee ningún documento
+        return self.collection.count_documents(self._query(scope, {'$gt': score})) + 1
+
+    def around(self, score, before, after, scope=None):
+        # Las mejores: las 'before' más cercanas por encima, recorriendo el índice al revés
+        above = list(
+            self.collection.find(self._query(scope, {'$gt': score}), LEADERBOARD_FIELDS)
+            .sort([('score', ASCENDING), ('_id', DESCENDING)])
+            .limit(before)
+        ) if before > 0 else []
+        below = list(
+            self.collection.find(self._query(scope, {'$lte': score}), LEADERBOARD_FIELDS)
+            .sort(LEADERBOARD_ORDER)
+            .limit(after)
+        ) if after > 0 else []
+        return above[::-1] + below
+
+    def scan(self, batch_size):
+        # El cursor trae batch_size documentos por viaje, sin cargar la colección
+        yield from self.collection.find({}).batch_size(batch_size)
+
+    def clear(self):
+        self.collection.delete_many({})
@@ -0,0 +1,101 @@
+import time
+from src.core.config.storage_config import SCORE_BACKEND, SCORE_SEASON, CABINET_ID
+
+# Leaderboard scopes: all-time, this season, this week, this cabinet
+SCOPES = ('all', 'season', 'week', 'cabinet')
+
+
+class ScoreStore:
+    """Where HighScoreManager keeps the scores.
+
+    Entries are one per completed run: dicts with '_id', 'name', 'score',
+    'level', 'duration' (seconds), 'created' (epoch seconds), 'cabinet',
+    and the 'season' and 'week' they were played in (see run_scopes).
+    Every run is kept; queries go through the score index and never load the
+    whole history. The manager calls these methods from its writer thread (and
+    load/top from the caller's thread), so they may block; errors are raised
+    and handled by the manager.
+    """
+
+    label = "storage"  # Shown in status messages
+    remote = False  # Remote stores get a local journal in front of them
+
+    def connect(self):
+        """Opens the store (connection, tables, indexes). True if usable."""
+        raise NotImplementedError
+
+    def healthy(self):
+        """False when the backend is known to be unreachable right now.
+        Must answer at once, without a round trip."""
+        return True
+
+    def add(self, entries):
+        """Stores a batch of entries; entries whose '_id' exists are ignored."""
+        raise NotImplementedError
+
+    def top(self, limit, scope=None, after=None):
+        """Best scores first, at most limit entries. Ties are ordered by '_id'.
+
+        scope is a (field, value) filter from scope_filter, None for all-time.
+        after is the (score, _id) of the last entry of the previous page: the
+        page starts right below it (keyset pagination, no skipped rows).
+        """
+        raise NotImplementedError
+
+    def rank(self, score, scope=None):
+        """1-based position a score would have: 1 + scores strictly greater."""
+        raise NotImplementedError
+
+    def around(self, score, before, after, scope=None):
+        """Leaderboard window around a score, best first: up to before entries
+        strictly greater and up to after entries equal or lower."""
+        raise NotImplementedError
+
+    def scan(self, batch_size):
+        """Every stored run with all its fields, in no particular order.
+        A generator that reads batch_size runs at a time from the backend."""
+        raise NotImplementedError
+
+    def clear(self):
+        """Removes every score."""
+        raise NotImplementedError
+
+
+def run_scopes(created):
+    """Season and week of a run played at created (epoch seconds, UTC).
+    Seasons are calendar quarters unless SCORE_SEASON names the current one."""
+    t = time.gmtime(created)
+    return {
+        'season': SCORE_SEASON or f"{t.tm_year}-Q{(t.tm_mon - 1) // 3 + 1}",
+        'week': time.strftime("%G-W%V", t),
+    }
+
+
+def scope_filter(scope, now=None):
+    """(field, value) that selects a scope's runs right now; None for all-time."""
+    if scope == 'all':
+        return None
+    if scope == 'cabinet':
+        return ('cabinet', CABINET_ID)
+    if scope in ('season', 'week'):
+        return (scope, run_scopes(now if now is not None else time.time())[scope])
+    raise ValueError(f"Unknown leaderboard scope: {scope!r} (use {', '.join(SCOPES)})")
+
+
+def create_store(backend=None):
+    """Store for a backend name ('mongo', 'sqlite', 'memory' or 'http'); by default
+    the SCORE_BACKEND setting. Backend modules are imported only when used."""
+    backend = backend or SCORE_BACKEND
+    if backend == 'mongo':
+        from src.core.storage.mongo_store import MongoScoreStore
+        return MongoScoreStore()
+    if backend == 'sqlite':
+        from src.core.storage.sqlite_store import SQLiteScoreStore
+        return SQLiteScoreStore()
+    if backend == 'memory':
+        from src.core.storage.memory_store import MemoryScoreStore
+        return MemoryScoreStore()
+    if backend == 'http':
+        from src.core.storage.http_store import HTTPScoreStore
+        return HTTPScoreStore()
+    raise ValueError(f"Unknown score backend: {backend!r} (use mongo, sqlite, memory or http)")
@@ -0,0 +1,152 @@
+import os
+import sqlite3
+import threading
+import time
+from src.core.config.storage_config import SQLITE_PATH
+from src.core.storage.score_store import ScoreStore
+
+
+# Columns that files created before the full run history lack
+RUN_COLUMNS = (
+    ("level", "INTEGER"), ("duration", "REAL"), ("cabinet", "TEXT"), ("season", "TEXT"), ("week", "TEXT")
+)
+# Leaderboard scopes, each with its own (scope, score DESC, id) index
+SCOPE_COLUMNS = ("season", "week", "cabinet")
+LEADERBOARD_COLUMNS = "id, name, score, level"
+# Every field of a run, in the order of RUN_KEYS
+RUN_FIELDS = "id, name, score, level, duration, created, cabinet, season, week"
+RUN_KEYS = ('_id', 'name', 'score', 'level', 'duration', 'created', 'cabinet', 'season', 'week')
+
+
+def leaderboard_entry(row):
+    return {'_id': row[0], 'name': row[1], 'score': row[2], 'level': row[3]}
+
+
+def where(scope, condition=None, params=()):
+    # WHERE clause for a scope (field, value) plus an optional condition
+    clauses, values = [], []
+    if scope:
+        clauses.append(f"{scope[0]} = ?")
+        values.append(scope[1])
+    if condition:
+        clauses.append(condition)
+        values.extend(params)
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), values
+
+
+class SQLiteScoreStore(ScoreStore):
+    """Scores in a local SQLite file, indexed by score. Durable on its own,
+    so it needs no journal and no network."""
+
+    label = "SQLite"
+
+    def __init__(self, path=SQLITE_PATH):
+        self.path = path
+        self.connection = None
+        # One connection shared by the writer thread and the game loop
+        self.lock = threading.Lock()
+
+    def connect(self):
+        with self.lock:
+            if self.connection is None:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                connection = sqlite3.connect(self.path, check_same_thread=False)
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS scores ("
+                    " id TEXT PRIMARY KEY,"
+                    " name TEXT NOT NULL,"
+                    " score INTEGER NOT NULL,"
+                    " created REAL NOT NULL,"
+                    " level INTEGER,"
+                    " duration REAL,"
+                    " cabinet TEXT,"
+                    " season TEXT,"
+                    " week TEXT)"
+                )
+                columns = {row[1] for row in connection.execute("PRAGMA table_info(scores)")}
+                for column, kind in RUN_COLUMNS:
+                    if column not in columns:
+                        connection.execute(f"ALTER TABLE scores ADD COLUMN {column} {kind}")
+                # Leaderboard order (score, then id) straight from the index, also for paging
+                connection.execute("DROP INDEX IF EXISTS scores_by_score")
+                connection.execute("CREATE INDEX IF NOT EXISTS scores_by_rank ON scores (score DESC, id)")
+                for column in SCOPE_COLUMNS:
+                    connection.execute(
+                        f"CREATE INDEX IF NOT EXISTS scores_by_{column} ON scores ({column}, score DESC, id)"
+                    )
+                connection.commit()
+                self.connection = connection
+        return True
+
+    def add(self, entries):
+        now = time.time()
+        with self.lock:
+            with self.connection:  # One transaction per batch
+                self.connection.executemany(
+                    "INSERT OR IGNORE INTO scores (id, name, score, created, level, duration, cabinet, season, week)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(str(e['_id']), e['name'], e['score'], e.get('created', now), e.get('level'),
+                      e.get('duration'), e.get('cabinet'), e.get('season'), e.get('week')) for e in entries]
+                )
+
+    def top(self, limit, scope=None, after=None):
+        if after:
+            # Keyset pagination: the page starts right below the previous one
+            clause, params = where(scope, "(score < ? OR (score = ? AND id > ?))", (after[0], after[0], str(after[1])))
+        else:
+            clause, params = where(scope)
+        with self.lock:
+            rows = self.connection.execute(
+                f"SELECT {LEADERBOARD_COLUMNS} FROM scores{clause} ORDER BY score DESC, id LIMIT ?", params + [limit]
+            ).fetchall()
+        return [leaderboard_entry(row) for row in rows]
+
+    def rank(self, score, scope=None):
+        clause, params = where(scope, "score > ?", (score,))
+        with self.lock:
+            (greater,) = self.connection.execute(f"SELECT COUNT(*) FROM scores{clause}", params).fetchone()
+        return greater + 1
+
+    def around(self, score, before, after, scope=None):
+        above_clause, above_params = where(scope, "score > ?", (score,))
+        below_clause, below_params = where(scope, "score <= ?", (score,))
+        with self.lock:
+            above = self.connection.execute(
+                f"SELECT {LEADERBOARD_COLUMNS} FROM scores{above_clause} ORDER BY score, id DESC LIMIT ?",
+                above_params + [before]
+            ).fetchall()
+            below = self.connection.execute(
+                f"SELECT {LEADERBOARD_COLUMNS} FROM scores{below_clause} ORDER BY score DESC, id LIMIT ?",
+                below_params + [after]
+            ).fetchall()
+        return [leaderboard_entry(row) for row in reversed(above)] + [leaderboard_entry(row) for row in below]
+
+    def scan(self, batch_size):
+        # By rowid ranges, so the lock is not held while the caller works
+        last = 0
+        while True:
+            with self.lock:
+                rows = self.connection.execute(
+                    f"SELECT rowid, {RUN_FIELDS} FROM scores WHERE rowid > ? ORDER BY rowid LIMIT ?",
+                    (last, batch_size)
+                ).fetchall()
+            if not rows:
+                return
+            last = rows[-1][0]
+            for row in rows:
+                entry = dict(zip(RUN_KEYS, row[1:]))
+                yield {key: value for key, value in entry.items() if value is not None}
+
+    def clear(self):
+        with self.lock:
+            with self.connection:
+                self.connection.execute("DELETE FROM scores")
+
+    def close(self):
+        with self.lock:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
@@ -0,0 +1,48 @@
+import time
+from src.utils.constants import SIMULATION_HZ, MAX_SIMULATION_STEPS, MAX_FRAME_TIME
+
+
+class FixedTimestep:
+    """Accumulator that turns variable frame times into fixed simulation steps.
+
+    Each frame, advance() returns how many steps of 1 / SIMULATION_HZ seconds
+    to simulate, and alpha tells how far the renderer is between the last two
+    simulated states. Long frames are clamped and the number of catch-up steps
+    is bounded, so a hitch never turns into a spiral of death.
+    """
+
+    def __init__(self, hz=SIMULATION_HZ, max_steps=MAX_SIMULATION_STEPS, max_frame_time=MAX_FRAME_TIME):
+        self.step_time = 1.0 / hz
+        self.max_steps = max_steps
+        self.max_frame_time = max_frame_time
+        self.accumulator = 0.0
+        self.last_time = None
+
+    def reset(self):
+        """Forget elapsed time, e.g. after a pause or a scene change."""
+        self.accumulator = 0.0
+        self.last_time = None
+
+    def advance(self, now=None):
+        if now is None:
+            now = time.perf_counter()
+        if self.last_time is None:
+            frame_time = self.step_time  # First frame: run exactly one step
+        else:
+            frame_time = min(now - self.last_time, self.max_frame_time)
+        self.last_time = now
+
+        self.accumulator += frame_time
+        steps = int(self.accumulator / self.step_time)
+        if steps > self.max_steps:
+            # Too far behind: drop the backlog instead of trying to catch up
+            steps = self.max_steps
+            self.accumulator = self.accumulator % self.step_time
+        else:
+            self.accumulator -= steps * self.step_time
+        return steps
+
+    @property
+    def alpha(self):
+        """Interpolation factor between the previous and the current state."""
+        return min(1.0, self.accumulator / self.step_time)
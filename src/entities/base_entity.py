@@ -8,20 +8,52 @@ class BaseEntity:
         self.velocity = Vector2(velocity)
         self.angle = 0
         self.active = True
+        # State at the start of the last simulation step, for interpolation
+        self.previous_position = Vector2(position)
+        self.previous_angle = 0
+    
+    def remember_state(self):
+        self.previous_position = Vector2(self.position)
+        self.previous_angle = self.angle
+    
+    def render_state(self, alpha=1.0):
+        """Position and angle interpolated between the last two steps."""
+        position = self.position
+        if alpha >= 1.0:
+            return position, self.angle
+        previous = self.previous_position
+        delta = position - previous
+        # Take the short way around when the entity wrapped this step
+        if abs(delta.x) > SCREEN_WIDTH / 2:
+            delta.x -= SCREEN_WIDTH if delta.x > 0 else -SCREEN_WIDTH
+        if abs(delta.y) > SCREEN_HEIGHT / 2:
+            delta.y -= SCREEN_HEIGHT if delta.y > 0 else -SCREEN_HEIGHT
+        interpolated = previous + delta * alpha
+        interpolated.x %= SCREEN_WIDTH
+        interpolated.y %= SCREEN_HEIGHT
+        angle = self.previous_angle + (self.angle - self.previous_angle) * alpha
+        return interpolated, angle
     
     def update(self):
-        self.position += self.velocity
+        position = self.position + self.velocity
         
         # Wrap around screen edges
-        self.position.x = self.position.x % SCREEN_WIDTH
-        self.position.y = self.position.y % SCREEN_HEIGHT
+        position.x = position.x % SCREEN_WIDTH
+        position.y = position.y % SCREEN_HEIGHT
+        self.position = position
     
-    def draw(self, screen):
+    def draw(self, screen, alpha=1.0):
         pass  # Serà implementat per les classes filles
     
     def get_radius(self):
         return 1  # Serà sobreescrit per les classes filles
     
     def collides_with(self, other):
-        distance = (self.position - other.position).length()
-        return distance < (self.get_radius() + other.get_radius())
+        # Shortest distance on the wrapped screen, so entities crossing an
+        # edge still collide with the ones on the opposite side
+        dx = abs(self.position.x - other.position.x) % SCREEN_WIDTH
+        dy = abs(self.position.y - other.position.y) % SCREEN_HEIGHT
+        dx = min(dx, SCREEN_WIDTH - dx)
+        dy = min(dy, SCREEN_HEIGHT - dy)
+        reach = self.get_radius() + other.get_radius()
+        return dx * dx + dy * dy < reach * reach
@@ -0,0 +1,287 @@
+import zlib
+import numpy as np
+from pygame.math import Vector2
+from src.entities.base_entity import BaseEntity
+from src.utils.constants import SCREEN_WIDTH, SCREEN_HEIGHT
+
+SCREEN_SIZE = np.array([SCREEN_WIDTH, SCREEN_HEIGHT], dtype=float)
+
+# Checksums compare positions and speeds to 1/CHECKSUM_SCALE of a pixel
+CHECKSUM_SCALE = 1024
+
+# Below this many pairs a direct all-pairs check beats building the grid
+BRUTE_FORCE_PAIRS = 2048
+
+# Array name, columns and dtype of every per-entity field
+FIELDS = (
+    ('positions', 2, float),
+    ('previous_positions', 2, float),
+    ('velocities', 2, float),
+    ('angles', 1, float),
+    ('previous_angles', 1, float),
+    ('rotation_speeds', 1, float),
+    ('radii', 1, float),
+    ('lifetimes', 1, float),
+    ('active', 1, bool)
+)
+
+
+def wrapped_distance_sq(a, b):
+    """Squared shortest distance between points on the wrapped screen."""
+    delta = np.abs(a - b) % SCREEN_SIZE
+    delta = np.minimum(delta, SCREEN_SIZE - delta)
+    return (delta * delta).sum(axis=-1)
+
+
+class StoreField:
+    """Attribute that lives in a row of an EntityStore while the entity is in
+    one, and in the instance otherwise. Vectors are returned as copies when
+    stored, so assign the whole value (entity.position = ...) to change it."""
+
+    def __init__(self, array_name, vector=False, default=0.0):
+        self.array_name = array_name
+        self.vector = vector
+        self.default = default
+
+    def __set_name__(self, owner, name):
+        self.local_name = '_' + name
+
+    def __get__(self, entity, owner=None):
+        if entity is None:
+            return self
+        store = entity._store
+        if store is None:
+            return entity.__dict__.get(self.local_name, self.default)
+        value = getattr(store, self.array_name)[entity._slot]
+        if self.vector:
+            return Vector2(value[0], value[1])
+        return value.item()
+
+    def __set__(self, entity, value):
+        store = entity._store
+        if store is None:
+            entity.__dict__[self.local_name] = Vector2(value) if self.vector else value
+        elif self.vector:
+            getattr(store, self.array_name)[entity._slot] = (value[0], value[1])
+        else:
+            getattr(store, self.array_name)[entity._slot] = value
+
+
+class StoredEntity(BaseEntity):
+    """Entity that can be kept in an EntityStore. Outside a store it behaves
+    like any other BaseEntity."""
+    _store = None
+    _slot = -1
+
+    position = StoreField('positions', vector=True)
+    previous_position = StoreField('previous_positions', vector=True)
+    velocity = StoreField('velocities', vector=True)
+    angle = StoreField('angles')
+    previous_angle = StoreField('previous_angles')
+    rotation_speed = StoreField('rotation_speeds')
+    radius = StoreField('radii', default=1.0)
+    lifetime = StoreField('lifetimes', default=float('inf'))
+    active = StoreField('active', default=True)
+
+    _fields = (
+        ('positions', 'position'),
+        ('previous_positions', 'previous_position'),
+        ('velocities', 'velocity'),
+        ('angles', 'angle'),
+        ('previous_angles', 'previous_angle'),
+        ('rotation_speeds', 'rotation_speed'),
+        ('radii', 'radius'),
+        ('lifetimes', 'lifetime'),
+        ('active', 'active')
+    )
+
+    # Attributes outside the arrays that a snapshot must keep (see get_state)
+    _extra_state = ()
+
+    def get_state(self):
+        """Non-array attributes, for EntityStore.snapshot()."""
+        return {name: getattr(self, name) for name in self._extra_state}
+
+    @classmethod
+    def from_state(cls, state):
+        """Rebuilds a view from get_state() without running __init__ (which
+        would draw from the random generator)."""
+        entity = cls.__new__(cls)
+        entity.__dict__.update(state)
+        return entity
+
+    def _attach(self, store, slot):
+        values = [(array_name, getattr(self, name)) for array_name, name in self._fields]
+        self._store = store
+        self._slot = slot
+        for array_name, value in values:
+            getattr(store, array_name)[slot] = value
+
+    def _detach(self):
+        values = [(name, getattr(self, name)) for _, name in self._fields]
+        self._store = None
+        self._slot = -1
+        for name, value in values:
+            setattr(self, name, value)
+
+
+class EntityStore:
+    """Struct-of-arrays container for asteroids or projectiles.
+
+    Positions, velocities, angles, radii, lifetimes and active flags are kept in
+    contiguous NumPy arrays so movement, wrap, expiry and distance checks run
+    as one vectorized operation per tick. The entity objects are thin views on
+    their row and keep the usual API (draw, split, get_score...). The store
+    behaves like a list of those views; removal swaps the last row into the
+    freed slot, so the order is not preserved.
+    """
+
+    def __init__(self, capacity=64):
+        self.count = 0
+        self.views = []
+        for array_name, columns, dtype in FIELDS:
+            shape = (capacity, columns) if columns > 1 else (capacity,)
+            setattr(self, array_name, np.zeros(shape, dtype=dtype))
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return iter(self.views)
+
+    def __getitem__(self, index):
+        return self.views[index]
+
+    def _grow(self):
+        capacity = max(1, len(self.positions)) * 2
+        for array_name, columns, dtype in FIELDS:
+            old = getattr(self, array_name)
+            shape = (capacity, columns) if columns > 1 else (capacity,)
+            new = np.zeros(shape, dtype=dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, array_name, new)
+
+    def append(self, entity):
+        if self.count == len(self.positions):
+            self._grow()
+        entity._attach(self, self.count)
+        self.views.append(entity)
+        self.count += 1
+
+    def extend(self, entities):
+        for entity in entities:
+            self.append(entity)
+
+    def remove(self, entity):
+        self._remove_slot(entity._slot)
+
+    def remove_indices(self, indices):
+        # Highest first: the row swapped in is never one still to be removed
+        for slot in sorted(indices, reverse=True):
+            self._remove_slot(slot)
+
+    def _remove_slot(self, slot):
+        last = self.count - 1
+        self.views[slot]._detach()
+        if slot != last:
+            for array_name, _, _ in FIELDS:
+                array = getattr(self, array_name)
+                array[slot] = array[last]
+            moved = self.views[last]
+            moved._slot = slot
+            self.views[slot] = moved
+        self.views.pop()
+        self.count = last
+
+    def clear(self):
+        self.remove_indices(range(self.count))
+
+    def snapshot(self):
+        """Copy of the arrays and of the views' own state (see get_state)."""
+        n = self.count
+        return {
+            'arrays': {name: getattr(self, name)[:n].copy() for name, _, _ in FIELDS},
+            'views': [view.get_state() for view in self.views]
+        }
+
+    def restore(self, snapshot, views):
+        """Replaces the contents with a snapshot; views are the entities
+        rebuilt from snapshot['views'], in the same order."""
+        self.clear()
+        self.extend(views)
+        for name, _, _ in FIELDS:
+            getattr(self, name)[:self.count] = snapshot['arrays'][name]
+
+    def step(self):
+        """Moves, wraps, rotates and ages every entity in one pass, keeping
+        the previous positions and angles for interpolated rendering."""
+        n = self.count
+        if n == 0:
+            return
+        self.previous_positions[:n] = self.positions[:n]
+        self.previous_angles[:n] = self.angles[:n]
+        positions = self.positions[:n]
+        positions += self.velocities[:n]
+        np.mod(positions, SCREEN_SIZE, out=positions)
+        self.angles[:n] += self.rotation_speeds[:n]
+        lifetimes = self.lifetimes[:n]
+        lifetimes -= 1  # Infinite lifetimes (asteroids) never run out
+        self.active[:n] &= lifetimes > 0
+
+    def remove_inactive(self):
+        """Drops expired entities; returns how many were removed."""
+        inactive = np.flatnonzero(~self.active[:self.count])
+        if len(inactive):
+            self.remove_indices(inactive.tolist())
+        return len(inactive)
+
+    def checksum(self, crc=0):
+        """Folds the state of every entity into a CRC32. Rows are sorted first,
+        so the result does not depend on storage order, and values are
+        quantized so rounding noise below CHECKSUM_SCALE does not count."""
+        n = self.count
+        if n == 0:
+            return crc
+        rows = np.column_stack((
+            self.positions[:n],
+            self.velocities[:n],
+            self.angles[:n],
+            self.radii[:n],
+            np.nan_to_num(self.lifetimes[:n], posinf=-1.0)
+        ))
+        quantized = np.round(rows * CHECKSUM_SCALE).astype(np.int64)
+        quantized = quantized[np.lexsort(quantized.T[::-1])]
+        return zlib.crc32(quantized.tobytes(), crc)
+
+    def overlapping(self, position, radius):
+        """Indices of the entities that overlap a circle (e.g. the ship)."""
+        n = self.count
+        if n == 0:
+            return np.empty(0, dtype=np.intp)
+        point = np.array([position[0], position[1]], dtype=float)
+        reach = self.radii[:n] + radius
+        return np.flatnonzero(wrapped_distance_sq(self.positions[:n], point) < reach * reach)
+
+    def collision_pairs(self, other, grid):
+        """Returns (own index, other index) arrays for every overlapping pair,
+        sorted by own index then other index. The grid is rebuilt from other
+        unless there are so few pairs that checking all of them is cheaper."""
+        n = self.count
+        m = other.count
+        if n == 0 or m == 0:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+        if n * m <= BRUTE_FORCE_PAIRS:
+            reach = self.radii[:n, None] + other.radii[None, :m]
+            distance_sq = wrapped_distance_sq(self.positions[:n, None, :], other.positions[None, :m, :])
+            mine, theirs = np.nonzero(distance_sq < reach * reach)  # Already sorted
+            return mine, theirs
+        grid.rebuild(other.positions[:m], other.radii[:m])
+        mine, theirs = grid.candidate_pairs(self.positions[:n], self.radii[:n])
+        if len(mine) == 0:
+            return mine, theirs
+        reach = self.radii[mine] + other.radii[theirs]
+        hits = wrapped_distance_sq(self.positions[mine], other.positions[theirs]) < reach * reach
+        mine = mine[hits]
+        theirs = theirs[hits]
+        order = np.lexsort((theirs, mine))
+        return mine[order], theirs[order]
@@ -2,11 +2,14 @@ import pygame
 from pygame.math import Vector2
 import random
 import math
-from src.entities.base_entity import BaseEntity
+from src.entities.entity_store import StoredEntity
 from src.utils.constants import *
 
-class Asteroid(BaseEntity):
-    def __init__(self, position=None, size='large', speed_multiplier=1.0):
+class Asteroid(StoredEntity):
+    def __init__(self, position=None, size='large', speed_multiplier=1.0, rng=None):
+        # Generador aleatori de l'escena (reproduïble amb una llavor) o el global
+        self.rng = rng if rng is not None else random
+        
         # Si no es proporciona posició, genera una posició aleatòria als marges
         if position is None:
             position = self._generate_spawn_position()
@@ -16,12 +19,12 @@ class Asteroid(BaseEntity):
         self.size = size
         self.radius = self._get_size_radius()
         self.points = []
-        self.rotation_speed = random.uniform(-3, 3)
+        self.rotation_speed = self.rng.uniform(-3, 3)
         
         # Velocitat basada en la mida i multiplicador de nivell
         base_speed = ASTEROID_SPEEDS[size]
         speed = base_speed * speed_multiplier
-        angle = random.uniform(0, math.pi * 2)
+        angle = self.rng.uniform(0, math.pi * 2)
         self.velocity = Vector2(math.cos(angle), math.sin(angle)) * speed
         
         # Genera la forma irregular de l'asteroide
@@ -29,15 +32,16 @@ class Asteroid(BaseEntity):
     
     def _generate_spawn_position(self):
         # Genera una posició aleatòria fora de la pantalla
-        side = random.choice(['top', 'right', 'bottom', 'left'])
+        rng = self.rng
+        side = rng.choice(['top', 'right', 'bottom', 'left'])
         if side == 'top':
-            return Vector2(random.randint(0, SCREEN_WIDTH), -50)
+            return Vector2(rng.randint(0, SCREEN_WIDTH), -50)
         elif side == 'right':
-            return Vector2(SCREEN_WIDTH + 50, random.randint(0, SCREEN_HEIGHT))
+            return Vector2(SCREEN_WIDTH + 50, rng.randint(0, SCREEN_HEIGHT))
         elif side == 'bottom':
-            return Vector2(random.randint(0, SCREEN_WIDTH), SCREEN_HEIGHT + 50)
+            return Vector2(rng.randint(0, SCREEN_WIDTH), SCREEN_HEIGHT + 50)
         else:  # left
-            return Vector2(-50, random.randint(0, SCREEN_HEIGHT))
+            return Vector2(-50, rng.randint(0, SCREEN_HEIGHT))
     
     def _get_size_radius(self):
         return {
@@ -48,10 +52,10 @@ class Asteroid(BaseEntity):
     
     def _generate_shape(self):
         # Genera una forma irregular amb variacions al radi
-        num_points = random.randint(8, 12)
+        num_points = self.rng.randint(8, 12)
         for i in range(num_points):
             angle = (i / num_points) * math.pi * 2
-            distance = self.radius * random.uniform(0.8, 1.2)
+            distance = self.radius * self.rng.uniform(0.8, 1.2)
             point = Vector2(math.cos(angle), math.sin(angle)) * distance
             self.points.append(point)
     
@@ -59,12 +63,13 @@ class Asteroid(BaseEntity):
         super().update()
         self.angle += self.rotation_speed
     
-    def draw(self, screen):
-        # Dibuixa l'asteroide rotant els punts
+    def draw(self, screen, alpha=1.0):
+        # Dibuixa l'asteroide rotant els punts (interpolat entre passos)
+        position, angle = self.render_state(alpha)
         transformed_points = []
         for point in self.points:
-            rotated = point.rotate(self.angle)
-            transformed = rotated + self.position
+            rotated = point.rotate(angle)
+            transformed = rotated + position
             transformed_points.append(transformed)
         
         pygame.draw.polygon(screen, WHITE, transformed_points, 2)
@@ -72,11 +77,24 @@ class Asteroid(BaseEntity):
     def split(self):
         # Retorna nous asteroides més petits quan es destrueix
         if self.size == 'large':
-            return [Asteroid(self.position, 'medium') for _ in range(2)]
+            return [Asteroid(self.position, 'medium', rng=self.rng) for _ in range(2)]
         elif self.size == 'medium':
-            return [Asteroid(self.position, 'small') for _ in range(2)]
+            return [Asteroid(self.position, 'small', rng=self.rng) for _ in range(2)]
         return []
     
+    def get_state(self):
+        # Els punts es guarden com a tuples per serialitzar-los
+        return {'size': self.size, 'points': [(p.x, p.y) for p in self.points]}
+    
+    @classmethod
+    def from_state(cls, state, rng=None):
+        asteroid = super().from_state({
+            'size': state['size'],
+            'points': [Vector2(p) for p in state['points']]
+        })
+        asteroid.rng = rng if rng is not None else random
+        return asteroid
+    
     def get_radius(self):
         return self.radius
     
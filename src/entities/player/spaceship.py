@@ -34,17 +34,18 @@ class Spaceship(BaseEntity):
         self.thrust = False
         self.velocity *= PLAYER_FRICTION
     
-    def draw(self, screen):
-        # Draw the ship
-        points = [p.rotate(-self.angle) + self.position for p in self.shape]
+    def draw(self, screen, alpha=1.0):
+        # Draw the ship (interpolated between simulation steps)
+        position, angle = self.render_state(alpha)
+        points = [p.rotate(-angle) + position for p in self.shape]
         pygame.draw.polygon(screen, WHITE, points, 2)
         
         # Draw thrust if accelerating
         if self.thrust:
             flame_points = [
-                Vector2(0, 15).rotate(-self.angle) + self.position,
-                Vector2(-5, 25).rotate(-self.angle) + self.position,
-                Vector2(5, 25).rotate(-self.angle) + self.position
+                Vector2(0, 15).rotate(-angle) + position,
+                Vector2(-5, 25).rotate(-angle) + position,
+                Vector2(5, 25).rotate(-angle) + position
             ]
             pygame.draw.polygon(screen, RED, flame_points)
     
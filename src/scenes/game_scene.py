@@ -1,28 +1,63 @@
+import random
+import time
+import struct
+import zlib
 from pygame.math import Vector2
 from src.entities.player.spaceship import Spaceship
 from src.entities.objects.asteroid import Asteroid
 from src.entities.objects.projectile import Projectile
+from src.entities.entity_store import EntityStore, CHECKSUM_SCALE
+from src.utils.spatial_grid import SpatialGrid
+from src.core.input import KeyboardInput, ROTATE_LEFT, ROTATE_RIGHT, THRUST, REVERSE, FIRE
+from src.core.audio import PygameAudio
+from src.core.managers.asset_manager import assets
+from src.utils.text_cache import render_text
 from src.utils.constants import *
-from src.core.managers.mongo_high_score_manager import MongoHighScoreManager
+from src.core.managers.high_score_manager import HighScoreManager
+from src.utils.logger import get_logger
+
+log = get_logger("scenes")
+entity_log = get_logger("entities")
+collision_log = get_logger("collisions")
 
 
 class GameScene:
-    def __init__(self, high_score_manager: MongoHighScoreManager):
+    def __init__(self, high_score_manager: HighScoreManager, input_source=None, audio=None, level=1,
+                 seed=None, record_checksums=False):
+        # Keyboard and pygame.mixer by default; headless runs inject
+        # a ScriptedInput and NullAudio instead
+        self.input_source = input_source if input_source is not None else KeyboardInput()
+        self.audio = audio if audio is not None else PygameAudio()
+        # Own random stream: the same seed and inputs give the same game
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.rng = random.Random(self.seed)
+        self.tick = 0
+        # Optional per-step state checksums, to catch desyncs between runs
+        self.checksums = [] if record_checksums else None
+        # Optional ReplayRecorder, fed the input of every step
+        self.recorder = None
+        # Optional FrameProfiler, told how long collision checks take
+        self.profiler = None
+        # HUD surfaces, rendered again only when score or level change
+        self.hud_values = None
+        self.hud_surfaces = None
         self.player = Spaceship(Vector2(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
-        self.asteroids = []
-        self.projectiles = []
+        self.asteroids = EntityStore()
+        self.projectiles = EntityStore()
+        self.grid = SpatialGrid()
         self.score = 0
-        self.level = 1
+        self.level = level
         self.game_over = False
         self.new_highscore = False
         self.player_name = ""
         self.high_score_manager = high_score_manager
+        # Future with this run's position among all saved runs (asked at game over)
+        self.rank_job = None
         
-        self.high_score_manager.load_high_scores()
+        # Cached leaderboard: refreshed in the background, never read on this thread
         self.highscores = self.high_score_manager.get_high_scores()
         self._spawn_asteroids()
-        pygame.mixer.init()  # Initialize sound system
-        print("Starting game. Current score: 0")
+        log.info("Starting game. Current score: 0")
     
     def _spawn_asteroids(self):
         # Base number of asteroids increases with level
@@ -31,193 +66,287 @@ class GameScene:
         # Calculate speed multiplier based on level (caps at 2x speed)
         speed_multiplier = min(1 + (self.level * 0.1), 2.0)
         
-        print(f"Generating {num_asteroids} asteroids for round {self.level}.")
-        print(f"Speed multiplier: {speed_multiplier}x")
+        log.info("Generating %d asteroids for round %d.", num_asteroids, self.level)
+        log.info("Speed multiplier: %sx", speed_multiplier)
         
         for _ in range(num_asteroids):
             # Create asteroid with modified speed based on level
-            asteroid = Asteroid(size='large', speed_multiplier=speed_multiplier)
+            asteroid = Asteroid(size='large', speed_multiplier=speed_multiplier, rng=self.rng)
             self.asteroids.append(asteroid)
-            print("Asteroid created.")
+            entity_log.debug("Asteroid created.")
     
     def handle_input(self, event):
         if self.new_highscore:
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_RETURN:
                     name = self.player_name.strip() or "AAA"
-                    self.high_score_manager.add_high_score(name, self.score)
-                    print(f"New high score added: {name} - {self.score}")
+                    self.save_run(name)
+                    log.info("New high score added: %s - %d", name, self.score)
                     self.new_highscore = False
                     return "MENU"
                 elif event.key == pygame.K_BACKSPACE:
                     self.player_name = self.player_name[:-1]
-                    print(f"Deleting last character of name: {self.player_name}")
+                    log.debug("Deleting last character of name: %s", self.player_name)
                 else:
                     if len(self.player_name) < 3 and event.unicode.isalpha():
                         self.player_name += event.unicode.upper()
-                        print(f"Current name input: {self.player_name}")
+                        log.debug("Current name input: %s", self.player_name)
             return None
 
-        if event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_SPACE and not self.game_over:
-                # Create projectile with sound
-                self.projectiles.append(Projectile(self.player.position.copy(), self.player.angle))
-                print("Projectile created and added to list.")
-            elif event.key == pygame.K_LEFT:
-                self.player.rotate(PLAYER_ROTATION_SPEED)
-                print("Rotating ship left.")
-            elif event.key == pygame.K_RIGHT:
-                self.player.rotate(-PLAYER_ROTATION_SPEED)
-                print("Rotating ship right.")
-            elif event.key == pygame.K_UP:
-                self.player.accelerate(forward=True)
-                print("Ship accelerating forward.")
-            elif event.key == pygame.K_DOWN:
-                self.player.accelerate(forward=False)
-                print("Ship accelerating backward.")
-            elif event.key == KEY_FULLSCREEN:
-                return "TOGGLE_FULLSCREEN"
+        # Key presses are latched and applied on the next simulation step
+        self.input_source.handle_event(event)
+        if event.type == pygame.KEYDOWN and event.key == KEY_FULLSCREEN:
+            return "TOGGLE_FULLSCREEN"
         
         return None
 
+    def save_run(self, name=ANONYMOUS_NAME):
+        """Saves this run (every run is kept, not only high scores)."""
+        return self.high_score_manager.add_high_score(
+            name, self.score, level=self.level, duration=self.tick / SIMULATION_HZ
+        )
+
+    def _fire(self):
+        # Create projectile with sound
+        self.projectiles.append(Projectile(self.player.position.copy(), self.player.angle))
+        self.audio.play_sound(LASER_SOUND, LASER_VOLUME)
+        entity_log.debug("Projectile created and added to list.")
+
     def update(self):
         if self.game_over:
             if not hasattr(self, 'game_over_music_played'):
-                pygame.mixer.music.load('src/assets/music/game_over.mp3')
-                pygame.mixer.music.play(0)  # Play once
+                self.audio.play_music(GAME_OVER_MUSIC, 0)  # Play once
                 self.game_over_music_played = True
-                print("Playing game over music.")
+                log.info("Playing game over music.")
+                # Indexed count in the background, shown when it arrives
+                self.rank_job = self.high_score_manager.get_rank(self.score)
             
-            if not pygame.mixer.music.get_busy():  # Check if music has finished
+            if not self.audio.music_busy():  # Check if music has finished
                 if self.high_score_manager.is_high_score(self.score):
                     self.new_highscore = True
-                    print("New high score achieved.")
+                    log.info("New high score achieved.")
                     return "NEW_HIGHSCORE"
-                print("Game ending and returning to menu.")
+                self.save_run()
+                log.info("Game ending and returning to menu.")
                 return "MENU"
             return None
 
-        # Handle continuous key presses
-        keys = pygame.key.get_pressed()
-        if keys[pygame.K_LEFT]:
+        # Read this step's input (held keys plus latched presses)
+        bits = self.input_source.poll()
+        if self.recorder is not None:
+            self.recorder.record(self, bits)
+        self.tick += 1
+
+        # Keep the state before this step for interpolated rendering
+        self.player.remember_state()
+
+        if bits & ROTATE_LEFT:
             self.player.rotate(PLAYER_ROTATION_SPEED)
-            print("Rotating ship left.")
-        if keys[pygame.K_RIGHT]:
+        if bits & ROTATE_RIGHT:
             self.player.rotate(-PLAYER_ROTATION_SPEED)
-            print("Rotating ship right.")
-        if keys[pygame.K_UP]:
+        if bits & THRUST:
             self.player.accelerate(forward=True)
-            print("Ship accelerating forward.")
-        if keys[pygame.K_DOWN]:
+        if bits & REVERSE:
             self.player.accelerate(forward=False)
-            print("Ship accelerating backward.")
+        if bits & FIRE:
+            self._fire()
 
         # Update player
         self.player.update()
-        print("Player updated.")
         
-        # Update projectiles
-        for projectile in self.projectiles[:]:  # Make a copy of the list to modify it
-            projectile.update()
-            if not projectile.active:
-                self.projectiles.remove(projectile)
-                print("Inactive projectile removed.")
+        # Update projectiles and drop the expired ones (vectorized)
+        self.projectiles.step()
+        if self.projectiles.remove_inactive() and entity_log.debug_enabled:
+            entity_log.debug("Inactive projectile removed.")
         
-        # Update asteroids
-        for asteroid in self.asteroids:
-            asteroid.update()
-            print(f"Asteroid updated. Position: {asteroid.position}")
-                
-            if asteroid.collides_with(self.player):
-                self.game_over = True
-                print("Ship collided with an asteroid. Game Over.")
-                return
+        # Update asteroids (vectorized)
+        self.asteroids.step()
+        if entity_log.debug_enabled:
+            for asteroid in self.asteroids:
+                entity_log.debug("Asteroid updated. Position: %s", asteroid.position)
+
+        collision_start = time.perf_counter() if self.profiler is not None else 0.0
+        if len(self.asteroids.overlapping(self.player.position, self.player.get_radius())):
+            self.game_over = True
+            collision_log.info("Ship collided with an asteroid. Game Over.")
+            self._record_checksum()
+            return
         
         if not self.game_over:  # Only check collisions if not game over
             self._check_projectile_collisions()
+        if self.profiler is not None:
+            self.profiler.add('collision', collision_start, time.perf_counter())
         
         # Check if level is completed
         if len(self.asteroids) == 0:
             self.level += 1
-            print(f"Level {self.level} completed.")
+            log.info("Level %d completed.", self.level)
             self._spawn_asteroids()
 
+        self._record_checksum()
+
+    def _record_checksum(self):
+        if self.checksums is not None:
+            self.checksums.append(self.state_checksum())
+
+    def get_state(self):
+        """Everything needed to resume the simulation from this step."""
+        player = self.player
+        return {
+            'seed': self.seed,
+            'rng': self.rng.getstate(),
+            'tick': self.tick,
+            'score': self.score,
+            'level': self.level,
+            'game_over': self.game_over,
+            'player': {
+                'position': tuple(player.position),
+                'velocity': tuple(player.velocity),
+                'angle': player.angle,
+                'previous_position': tuple(player.previous_position),
+                'previous_angle': player.previous_angle,
+                'thrust': player.thrust
+            },
+            'asteroids': self.asteroids.snapshot(),
+            'projectiles': self.projectiles.snapshot()
+        }
+
+    def set_state(self, state):
+        """Restores a state returned by get_state()."""
+        self.seed = state['seed']
+        self.rng.setstate(state['rng'])
+        self.tick = state['tick']
+        self.score = state['score']
+        self.level = state['level']
+        self.game_over = state['game_over']
+        player = self.player
+        player.position = Vector2(state['player']['position'])
+        player.velocity = Vector2(state['player']['velocity'])
+        player.angle = state['player']['angle']
+        player.previous_position = Vector2(state['player']['previous_position'])
+        player.previous_angle = state['player']['previous_angle']
+        player.thrust = state['player']['thrust']
+        asteroids = state['asteroids']
+        self.asteroids.restore(asteroids, [Asteroid.from_state(view, self.rng) for view in asteroids['views']])
+        projectiles = state['projectiles']
+        self.projectiles.restore(projectiles, [Projectile.from_state(view) for view in projectiles['views']])
+
+    def state_checksum(self):
+        """CRC32 of the simulation state (ship, asteroids, projectiles, score,
+        level and step number). Cheap enough to compute every step."""
+        player = self.player
+        header = struct.pack(
+            '<12q',
+            self.tick, self.score, self.level, int(self.game_over),
+            len(self.asteroids), len(self.projectiles),
+            *(round(value * CHECKSUM_SCALE) for value in (
+                player.position.x, player.position.y,
+                player.velocity.x, player.velocity.y,
+                player.angle, player.radius
+            ))
+        )
+        crc = zlib.crc32(header)
+        crc = self.asteroids.checksum(crc)
+        return self.projectiles.checksum(crc)
+
     def _check_projectile_collisions(self):
-        for projectile in self.projectiles[:]:
-            for asteroid in self.asteroids[:]:
-                if projectile.collides_with(asteroid):
-                    self.score += asteroid.get_score()
-                    print(f"Score increased. New total: {self.score}")
-                    self.projectiles.remove(projectile)
-                    print("Projectile removed after collision.")
-                    self.asteroids.remove(asteroid)
-                    print("Asteroid removed after collision.")
-                    
-                    # Create smaller asteroids if possible
-                    new_asteroids = asteroid.split()
-                    self.asteroids.extend(new_asteroids)
-                    print(f"{len(new_asteroids)} smaller asteroid(s) created.")
-                    break
-
-    def draw(self, screen):
+        # Grid broad-phase plus a vectorized distance check; pairs come back
+        # sorted, so each projectile destroys the first asteroid it touches
+        projectile_hits, asteroid_hits = self.projectiles.collision_pairs(self.asteroids, self.grid)
+        if len(projectile_hits) == 0:
+            return
+
+        hit_asteroids = set()
+        spent_projectiles = set()
+        new_asteroids = []
+        for projectile_index, index in zip(projectile_hits.tolist(), asteroid_hits.tolist()):
+            if projectile_index in spent_projectiles or index in hit_asteroids:
+                continue
+            asteroid = self.asteroids[index]
+            self.score += asteroid.get_score()
+            collision_log.info("Score increased. New total: %d", self.score)
+            hit_asteroids.add(index)
+            spent_projectiles.add(projectile_index)
+            
+            # Create smaller asteroids if possible
+            fragments = asteroid.split()
+            new_asteroids.extend(fragments)
+            collision_log.debug("%d smaller asteroid(s) created.", len(fragments))
+
+        # Swap-and-pop removal of everything that was hit, then add the fragments
+        self.projectiles.remove_indices(spent_projectiles)
+        self.asteroids.remove_indices(hit_asteroids)
+        self.asteroids.extend(new_asteroids)
+
+    def _rank(self):
+        # None until the query finishes, or if it failed or there is no connection
+        if self.rank_job is None or not self.rank_job.done() or self.rank_job.exception() is not None:
+            return None
+        return self.rank_job.result()
+
+    def _hud(self):
+        values = (self.score, self.level)
+        if values != self.hud_values:
+            font = assets.font(None, 36)
+            self.hud_surfaces = (
+                font.render(f"Score: {self.score}", True, WHITE),
+                font.render(f"Round: {self.level}", True, WHITE)
+            )
+            self.hud_values = values
+        return self.hud_surfaces
+
+    def draw(self, screen, alpha=1.0):
+        # alpha: how far rendering is between the last two simulation steps
         screen.fill(BLACK)
         
-        self.player.draw(screen)
-        print("Ship drawn.")
+        self.player.draw(screen, alpha)
         
         for projectile in self.projectiles:
-            projectile.draw(screen)
-            print("Projectile drawn.")
+            projectile.draw(screen, alpha)
             
         for asteroid in self.asteroids:
-            asteroid.draw(screen)
-            print("Asteroid drawn.")
+            asteroid.draw(screen, alpha)
         
-        font = pygame.font.Font(None, 36)
-        score_text = font.render(f"Score: {self.score}", True, WHITE)
-        round_text = font.render(f"Round: {self.level}", True, WHITE)
+        score_text, round_text = self._hud()
         screen.blit(score_text, (10, 10))
         screen.blit(round_text, (SCREEN_WIDTH - 150, 10))
         
         if self.game_over:
             # Draw game over text
-            font = pygame.font.Font(None, 74)
-            text = font.render('GAME OVER', True, RED)
+            font = assets.font(None, 74)
+            text = render_text(font, 'GAME OVER', RED)
             text_rect = text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 50))
             screen.blit(text, text_rect)
+
+            rank = self._rank()
+            if rank is not None:
+                rank_font = assets.font(None, 36)
+                rank_text = render_text(rank_font, f"Rank #{rank} of all runs", WHITE)
+                rank_rect = rank_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 150))
+                screen.blit(rank_text, rank_rect)
             
             if self.new_highscore:
                 # Draw black rectangle behind name entry prompt
-                prompt_font = pygame.font.Font(None, 36)
-                prompt = prompt_font.render("New Highscore! Enter your name:", True, WHITE)
+                prompt_font = assets.font(None, 36)
+                prompt = render_text(prompt_font, "New Highscore! Enter your name:", WHITE)
                 prompt_rect = prompt.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 50))
                 
-                background_prompt = pygame.Surface((prompt_rect.width + 20, prompt_rect.height + 20))
-                background_prompt.set_alpha(400)
-                background_prompt.fill(BLACK)
-                background_prompt_rect = background_prompt.get_rect(center=prompt_rect.center)
-                
-                screen.blit(background_prompt, background_prompt_rect)
+                # Opaque, so a fill does the job without a temporary surface
+                screen.fill(BLACK, prompt_rect.inflate(20, 20))
                 screen.blit(prompt, prompt_rect)
                 
                 # Show MongoDB status message
                 status_message = self.high_score_manager.get_status_message()
                 if status_message:
-                    status_font = pygame.font.Font(None, 24)
-                    status_text = status_font.render(status_message, True, YELLOW)
+                    status_font = assets.font(None, 24)
+                    status_text = render_text(status_font, status_message, YELLOW)
                     status_rect = status_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2))
                     screen.blit(status_text, status_rect)
                 
                 # Draw black rectangle behind player name
-                name_font = pygame.font.Font(None, 48)
-                name_surface = name_font.render(self.player_name, True, WHITE)
+                name_font = assets.font(None, 48)
+                name_surface = render_text(name_font, self.player_name, WHITE)
                 name_rect = name_surface.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 100))
                 
-                background_name = pygame.Surface((name_rect.width + 20, name_rect.height + 20))
-                background_name.set_alpha(400)
-                background_name.fill(BLACK)
-                background_name_rect = background_name.get_rect(center=name_rect.center)
-                
-                screen.blit(background_name, background_name_rect)
+                screen.fill(BLACK, name_rect.inflate(20, 20))
                 screen.blit(name_surface, name_rect)
-                print(f"Showing entered name: {self.player_name}")
@@ -1,7 +1,11 @@
 import pygame
 import os
 from src.utils.constants import *
-from src.utils.transitions import Transition
+from src.utils.transitions import Transition, get_ticks
+from src.core.managers.asset_manager import assets
+from src.utils.logger import get_logger
+
+log = get_logger("scenes")
 
 def create_placeholder_image():
     # Create directories if they don't exist
@@ -12,7 +16,7 @@ def create_placeholder_image():
     placeholder.fill((50, 50, 50))  # Dark gray background
     
     # Add text to the placeholder
-    font = pygame.font.Font(None, 36)
+    font = assets.font(None, 36)
     text = font.render("Placeholder Image", True, (255, 255, 255))
     text_rect = text.get_rect(center=(200, 100))
     placeholder.blit(text, text_rect)
@@ -20,72 +24,103 @@ def create_placeholder_image():
     # Save the placeholder image
     try:
         pygame.image.save(placeholder, "src/assets/images/placeholder.jpg")
-        print("Successfully created placeholder image")
+        log.info("Successfully created placeholder image")
     except Exception as e:
-        print(f"Error creating placeholder image: {e}")
+        log.error("Error creating placeholder image: %s", e)
 
 class IntroScene:
-    def __init__(self):
-        self.slides = [
-            {
-                'image': 'developer_logo.png',
-                'duration': 5,
-                'text': 'A Game By Pelusinni',
-                'text_offset': 150,
-                'size': (400, 200)
-            }
-        ]
+    SLIDES = [
+        {
+            'image': 'developer_logo.png',
+            'duration': 5,
+            'text': 'A Game By Pelusinni',
+            'text_offset': 150,
+            'size': (400, 200)
+        }
+    ]
+
+    def __init__(self, preloader=None):
+        self.slides = self.SLIDES
         self.current_slide = 0
         self.fade_in = Transition(0.25)
         self.fade_out = Transition(0.25)
         self.slide_timer = 0
         self.state = 'FADE_IN'
+        # With a preloader, slide images arrive from it (the first frame does not wait
+        # for them) and a key press ends the intro once every asset is loaded
+        self.preloader = preloader
+        self.skip_requested = False
         
         # Load fonts and images
         try:
-            self.font = pygame.font.Font('src/assets/fonts/PressStart2P-Regular.ttf', 36)
+            self.font = assets.font(FONT_PATH, 36)
         except:
-            print("Could not load font. Using default font.")
-            self.font = pygame.font.Font(None, 36)
+            log.warning("Could not load font. Using default font.")
+            self.font = assets.font(None, 36)
+        self.hint_font = assets.font(None, 24)
         
         self.images = {}
-        
-        # Load the actual images
-        for slide in self.slides:
+        if preloader is None:
+            for slide in self.slides:
+                self._load_image(slide)
+
+    @classmethod
+    def asset_jobs(cls):
+        """AssetPreloader jobs for the slide images."""
+        return [('image', f"src/assets/images/{slide['image']}", slide['size']) for slide in cls.SLIDES]
+
+    def _load_image(self, slide):
+        image_path = f"src/assets/images/{slide['image']}"
+        try:
+            self.images[slide['image']] = assets.image(image_path, size=slide['size'])
+        except pygame.error as e:
+            log.error("Error loading image %s: %s", image_path, e)
+            # Create a temporary image instead of exiting
+            temp_surface = pygame.Surface(slide['size'])
+            temp_surface.fill((50, 50, 50))
+            font = assets.font(None, 36)
+            text = font.render(slide['text'], True, (255, 255, 255))
+            text_rect = text.get_rect(center=(slide['size'][0]/2, slide['size'][1]/2))
+            temp_surface.blit(text, text_rect)
+            self.images[slide['image']] = temp_surface
+
+    def _slide_image(self, slide):
+        # None until the preloader has the image
+        if slide['image'] not in self.images:
             image_path = f"src/assets/images/{slide['image']}"
-            try:
-                original = pygame.image.load(image_path).convert_alpha()
-                self.images[slide['image']] = pygame.transform.scale(original, slide['size'])
-            except pygame.error as e:
-                print(f"Error loading image {image_path}: {e}")
-                # Create a temporary image instead of exiting
-                temp_surface = pygame.Surface(slide['size'])
-                temp_surface.fill((50, 50, 50))
-                font = pygame.font.Font(None, 36)
-                text = font.render(slide['text'], True, (255, 255, 255))
-                text_rect = text.get_rect(center=(slide['size'][0]/2, slide['size'][1]/2))
-                temp_surface.blit(text, text_rect)
-                self.images[slide['image']] = temp_surface
+            if not self.preloader.is_finished('image', image_path, slide['size']):
+                return None
+            self._load_image(slide)  # Already in the asset cache
+        return self.images[slide['image']]
+
+    def handle_input(self, event):
+        if event.type == pygame.KEYDOWN:
+            self.skip_requested = True
+
+    @property
+    def warm(self):
+        return self.preloader is None or self.preloader.done
 
     def update(self):
-        current_time = pygame.time.get_ticks()
+        current_time = get_ticks()
         
         if self.state == 'FADE_IN':
             if not self.fade_in.is_active:
                 self.fade_in.start()
             elif self.fade_in.is_finished():
                 self.state = 'DISPLAY'
-                self.slide_timer = pygame.time.get_ticks()
+                self.slide_timer = get_ticks()
                 
         elif self.state == 'DISPLAY':
-            if current_time - self.slide_timer >= self.slides[self.current_slide]['duration'] * 1000:
+            slide_over = current_time - self.slide_timer >= self.slides[self.current_slide]['duration'] * 1000
+            if slide_over or (self.skip_requested and self.warm):
                 self.state = 'FADE_OUT'
                 self.fade_out.start()
                 
         elif self.state == 'FADE_OUT':
             if self.fade_out.is_finished():
                 self.current_slide += 1
-                if self.current_slide >= len(self.slides):
+                if self.current_slide >= len(self.slides) or (self.skip_requested and self.warm):
                     return "MENU"
                 self.state = 'FADE_IN'
                 self.fade_in = Transition(0.25)
@@ -99,14 +134,10 @@ class IntroScene:
         if self.current_slide >= len(self.slides):
             return
             
-        current_image = self.images[self.slides[self.current_slide]['image']]
+        current_image = self._slide_image(self.slides[self.current_slide])
         current_text = self.slides[self.current_slide]['text']
         text_offset = self.slides[self.current_slide]['text_offset']
         
-        # Calculate image position (centered)
-        image_rect = current_image.get_rect()
-        image_rect.center = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
-        
         # Calculate text position (below image)
         text_surface = self.font.render(current_text, True, WHITE)
         text_rect = text_surface.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + text_offset))
@@ -119,10 +150,30 @@ class IntroScene:
             alpha = 255 - self.fade_out.get_alpha()
         
         # Draw image with fade
-        temp_surface = current_image.copy()
-        temp_surface.set_alpha(alpha)
-        screen.blit(temp_surface, image_rect)
+        if current_image is not None:
+            # Calculate image position (centered)
+            image_rect = current_image.get_rect()
+            image_rect.center = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+            temp_surface = current_image.copy()
+            temp_surface.set_alpha(alpha)
+            screen.blit(temp_surface, image_rect)
         
         # Draw text with fade
         text_surface.set_alpha(alpha)
         screen.blit(text_surface, text_rect)
+        
+        if self.preloader is not None:
+            self._draw_progress(screen, alpha)
+
+    def _draw_progress(self, screen, alpha):
+        # Loading bar at the bottom; once everything is loaded, the skip hint
+        if not self.preloader.done:
+            width = 200
+            bar = pygame.Rect(0, 0, width, 4)
+            bar.center = (SCREEN_WIDTH // 2, SCREEN_HEIGHT - 40)
+            pygame.draw.rect(screen, (60, 60, 60), bar)
+            pygame.draw.rect(screen, WHITE, (bar.x, bar.y, int(width * self.preloader.progress), bar.height))
+        else:
+            hint = self.hint_font.render("Press any key", True, (150, 150, 150))
+            hint.set_alpha(alpha)
+            screen.blit(hint, hint.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 40)))
@@ -1,13 +1,18 @@
 from src.utils.button import Button
 from src.utils.constants import *
-from src.core.managers.mongo_high_score_manager import MongoHighScoreManager
+from src.core.managers.asset_manager import assets
+from src.utils.text_cache import render_text
+from src.core.managers.high_score_manager import HighScoreManager
+from src.utils.logger import get_logger
+
+log = get_logger("scenes")
 
 class MenuScene:
-    def __init__(self, high_score_manager: MongoHighScoreManager):
-        self.version_font = pygame.font.Font(None, 24)
-        self.title_font = pygame.font.Font('src/assets/fonts/PressStart2P-Regular.ttf', 48)  # Increased size for better visibility
-        self.subtitle_font = pygame.font.Font('src/assets/fonts/PressStart2P-Regular.ttf', 24)  # Font for subtitle
-        self.highscore_font = pygame.font.Font('src/assets/fonts/PressStart2P-Regular.ttf', 28)  # Larger font for scores
+    def __init__(self, high_score_manager: HighScoreManager):
+        self.version_font = assets.font(None, 24)
+        self.title_font = assets.font(FONT_PATH, 48)  # Increased size for better visibility
+        self.subtitle_font = assets.font(FONT_PATH, 24)  # Font for subtitle
+        self.highscore_font = assets.font(FONT_PATH, 28)  # Larger font for scores
         self.buttons = [
             Button("PLAY", (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)),
             Button("CONTROLS", (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 80)),  # Increased separation
@@ -18,21 +23,45 @@ class MenuScene:
         self.show_highscores = False
         self.high_score_manager = high_score_manager
         self.highscores = self.high_score_manager.get_high_scores()
+        # HIGH SCORES screen, rendered again only when its content changes
+        self.highscore_panel = None
+        self.highscore_panel_key = None
+        # Leaderboard shown: scope, the keyset cursor of every page up to
+        # the current one, and the query for it (None: cached all-time top)
+        self.scope_index = 0
+        self.page_starts = [None]
+        self.page_job = None
         self.selected_button = 0  # Track which button is selected
         # Set initial button as selected
         self.buttons[0].selected = True
-        print("Menu initialized successfully.")
+        log.info("Menu initialized successfully.")
 
     def handle_input(self, event):
         if self.show_controls:
             if event.type == pygame.KEYDOWN:
                 self.show_controls = False
-                print("Returning to main menu from CONTROLS.")
+                log.debug("Returning to main menu from CONTROLS.")
             return None
         if self.show_highscores:
             if event.type == pygame.KEYDOWN:
-                self.show_highscores = False
-                print("Returning to main menu from HIGH SCORES.")
+                if event.key in (pygame.K_LEFT, pygame.K_RIGHT):
+                    step = 1 if event.key == pygame.K_RIGHT else -1
+                    self.scope_index = (self.scope_index + step) % len(LEADERBOARD_SCOPES)
+                    self.page_starts = [None]
+                    self._load_page()
+                elif event.key == pygame.K_DOWN:
+                    rows = self._page_rows()
+                    # Only full pages can have another one after them
+                    if rows and len(rows) == self.high_score_manager.max_scores:
+                        self.page_starts.append((rows[-1]['score'], rows[-1]['_id']))
+                        self._load_page()
+                elif event.key == pygame.K_UP:
+                    if len(self.page_starts) > 1:
+                        self.page_starts.pop()
+                        self._load_page()
+                else:
+                    self.show_highscores = False
+                    log.debug("Returning to main menu from HIGH SCORES.")
             return None
 
         if event.type == pygame.KEYDOWN:
@@ -41,30 +70,33 @@ class MenuScene:
                 self.buttons[self.selected_button].selected = False
                 self.selected_button = (self.selected_button - 1) % len(self.buttons)
                 self.buttons[self.selected_button].selected = True
-                print(f"Selected button: {self.buttons[self.selected_button].text}")
+                log.debug("Selected button: %s", self.buttons[self.selected_button].text)
                 
             elif event.key == pygame.K_DOWN:
                 # Move selection down
                 self.buttons[self.selected_button].selected = False
                 self.selected_button = (self.selected_button + 1) % len(self.buttons)
                 self.buttons[self.selected_button].selected = True
-                print(f"Selected button: {self.buttons[self.selected_button].text}")
+                log.debug("Selected button: %s", self.buttons[self.selected_button].text)
 
         # Handle button events
         for button in self.buttons:
             if button.handle_event(event):
                 if button.text == "PLAY":
-                    print("PLAY button selected.")
+                    log.info("PLAY button selected.")
                     return "PLAY"
                 elif button.text == "CONTROLS":
                     self.show_controls = True
-                    print("Showing CONTROLS.")
+                    log.debug("Showing CONTROLS.")
                 elif button.text == "HIGH SCORES":
                     self.show_highscores = True
                     self.highscores = self.high_score_manager.get_high_scores()
-                    print("Showing HIGH SCORES.")
+                    self.scope_index = 0
+                    self.page_starts = [None]
+                    self._load_page()
+                    log.debug("Showing HIGH SCORES.")
                 elif button.text == "QUIT":
-                    print("QUIT button selected.")
+                    log.info("QUIT button selected.")
                     return "QUIT"
         return None
 
@@ -73,17 +105,17 @@ class MenuScene:
 
         if not self.show_controls and not self.show_highscores:
             # Draw game title
-            title = self.title_font.render("ASTEROIDS", True, GREEN)
+            title = render_text(self.title_font, "ASTEROIDS", GREEN)
             title_rect = title.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 4))
             screen.blit(title, title_rect)
 
             # Draw subtitle
-            subtitle = self.subtitle_font.render("A CLASSIC ARCADE GAME", True, WHITE)
+            subtitle = render_text(self.subtitle_font, "A CLASSIC ARCADE GAME", WHITE)
             subtitle_rect = subtitle.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 4 + 60))
             screen.blit(subtitle, subtitle_rect)
 
             # Draw version
-            version = self.version_font.render(GAME_VERSION, True, WHITE)
+            version = render_text(self.version_font, GAME_VERSION, WHITE)
             version_rect = version.get_rect(bottomright=(SCREEN_WIDTH - 10, SCREEN_HEIGHT - 10))
             screen.blit(version, version_rect)
 
@@ -109,57 +141,101 @@ class MenuScene:
             "Press any key to return"
         ]
 
-        font = pygame.font.Font('src/assets/fonts/PressStart2P-Regular.ttf', 24)  # Consistent retro font
+        font = assets.font(FONT_PATH, 24)  # Consistent retro font
         y = SCREEN_HEIGHT // 3
 
         for line in controls:
-            text = font.render(line, True, WHITE)
+            text = render_text(font, line, WHITE)
             rect = text.get_rect(center=(SCREEN_WIDTH // 2, y))
             screen.blit(text, rect)
             y += 40
-        print("Showing CONTROLS section.")
+
+    def _load_page(self):
+        scope = LEADERBOARD_SCOPES[self.scope_index][0]
+        if scope == 'all' and len(self.page_starts) == 1:
+            self.page_job = None  # The cached top, no query needed
+        else:
+            self.page_job = self.high_score_manager.get_leaderboard(scope, after=self.page_starts[-1])
+        log.debug("HIGH SCORES: %s, page %d.", scope, len(self.page_starts))
+
+    def _page_rows(self):
+        # Rows of the page shown; None while its query is running
+        if self.page_job is None:
+            return self.highscores
+        if not self.page_job.done():
+            return None
+        if self.page_job.exception() is not None:
+            return []
+        return self.page_job.result() or []
 
     def _draw_highscores(self, screen):
-        # Ensure scores are up to date
+        # The whole screen is one cached surface, rebuilt only when the
+        # leaderboard (its version), the page or the status message change
+        status_message = self.high_score_manager.get_status_message()
         self.highscores = self.high_score_manager.get_high_scores()
+        rows = self._page_rows()
+        key = (self.high_score_manager.version, status_message, self.scope_index,
+               len(self.page_starts), id(self.page_job), rows is None)
+        if self.highscore_panel is None or key != self.highscore_panel_key:
+            self.highscore_panel = self._render_highscores(status_message, rows)
+            self.highscore_panel_key = key
+        screen.blit(self.highscore_panel, (0, 0))
+
+    def _render_highscores(self, status_message, rows):
+        panel = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        if pygame.display.get_surface() is not None:
+            panel = panel.convert()
 
         # Retro design
-        screen.fill(BLACK)
+        panel.fill(BLACK)
 
         # Retro title
-        title = self.title_font.render("HIGH SCORES", True, GREEN)
+        title = render_text(self.title_font, "HIGH SCORES", GREEN)
         title_rect = title.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 6))
-        screen.blit(title, title_rect)
+        panel.blit(title, title_rect)
 
         # Show status message
-        status_message = self.high_score_manager.get_status_message()
+        small_font = assets.font(None, 24)
         if status_message:
-            status_font = pygame.font.Font(None, 24)
-            status_text = status_font.render(status_message, True, YELLOW)
+            status_text = render_text(small_font, status_message, YELLOW)
             status_rect = status_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 4))
-            screen.blit(status_text, status_rect)
+            panel.blit(status_text, status_rect)
+
+        # Scope and page
+        scope_label = LEADERBOARD_SCOPES[self.scope_index][1]
+        scope_text = render_text(small_font, f"< {scope_label} >   PAGE {len(self.page_starts)}", GREEN)
+        scope_rect = scope_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3 - 20))
+        panel.blit(scope_text, scope_rect)
 
         # Separator
-        pygame.draw.line(screen, WHITE, (SCREEN_WIDTH // 4, SCREEN_HEIGHT // 3), 
+        pygame.draw.line(panel, WHITE, (SCREEN_WIDTH // 4, SCREEN_HEIGHT // 3), 
                         (3 * SCREEN_WIDTH // 4, SCREEN_HEIGHT // 3), 2)
 
         # Show scores with better spacing
         y_start = SCREEN_HEIGHT // 2.5
         spacing = 50  # Increased for better readability
-        for idx in range(self.high_score_manager.max_scores):
-            if idx < len(self.highscores):
-                entry = self.highscores[idx]
-                score_text = f"{idx + 1}. {entry['name']} - {entry['score']}"
-            else:
-                score_text = f"{idx + 1}. ---- - 0"
-
-            text = self.highscore_font.render(score_text, True, WHITE)
-            rect = text.get_rect(center=(SCREEN_WIDTH // 2, y_start + idx * spacing))
-            screen.blit(text, rect)
+        if rows is None:
+            text = render_text(self.highscore_font, "Loading...", WHITE)
+            rect = text.get_rect(center=(SCREEN_WIDTH // 2, y_start))
+            panel.blit(text, rect)
+        else:
+            # Keyset pages are contiguous: ranks go on from the previous page
+            first = (len(self.page_starts) - 1) * self.high_score_manager.max_scores
+            for idx in range(self.high_score_manager.max_scores):
+                if idx < len(rows):
+                    entry = rows[idx]
+                    score_text = f"{first + idx + 1}. {entry['name']} - {entry['score']}"
+                else:
+                    score_text = f"{first + idx + 1}. ---- - 0"
+
+                # Rendered once per rebuild: not worth a text cache entry
+                text = self.highscore_font.render(score_text, True, WHITE)
+                rect = text.get_rect(center=(SCREEN_WIDTH // 2, y_start + idx * spacing))
+                panel.blit(text, rect)
 
         # Exit instructions
-        exit_text = self.highscore_font.render("Press any key to return", True, WHITE)
-        exit_rect = exit_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT - SCREEN_HEIGHT // 12))
-        screen.blit(exit_text, exit_rect)
-
-        print("Showing HIGH SCORES section.")
+        exit_text = render_text(small_font, "LEFT/RIGHT: leaderboard   UP/DOWN: page   Any other key: return", WHITE)
+        exit_rect = exit_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 25))
+        panel.blit(exit_text, exit_rect)
+        log.debug("High scores panel rebuilt.")
+        return panel
@@ -1,6 +1,8 @@
 import pygame
 from src.utils.button import Button
 from src.utils.constants import *
+from src.core.managers.asset_manager import assets
+from src.utils.text_cache import render_text
 
 class PauseScene:
     def __init__(self):
@@ -8,7 +10,7 @@ class PauseScene:
             Button("RESUME", (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)),
             Button("MENU", (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 80))
         ]
-        self.title_font = pygame.font.Font('src/assets/fonts/PressStart2P-Regular.ttf', 48)  # Retro font
+        self.title_font = assets.font(FONT_PATH, 48)  # Retro font
         self.selected_button = 0  # Track which button is selected
         self.buttons[self.selected_button].selected = True  # Set initial button as selected
 
@@ -38,7 +40,7 @@ class PauseScene:
         screen.blit(overlay, (0, 0))
         
         # Draw pause title with retro style
-        title = self.title_font.render("PAUSED", True, GREEN)
+        title = render_text(self.title_font, "PAUSED", GREEN)
         title_rect = title.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3))
         screen.blit(title, title_rect)
         
@@ -1,5 +1,9 @@
 import pygame
 from src.utils.constants import *
+from src.core.managers.asset_manager import assets
+from src.utils.logger import get_logger
+
+log = get_logger("scenes")
 
 class Button:
     def __init__(self, text, position, padding_x=40, padding_y=20):
@@ -10,9 +14,10 @@ class Button:
         self.selected = False
         
         # Calculate button size based on text
-        self.font = pygame.font.Font('src/assets/fonts/PressStart2P-Regular.ttf', 24)
-        text_surface = self.font.render(text, True, WHITE)
-        text_rect = text_surface.get_rect()
+        self.font = assets.font(FONT_PATH, 24)
+        # The label never changes: render it once
+        self.text_surface = self.font.render(text, True, WHITE)
+        text_rect = self.text_surface.get_rect()
         
         # Adjust rectangle to text plus padding
         self.width = text_rect.width + (self.padding_x * 2)
@@ -23,7 +28,7 @@ class Button:
     def handle_event(self, event):
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_RETURN and self.selected:
-                print(f"Button '{self.text}' activated by ENTER key.")
+                log.debug("Button '%s' activated by ENTER key.", self.text)
                 return True
         return False
     
@@ -37,7 +42,6 @@ class Button:
             inner_rect = self.rect.inflate(-4, -4)
             pygame.draw.rect(screen, WHITE, inner_rect, 1)
         
-        # Render text
-        text_surface = self.font.render(self.text, True, WHITE)
-        text_rect = text_surface.get_rect(center=self.rect.center)
-        screen.blit(text_surface, text_rect)
+        # Draw the pre-rendered label
+        text_rect = self.text_surface.get_rect(center=self.rect.center)
+        screen.blit(self.text_surface, text_rect)
@@ -17,6 +17,10 @@ YELLOW = (255, 255, 0)
 
 # Game configuration
 FPS = 60
+RENDER_FPS = FPS  # Frame cap for drawing; 0 = uncapped
+SIMULATION_HZ = 60  # Fixed simulation rate; all speeds are per simulation step
+MAX_SIMULATION_STEPS = 5  # Catch-up steps allowed per rendered frame
+MAX_FRAME_TIME = 0.25  # Longer frames (hitches) are clamped to this, in seconds
 PLAYER_ACCELERATION = 0.15
 PLAYER_MAX_SPEED = 4
 PLAYER_ROTATION_SPEED = 5
@@ -25,6 +29,9 @@ PLAYER_FRICTION = 0.98
 # Projectile configuration
 PROJECTILE_SPEED = 12
 
+# Collision broad-phase (at least the diameter of a large asteroid)
+GRID_CELL_SIZE = 80
+
 # Asteroid configuration
 ASTEROID_SPEEDS = {
     'large': 1,
@@ -38,9 +45,52 @@ ASTEROID_SCORES = {
     'small': 100
 }
 
+# Assets
+FONT_PATH = 'src/assets/fonts/PressStart2P-Regular.ttf'
+ASSET_MEMORY_LIMIT = None  # Bytes kept by the asset cache (None = no limit)
+TEXT_CACHE_SIZE = 256  # Rendered text surfaces kept by the text cache
+PRELOAD_FRAME_BUDGET = 0.004  # Seconds per frame the main thread spends finishing preloaded assets
+
+# Audio
+LASER_SOUND = 'src/assets/sfx/laser.mp3'
+LASER_VOLUME = 0.3
+GAME_OVER_MUSIC = 'src/assets/music/game_over.mp3'
+GAME_MUSIC = 'src/assets/music/game_music.mp3'
+MENU_MUSIC = 'src/assets/music/menu_music.mp3'
+
+# High scores
+WRITE_QUEUE_SIZE = 16  # Pending background writes before new ones are refused
+WRITER_SHUTDOWN_TIMEOUT = 5.0  # Seconds given to pending writes at exit
+WRITE_BATCH_WINDOW = 0.01  # Seconds a save waits for others to share its insert
+WRITE_BATCH_SIZE = 500  # Most scores saved in one insert
+WRITE_BATCH_MAX_PENDING = 20000  # Scores waiting for a batch before new ones are refused
+SCORE_JOURNAL_PATH = 'scores_journal.jsonl'  # Local journal of every submitted score
+JOURNAL_FSYNC_INTERVAL = 0.5  # Seconds between fsyncs of the journal
+JOURNAL_FSYNC_BATCH = 16  # Appends that force an fsync sooner
+RETRY_DELAY = 2.0  # Seconds before retrying a failed upload or connection, doubled per failure
+RETRY_MAX_DELAY = 60.0  # Longest wait between retries
+SERVICE_CACHE_SIZE = 1000  # Best runs the leaderboard service keeps in memory
+SERVICE_CACHE_TTL = 1.0  # Seconds other leaderboard service answers are reused
+JOURNAL_SYNC_BATCH = 500  # Scores per insert_many when uploading
+LEADERBOARD_TTL = 30.0  # Seconds before the cached leaderboard is read again
+ANONYMOUS_NAME = "---"  # Name saved for runs that do not reach the leaderboard
+# Leaderboards the HIGH SCORES screen pages through (LEFT/RIGHT), in order
+LEADERBOARD_SCOPES = (
+    ('all', "ALL-TIME"),
+    ('season', "THIS SEASON"),
+    ('week', "THIS WEEK"),
+    ('cabinet', "THIS CABINET"),
+)
+
+# Profiler
+PROFILER_WINDOW = 300  # Frames in the rolling frame-time statistics
+PROFILER_TRACE_EVENTS = 100000  # Trace events kept for export
+
 # Control keys
 KEY_FULLSCREEN = pygame.K_F11
 KEY_EXIT_FULLSCREEN = pygame.K_ESCAPE
+KEY_PROFILER = pygame.K_F3
+KEY_TRACE_EXPORT = pygame.K_F4
 
 # Add these constants
 WINDOW_MODE = 0  # Window mode
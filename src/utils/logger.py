@@ -0,0 +1,172 @@
+import atexit
+import os
+import sys
+import threading
+from collections import deque
+
+# Log levels (same numeric values as the standard logging module)
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+OFF = 100
+
+LEVEL_NAMES = {
+    'debug': DEBUG,
+    'info': INFO,
+    'warning': WARNING,
+    'error': ERROR,
+    'off': OFF
+}
+
+# Categories used by the game
+CATEGORIES = ('entities', 'collisions', 'scenes', 'storage')
+
+DEFAULT_LEVEL = WARNING
+BUFFER_CAPACITY = 4096
+FLUSH_INTERVAL = 0.25  # Seconds between background flushes
+
+
+class RingBufferSink:
+    """Keeps formatted lines in a bounded buffer and writes them in batches
+    from a background thread, so the game loop never blocks on stdout."""
+
+    def __init__(self, stream=None, capacity=BUFFER_CAPACITY, flush_interval=FLUSH_INTERVAL):
+        self.stream = stream
+        self.buffer = deque(maxlen=capacity)
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def write(self, category, level, message):
+        if self._thread is None:
+            self._start()
+        if len(self.buffer) == self.buffer.maxlen:
+            self.dropped += 1  # The oldest line is overwritten
+        self.buffer.append(f"[{category}] {message}")
+
+    def flush(self):
+        with self._lock:
+            lines = []
+            while self.buffer:
+                try:
+                    lines.append(self.buffer.popleft())
+                except IndexError:
+                    break
+            if self.dropped:
+                lines.append(f"[logger] {self.dropped} line(s) dropped")
+                self.dropped = 0
+            if not lines:
+                return
+            stream = self.stream or sys.stdout
+            try:
+                stream.write("\n".join(lines) + "\n")
+                stream.flush()
+            except (OSError, ValueError):
+                pass  # Stream closed or broken pipe: nothing else to do
+
+    def _start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="log-flusher", daemon=True)
+            self._thread.start()
+        atexit.register(self.flush)
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+
+class LogChannel:
+    """Logger for one category. The *_enabled flags are plain attributes so hot
+    paths can guard a call with a single branch:
+
+        if log.debug_enabled:
+            log.debug("Asteroid updated. Position: %s", asteroid.position)
+    """
+
+    def __init__(self, name, level, sink):
+        self.name = name
+        self.sink = sink
+        self.set_level(level)
+
+    def set_level(self, level):
+        self.level = level
+        self.debug_enabled = level <= DEBUG
+        self.info_enabled = level <= INFO
+        self.warning_enabled = level <= WARNING
+        self.error_enabled = level <= ERROR
+
+    def debug(self, message, *args):
+        if self.debug_enabled:
+            self._write(DEBUG, message, args)
+
+    def info(self, message, *args):
+        if self.info_enabled:
+            self._write(INFO, message, args)
+
+    def warning(self, message, *args):
+        if self.warning_enabled:
+            self._write(WARNING, message, args)
+
+    def error(self, message, *args):
+        if self.error_enabled:
+            self._write(ERROR, message, args)
+
+    def _write(self, level, message, args):
+        # Format now: arguments such as Vector2 positions are mutated later
+        if args:
+            message = message % args
+        self.sink.write(self.name, level, message)
+
+
+def parse_levels(spec, default=DEFAULT_LEVEL):
+    """Parses a spec like "debug" or "entities=debug,storage=info"."""
+    levels = {name: default for name in CATEGORIES}
+    if not spec:
+        return levels
+    for part in spec.split(','):
+        part = part.strip().lower()
+        if not part:
+            continue
+        if '=' in part:
+            name, level_name = part.split('=', 1)
+            if level_name in LEVEL_NAMES:
+                levels[name.strip()] = LEVEL_NAMES[level_name]
+        elif part in LEVEL_NAMES:
+            levels = {name: LEVEL_NAMES[part] for name in levels}
+    return levels
+
+
+_sink = RingBufferSink()
+_levels = parse_levels(os.getenv('ASTEROIDS_LOG'))
+_channels = {}
+
+
+def get_logger(category):
+    """Returns the shared channel for a category, creating it if needed."""
+    channel = _channels.get(category)
+    if channel is None:
+        channel = LogChannel(category, _levels.get(category, DEFAULT_LEVEL), _sink)
+        _channels[category] = channel
+    return channel
+
+
+def set_level(category, level):
+    """Changes the level of one category (or all of them with '*') at runtime."""
+    if isinstance(level, str):
+        level = LEVEL_NAMES[level.lower()]
+    names = CATEGORIES if category == '*' else (category,)
+    for name in names:
+        _levels[name] = level
+        get_logger(name).set_level(level)
+
+
+def flush():
+    """Writes any buffered lines immediately."""
+    _sink.flush()
@@ -0,0 +1,94 @@
+import math
+import numpy as np
+from src.utils.constants import SCREEN_WIDTH, SCREEN_HEIGHT, GRID_CELL_SIZE
+
+_NO_PAIRS = (np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp))
+
+
+class SpatialGrid:
+    """Uniform grid used as collision broad-phase.
+
+    The grid wraps around like the screen does (see BaseEntity.update), so an
+    entity near the right edge is a neighbour of one near the left edge. Each
+    entity is stored once, in the cell that contains its centre; queries look
+    far enough around that no pair closer than the sum of their radii is missed.
+
+    The grid works on position/radius arrays (see EntityStore): rebuilding is a
+    sort of the cell ids, and a query returns candidate index pairs.
+    """
+
+    def __init__(self, width=SCREEN_WIDTH, height=SCREEN_HEIGHT, cell_size=GRID_CELL_SIZE):
+        self.width = width
+        self.height = height
+        # Whole number of cells so the wrap lands exactly on a cell border
+        self.cols = max(1, int(width // cell_size))
+        self.rows = max(1, int(height // cell_size))
+        self.cell_width = width / self.cols
+        self.cell_height = height / self.rows
+        self.count = 0
+        self.max_radius = 0.0
+        self.order = np.empty(0, dtype=np.intp)
+        self.starts = np.zeros(self.cols * self.rows, dtype=np.intp)
+        self.ends = np.zeros(self.cols * self.rows, dtype=np.intp)
+
+    def _cells_of(self, positions):
+        cols = (np.mod(positions[:, 0], self.width) // self.cell_width).astype(np.intp) % self.cols
+        rows = (np.mod(positions[:, 1], self.height) // self.cell_height).astype(np.intp) % self.rows
+        return cols, rows
+
+    def rebuild(self, positions, radii):
+        """Indexes n entities given as an (n, 2) position array and an (n,)
+        radius array. Call once per tick after they move."""
+        self.count = len(positions)
+        if self.count == 0:
+            self.max_radius = 0.0
+            self.order = np.empty(0, dtype=np.intp)
+            self.starts[:] = 0
+            self.ends[:] = 0
+            return
+        cols, rows = self._cells_of(positions)
+        cell_ids = rows * self.cols + cols
+        self.order = np.argsort(cell_ids, kind='stable')
+        sorted_ids = cell_ids[self.order]
+        all_cells = np.arange(self.cols * self.rows)
+        self.starts = np.searchsorted(sorted_ids, all_cells, side='left')
+        self.ends = np.searchsorted(sorted_ids, all_cells, side='right')
+        self.max_radius = float(radii.max())
+
+    def _offsets(self, reach):
+        # Neighbouring cell offsets, without visiting the same wrapped cell twice
+        reach_x = math.ceil(reach / self.cell_width)
+        reach_y = math.ceil(reach / self.cell_height)
+        dxs = range(-reach_x, reach_x + 1) if 2 * reach_x + 1 < self.cols else range(self.cols)
+        dys = range(-reach_y, reach_y + 1) if 2 * reach_y + 1 < self.rows else range(self.rows)
+        return np.array([(dx, dy) for dy in dys for dx in dxs], dtype=np.intp)
+
+    def candidate_pairs(self, positions, radii):
+        """Returns two index arrays (query, item): every indexed item that may
+        overlap one of the query circles appears paired with it."""
+        if self.count == 0 or len(positions) == 0:
+            return _NO_PAIRS
+        offsets = self._offsets(float(radii.max()) + self.max_radius)
+        cols, rows = self._cells_of(positions)
+        neighbour_cols = (cols[:, None] + offsets[:, 0]) % self.cols
+        neighbour_rows = (rows[:, None] + offsets[:, 1]) % self.rows
+        cells = (neighbour_rows * self.cols + neighbour_cols).ravel()
+
+        starts = self.starts[cells]
+        counts = self.ends[cells] - starts
+        total = int(counts.sum())
+        if total == 0:
+            return _NO_PAIRS
+
+        # Expand every (query, cell) range into one row per item in the cell
+        query_index = np.repeat(np.repeat(np.arange(len(positions)), len(offsets)), counts)
+        first = np.repeat(starts, counts)
+        within = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        item_index = self.order[first + within]
+        return query_index, item_index
+
+    def query(self, position, radius):
+        """Returns the sorted indices of the items that may overlap one circle."""
+        point = np.array([[position[0], position[1]]], dtype=float)
+        _, items = self.candidate_pairs(point, np.array([radius], dtype=float))
+        return np.sort(items)
@@ -0,0 +1,44 @@
+from collections import OrderedDict
+from src.utils.constants import TEXT_CACHE_SIZE
+
+
+class TextCache:
+    """Keeps rendered text surfaces keyed by (font, text, color, antialias),
+    evicting the least recently used once max_entries is reached.
+
+    The returned surfaces are shared: blit them, but do not draw on them or
+    change their alpha.
+    """
+
+    def __init__(self, max_entries=TEXT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color, antialias=True):
+        # The key holds the font itself, so it cannot be collected (and its id
+        # reused by another font) while the entry exists
+        key = (font, text, tuple(color), antialias)
+        surface = self.entries.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return surface
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.entries[key] = surface
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self.entries.clear()
+
+
+# Shared instance for menus, buttons and HUD labels
+text_cache = TextCache()
+
+
+def render_text(font, text, color, antialias=True):
+    return text_cache.render(font, text, color, antialias)
@@ -1,4 +1,14 @@
-import pygame
+import time
+from src.utils.logger import get_logger
+
+log = get_logger("scenes")
+
+
+def get_ticks():
+    """Milliseconds on a monotonic clock. Unlike pygame.time.get_ticks() it
+    does not need pygame.init(), which main.py skips to start faster."""
+    return int(time.monotonic() * 1000)
+
 
 class Transition:
     def __init__(self, duration=1.0):
@@ -7,14 +17,14 @@ class Transition:
         self.is_active = False
         
     def start(self):
-        self.start_time = pygame.time.get_ticks()
+        self.start_time = get_ticks()
         self.is_active = True
-        print("Transition started.")
+        log.debug("Transition started.")
         
     def get_alpha(self):
         if not self.is_active:
             return 0
-        current_time = pygame.time.get_ticks()
+        current_time = get_ticks()
         elapsed = current_time - self.start_time
         progress = min(1.0, elapsed / self.duration)
         alpha = int(255 * progress)
@@ -23,4 +33,4 @@ class Transition:
     def is_finished(self):
         if not self.is_active:
             return False
-        return pygame.time.get_ticks() - self.start_time >= self.duration
+        return get_ticks() - self.start_time >= self.duration
@@ -12,7 +12,7 @@ test_scores = [
 ]
 
 for name, score in test_scores:
-    success = score_manager.add_high_score(name, score)
+    success = score_manager.add_high_score(name, score).result()  # Esperar al guardado en segundo plano
     print(f'Añadiendo {name}: {score} - {"Éxito" if success else "Error"}')
 
 # Obtener y mostrar todas las puntuaciones
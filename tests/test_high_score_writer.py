@@ -0,0 +1,106 @@
+import os
+import sys
+import threading
+import unittest
+
+sys.path[:0] = [os.path.dirname(os.path.dirname(os.path.abspath(__file__)))]
+
+from src.core.managers.high_score_manager import HighScoreManager
+from src.core.managers.high_score_writer import WriteBatcher, QueueFullError
+from src.core.storage.memory_store import MemoryScoreStore
+
+
+def run(entry_id, score):
+    return {'_id': entry_id, 'name': 'TST', 'score': score, 'level': 1, 'created': 1.0e9}
+
+
+class WriteBatcherTest(unittest.TestCase):
+    """Batches of a HighScoreManager on the memory store, with the writer
+    held busy so that submissions pile up."""
+
+    def setUp(self):
+        self.store = MemoryScoreStore()
+        self.manager = HighScoreManager(store=self.store, journal_path=None)
+        self.batches = []  # _ids of each flush
+        self.busy = threading.Event()
+        self.release = threading.Event()
+
+    def tearDown(self):
+        self.release.set()
+        self.manager.writer.close()
+
+    def flush(self, entries):
+        self.batches.append([entry['_id'] for entry in entries])
+        return self.manager._store_scores(entries)
+
+    def batcher(self, **options):
+        return WriteBatcher(self.manager.writer, self.flush, **options)
+
+    def hold_writer(self):
+        def job():
+            self.busy.set()
+            self.release.wait(5)
+        self.manager.writer.submit(job)
+        self.assertTrue(self.busy.wait(5))
+
+    def test_batches_of_at_most_max_batch(self):
+        batcher = self.batcher(window=0.05, max_batch=3)
+        self.hold_writer()
+        futures = [batcher.submit(run(f"r{i}", i)) for i in range(7)]
+        self.release.set()
+        self.assertEqual([future.result(5) for future in futures], [True] * 7)
+        self.assertEqual(self.batches, [['r0', 'r1', 'r2'], ['r3', 'r4', 'r5'], ['r6']])
+
+    def test_window_coalesces_items_under_load(self):
+        batcher = self.batcher(window=1.0, max_batch=10)
+        self.hold_writer()
+        first = [batcher.submit(run(f"r{i}", i)) for i in range(2)]
+        self.release.set()
+        for future in first:
+            future.result(5)
+        # The last batch had two items: the next one waits for the window to fill
+        later = [batcher.submit(run('r2', 2)), batcher.submit(run('r3', 3))]
+        for future in later:
+            future.result(5)
+        self.assertEqual(self.batches, [['r0', 'r1'], ['r2', 'r3']])
+
+    def test_lone_item_is_not_held_back(self):
+        batcher = self.batcher(window=5.0, max_batch=10)
+        batcher.submit(run('r0', 0)).result(1)
+        self.assertEqual(self.batches, [['r0']])
+
+    def test_full_batcher_refuses_items(self):
+        batcher = self.batcher(window=0.05, max_batch=10, max_pending=2)
+        self.hold_writer()
+        accepted = [batcher.submit(run(f"r{i}", i)) for i in range(2)]
+        refused = batcher.submit(run('r2', 2))
+        self.assertIsInstance(refused.exception(0), QueueFullError)
+        self.release.set()
+        for future in accepted:
+            self.assertTrue(future.result(5))
+        self.assertEqual(self.batches, [['r0', 'r1']])
+        self.assertNotIn('r2', [entry['_id'] for entry in self.store.top(8)])
+
+    def test_futures_resolve_once_stored(self):
+        batcher = self.batcher(window=0.05, max_batch=10)
+        self.hold_writer()
+        futures = [batcher.submit(run(f"r{i}", i * 10)) for i in range(3)]
+        self.assertFalse(any(future.done() for future in futures))
+        self.release.set()
+        self.assertEqual([future.result(5) for future in futures], [True] * 3)
+        self.assertEqual([entry['_id'] for entry in self.store.top(8)], ['r2', 'r1', 'r0'])
+
+    def test_failed_flush_fails_every_future(self):
+        def flush(entries):
+            raise ConnectionError("database unreachable")
+
+        batcher = WriteBatcher(self.manager.writer, flush, window=0.05, max_batch=10)
+        self.hold_writer()
+        futures = [batcher.submit(run(f"r{i}", i)) for i in range(2)]
+        self.release.set()
+        for future in futures:
+            self.assertIsInstance(future.exception(5), ConnectionError)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import threading
+import unittest
+
+sys.path[:0] = [os.path.dirname(os.path.dirname(os.path.abspath(__file__)))]
+
+import scores_cli
+from src.core.service.leaderboard_service import LeaderboardService
+from src.core.storage.http_store import HTTPScoreStore
+from src.core.storage.memory_store import MemoryScoreStore
+
+
+class FailingStore(MemoryScoreStore):
+    """Memory store whose writes fail, like a database that went away."""
+
+    def add(self, entries):
+        raise ConnectionError("database unreachable")
+
+
+class BlockingStore(MemoryScoreStore):
+    """Memory store whose writes wait until released, like a slow database."""
+
+    def __init__(self):
+        super().__init__()
+        self.adding = threading.Event()
+        self.release = threading.Event()
+
+    def add(self, entries):
+        self.adding.set()
+        self.release.wait(5)
+        super().add(entries)
+
+
+def run(entry_id, score):
+    return {'_id': entry_id, 'name': 'TST', 'score': score, 'level': 1, 'created': 1.0e9,
+            'cabinet': 'test', 'season': '2001-Q3', 'week': '2001-W36'}
+
+
+class ServiceTestCase(unittest.TestCase):
+    """Runs a LeaderboardService on a free localhost port, on its own event loop thread."""
+
+    store_class = MemoryScoreStore
+
+    def setUp(self):
+        self.backend = self.store_class()
+        self.service = LeaderboardService(self.backend)
+        self.loop = asyncio.new_event_loop()
+        started = threading.Event()
+
+        def serve():
+            asyncio.set_event_loop(self.loop)
+            self.loop.run_until_complete(self.service.start('127.0.0.1', 0))
+            started.set()
+            self.loop.run_forever()
+
+        self.thread = threading.Thread(target=serve, daemon=True)
+        self.thread.start()
+        self.assertTrue(started.wait(5))
+        self.store = HTTPScoreStore(f"http://127.0.0.1:{self.service.port}")
+        self.assertTrue(self.store.connect())
+
+    def tearDown(self):
+        self.store.close()
+        asyncio.run_coroutine_threadsafe(self.service.stop(), self.loop).result(5)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(5)
+        self.loop.close()
+
+
+class ExportTest(ServiceTestCase):
+    def test_export_walks_every_batch(self):
+        self.store.add([run(f"{i:04d}", i % 50) for i in range(250)])
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "scores.jsonl")
+            count = scores_cli.export_scores(self.store, path, 'jsonl', batch_size=40)
+            with open(path, encoding='utf-8') as f:
+                exported = [json.loads(line) for line in f]
+        self.assertEqual(count, 250)
+        self.assertEqual(sorted(e['_id'] for e in exported), [f"{i:04d}" for i in range(250)])
+        self.assertEqual(exported[0]['week'], '2001-W36')  # Every field, not only the leaderboard ones
+        self.assertEqual(self.service.scans, {})  # Finished scans release their cursor
+
+    def test_export_of_an_empty_store(self):
+        self.assertEqual(list(self.store.scan(10)), [])
+
+
+class FailedWriteTest(ServiceTestCase):
+    store_class = FailingStore
+
+    def test_failed_batch_is_not_served(self):
+        with self.assertRaises(ConnectionError):
+            self.store.add([run('a', 900), run('b', 800)])
+        self.assertEqual(self.store.top(8), [])
+        self.assertEqual(self.store.rank(100), 1)
+        self.assertEqual(self.service.cache.keys, [])
+
+
+class BadRequestTest(ServiceTestCase):
+    def test_runs_that_are_not_objects(self):
+        for body in ({'scores': [1]}, {'scores': ["run"]}, {'scores': [run('a', 1), None]}):
+            with self.subTest(body=body), self.assertRaisesRegex(ConnectionError, ": 400 "):
+                self.store._request('POST', '/scores', body=body)
+        self.assertEqual(self.store.top(8), [])
+
+
+class StopTest(ServiceTestCase):
+    store_class = BlockingStore
+
+    def test_stop_answers_runs_being_stored(self):
+        errors = []
+
+        def submit():
+            try:
+                self.store.add([run('a', 900)])
+            except ConnectionError as e:
+                errors.append(str(e))
+
+        client = threading.Thread(target=submit)
+        client.start()
+        self.assertTrue(self.backend.adding.wait(5))
+        asyncio.run_coroutine_threadsafe(self.service.stop(), self.loop).result(5)
+        client.join(5)
+        self.backend.release.set()
+        self.assertEqual(len(errors), 1)
+        self.assertIn(": 503 leaderboard service stopped", errors[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path[:0] = [os.path.dirname(os.path.dirname(os.path.abspath(__file__)))]
+
+from src.core.managers.high_score_manager import HighScoreManager
+from src.core.managers.score_journal import ScoreJournal
+from src.core.storage.memory_store import MemoryScoreStore
+
+
+class RemoteMemoryStore(MemoryScoreStore):
+    """Memory store treated as remote, so the manager journals in front of it.
+    Records every upload."""
+
+    remote = True
+
+    def __init__(self):
+        super().__init__()
+        self.uploads = []  # _ids of every add, repeats included
+
+    def add(self, entries):
+        self.uploads.extend(entry['_id'] for entry in entries)
+        super().add(entries)
+
+
+def run(entry_id, score):
+    return {'_id': entry_id, 'name': 'TST', 'score': score, 'level': 1, 'created': 1.0e9}
+
+
+class ResyncTest(unittest.TestCase):
+    """A restarted cabinet uploads what its journal holds, once."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "journal.jsonl")
+        self.store = RemoteMemoryStore()
+        self.managers = []
+
+    def tearDown(self):
+        for manager in self.managers:
+            manager.writer.close()
+            manager.journal.close()
+        self.directory.cleanup()
+
+    def journal(self, entries):
+        # What a cabinet left behind: journaled runs it never uploaded
+        journal = ScoreJournal(self.path)
+        journal.append_many(entries)
+        journal.close()
+
+    def restart(self):
+        manager = HighScoreManager(store=self.store, journal_path=self.path)
+        self.managers.append(manager)
+        return manager
+
+    def stored_ids(self):
+        return sorted(entry['_id'] for entry in self.store.scan(100))
+
+    def test_resync_twice_uploads_nothing_new(self):
+        self.journal([run(f"r{i}", i) for i in range(5)])
+        manager = self.restart()
+        self.assertEqual(sorted(self.store.uploads), [f"r{i}" for i in range(5)])
+        self.assertTrue(manager.sync_journal())
+        self.assertTrue(manager._resync())
+        self.assertEqual(len(self.store.uploads), 5)
+        self.assertEqual(manager.journal.pending, 0)
+
+    def test_restart_resumes_from_the_offset_file(self):
+        self.journal([run(f"r{i}", i) for i in range(5)])
+        self.restart().journal.close()  # Writes the offset file
+        with open(self.path + '.synced') as f:
+            self.assertEqual(int(f.read()), os.path.getsize(self.path))
+        self.journal([run('r5', 5)])
+        self.restart()
+        self.assertEqual(sorted(self.store.uploads), [f"r{i}" for i in range(6)])
+
+    def test_uploaded_ids_are_skipped_without_the_offset_file(self):
+        # A crash before the offset file was written: the journal is uploaded again
+        self.journal([run(f"r{i}", i) for i in range(5)])
+        self.restart().journal.close()
+        os.remove(self.path + '.synced')
+        self.restart()
+        self.assertEqual(len(self.store.uploads), 10)
+        self.assertEqual(self.stored_ids(), [f"r{i}" for i in range(5)])
+
+    def test_line_cut_short_is_ignored(self):
+        self.journal([run('r0', 0), run('r1', 1)])
+        with open(self.path, 'ab') as f:
+            f.write(b'{"_id":"r2","name":"TS')  # The crash hit mid-append
+        manager = self.restart()
+        self.assertEqual(self.stored_ids(), ['r0', 'r1'])
+        self.assertEqual(manager.journal.pending, 0)
+        # The next run goes on a line of its own; the cut one is skipped, not uploaded
+        self.assertTrue(manager._store_scores([run('r3', 3)]))
+        self.assertEqual(self.stored_ids(), ['r0', 'r1', 'r3'])
+        self.assertTrue(manager.sync_journal())
+        self.assertEqual(manager.journal.synced_offset, os.path.getsize(self.path))
+
+
+if __name__ == "__main__":
+    unittest.main()
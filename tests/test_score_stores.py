@@ -0,0 +1,49 @@
+import os
+import random
+import sys
+import tempfile
+import unittest
+
+sys.path[:0] = [os.path.dirname(os.path.dirname(os.path.abspath(__file__)))]
+
+from src.core.storage.memory_store import MemoryScoreStore
+from src.core.storage.sqlite_store import SQLiteScoreStore
+
+
+def runs(count):
+    rng = random.Random(7)
+    return [{'_id': f"run-{i}", 'name': 'TST', 'score': rng.randrange(0, 100), 'level': rng.randrange(1, 10),
+             'created': 1.0e9, 'cabinet': 'test', 'season': '2001-Q3', 'week': f"2001-W3{i % 2}"}
+            for i in range(count)]
+
+
+class LeaderboardRowsTest(unittest.TestCase):
+    """The memory store answers leaderboard queries with the same rows as SQLite."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.memory = MemoryScoreStore()
+        self.sqlite = SQLiteScoreStore(os.path.join(self.directory.name, "scores.db"))
+        for store in (self.memory, self.sqlite):
+            store.connect()
+            store.add(runs(300))
+
+    def tearDown(self):
+        self.sqlite.close()
+        self.directory.cleanup()
+
+    def test_same_rows(self):
+        for scope in (None, ('week', '2001-W31')):
+            with self.subTest(scope=scope):
+                self.assertEqual(self.memory.top(10, scope), self.sqlite.top(10, scope))
+                self.assertEqual(self.memory.top(5, scope, (50, 'run-1')), self.sqlite.top(5, scope, (50, 'run-1')))
+                self.assertEqual(self.memory.around(50, 3, 3, scope), self.sqlite.around(50, 3, 3, scope))
+                self.assertEqual(self.memory.rank(50, scope), self.sqlite.rank(50, scope))
+
+    def test_leaderboard_fields_only(self):
+        for row in self.memory.top(10) + self.memory.around(50, 2, 2):
+            self.assertEqual(set(row), {'_id', 'name', 'score', 'level'})
+
+
+if __name__ == "__main__":
+    unittest.main()